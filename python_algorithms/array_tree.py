@@ -0,0 +1,188 @@
+"""A binary search tree stored in parallel arrays instead of node objects."""
+
+from array import array
+from typing import Any, Generator, List, Optional, Tuple
+
+# Index used in place of a missing parent or child
+NIL = -1
+
+# Slot indices are stored as C ints, which allows for 2**31 - 1 slots
+INDEX_TYPECODE = "i"
+
+
+class ArrayTree:
+    """A binary search tree whose nodes are slots in parallel arrays.
+
+    Slot i holds its key in `keys[i]`, its value in `values[i]` and the slots
+    of its parent and children in `parent[i]`, `left[i]` and `right[i]`.
+    Keys are stored unboxed in an `array.array` of `key_typecode`; values go
+    in an array of `value_typecode` if one is given and in a list otherwise;
+    typed values default to zero rather than None.
+    Deleted slots are chained through `right` into a free list and reused by
+    later inserts. Like `tree_insert`, inserts do not rebalance the tree, but
+    no operation recurses.
+    """
+
+    def __init__(self, key_typecode: str = "d", value_typecode: Optional[str] = None) -> None:
+        self._keys = array(key_typecode)
+        self._values: Any = []
+        self._default_value: Any = None
+        if value_typecode:
+            self._values = array(value_typecode)
+            self._default_value = array(value_typecode, bytes(self._values.itemsize))[0]
+        self._parent = array(INDEX_TYPECODE)
+        self._left = array(INDEX_TYPECODE)
+        self._right = array(INDEX_TYPECODE)
+        self._root = NIL
+        self._free = NIL
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Any) -> bool:
+        return self.search(key) is not None
+
+    @property
+    def root(self) -> Optional[int]:
+        """Get the slot of the root, or None if the tree is empty."""
+        return None if self._root == NIL else self._root
+
+    def key(self, slot: int) -> Any:
+        """Get the key stored in `slot`."""
+        return self._keys[slot]
+
+    def value(self, slot: int) -> Any:
+        """Get the value stored in `slot`."""
+        return self._values[slot]
+
+    def _allocate(self, key: Any, value: Any) -> int:
+        slot = self._free
+        if slot != NIL:
+            self._free = self._right[slot]
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._parent[slot] = self._left[slot] = self._right[slot] = NIL
+            return slot
+        self._keys.append(key)
+        self._values.append(value)
+        self._parent.append(NIL)
+        self._left.append(NIL)
+        self._right.append(NIL)
+        return len(self._keys) - 1
+
+    def insert(self, key: Any, value: Any = None) -> int:
+        """Insert `key` with `value` and return its slot.
+
+        Without a `value`, typed values get a zero of their typecode.
+        """
+        if value is None:
+            value = self._default_value
+        keys, left, right = self._keys, self._left, self._right
+        trailing = NIL
+        x = self._root
+        while x != NIL:
+            trailing = x
+            x = left[x] if key < keys[x] else right[x]
+        slot = self._allocate(key, value)
+        self._parent[slot] = trailing
+        if trailing == NIL:
+            self._root = slot
+        elif key < keys[trailing]:
+            left[trailing] = slot
+        else:
+            right[trailing] = slot
+        self._size = self._size + 1
+        return slot
+
+    def search(self, key: Any) -> Optional[int]:
+        """Return the slot holding `key`, or None if it is absent."""
+        keys, left, right = self._keys, self._left, self._right
+        x = self._root
+        while x != NIL and not keys[x] == key:
+            x = left[x] if key < keys[x] else right[x]
+        return None if x == NIL else x
+
+    def minimum(self, slot: Optional[int] = None) -> Optional[int]:
+        """Return the slot with minimum key in the subtree rooted at `slot`."""
+        x = self._root if slot is None else slot
+        return None if x == NIL else self._minimum_slot(x)
+
+    def _minimum_slot(self, x: int) -> int:
+        left = self._left
+        while left[x] != NIL:
+            x = left[x]
+        return x
+
+    def maximum(self, slot: Optional[int] = None) -> Optional[int]:
+        """Return the slot with maximum key in the subtree rooted at `slot`."""
+        x = self._root if slot is None else slot
+        if x == NIL:
+            return None
+        right = self._right
+        while right[x] != NIL:
+            x = right[x]
+        return x
+
+    def walk(self, slot: Optional[int] = None) -> Generator[Any, None, None]:
+        """Generate the keys of the subtree rooted at `slot` in order."""
+        for x in self._walk_slots(slot):
+            yield self._keys[x]
+
+    def items(self) -> Generator[Tuple[Any, Any], None, None]:
+        """Generate the `(key, value)` pairs in key order."""
+        for x in self._walk_slots(None):
+            yield self._keys[x], self._values[x]
+
+    def _walk_slots(self, slot: Optional[int]) -> Generator[int, None, None]:
+        left, right = self._left, self._right
+        x = self._root if slot is None else slot
+        stack: List[int] = []
+        while stack or x != NIL:
+            if x != NIL:
+                stack.append(x)
+                x = left[x]
+            else:
+                x = stack.pop()
+                yield x
+                x = right[x]
+
+    def _transplant(self, old: int, new: int) -> None:
+        parent = self._parent[old]
+        if parent == NIL:
+            self._root = new
+        elif old == self._left[parent]:
+            self._left[parent] = new
+        else:
+            self._right[parent] = new
+        if new != NIL:
+            self._parent[new] = parent
+
+    def delete(self, slot: int) -> None:
+        """Remove the node in `slot` and put the slot on the free list.
+
+        Raises ValueError if `slot` holds no node, for instance because it
+        was deleted already.
+        """
+        if slot != self._root and self._parent[slot] == NIL:
+            raise ValueError(f"slot {slot} is not in use")
+        left, right = self._left, self._right
+        if left[slot] == NIL:
+            self._transplant(slot, right[slot])
+        elif right[slot] == NIL:
+            self._transplant(slot, left[slot])
+        else:
+            successor = self._minimum_slot(right[slot])
+            if self._parent[successor] != slot:
+                self._transplant(successor, right[successor])
+                right[successor] = right[slot]
+                self._parent[right[successor]] = successor
+            self._transplant(slot, successor)
+            left[successor] = left[slot]
+            self._parent[left[successor]] = successor
+        if isinstance(self._values, list):
+            self._values[slot] = None
+        self._parent[slot] = left[slot] = NIL
+        right[slot] = self._free
+        self._free = slot
+        self._size = self._size - 1
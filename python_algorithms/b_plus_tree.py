@@ -0,0 +1,339 @@
+"""A B+ tree: an ordered index with wide nodes and linked leaves."""
+
+from bisect import bisect_left, bisect_right
+import mmap
+import pickle
+import struct
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+from python_algorithms.binary_search_tree import CT
+
+# Page file layout: a header, a table of page offsets and the pickled pages
+_MAGIC = b"BPT1"
+_HEADER = struct.Struct("<4sIQQQ")
+_OFFSET = struct.Struct("<Q")
+
+
+class _Leaf:
+    __slots__ = ("keys", "values", "next")
+
+    def __init__(self, keys: List[Any], values: List[Any]) -> None:
+        self.keys = keys
+        self.values = values
+        # The next leaf, its page number until it is read in, or None
+        self.next: Any = None
+
+
+class _Internal:
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys: List[Any], children: list) -> None:
+        # Every key in children[i] is >= keys[i - 1] and < keys[i]. Children
+        # not yet read in from a page file are held as page numbers.
+        self.keys = keys
+        self.children = children
+
+
+class _PageFile:
+    """The pages of a file written by `BPlusTree.save`, decoded on first use.
+
+    Each page is decoded at most once, so a leaf reached both from its parent
+    and from the leaf before it is the same node.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.fanout, self.size, self.root_page, self.num_pages = _HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a B+ tree page file")
+        self._nodes: Dict[int, Any] = {}
+
+    def node(self, page: int) -> Any:
+        """Return the node stored in `page`, reading it in if need be."""
+        node = self._nodes.get(page)
+        if node is None:
+            position = _HEADER.size + _OFFSET.size * page
+            (start,) = _OFFSET.unpack_from(self._mmap, position)
+            (end,) = _OFFSET.unpack_from(self._mmap, position + _OFFSET.size)
+            record = pickle.loads(self._mmap[start:end])
+            if len(record) == 2:
+                node = _Internal(record[0], record[1])
+            else:
+                node = _Leaf(record[0], record[1])
+                node.next = None if record[2] == -1 else record[2]
+            self._nodes[page] = node
+        return node
+
+    def close(self) -> None:
+        """Release the map; nodes already read in stay valid."""
+        self._mmap.close()
+
+
+def _split_evenly(n: int, fanout: int) -> List[Tuple[int, int]]:
+    """Split range(n) into as few slices as possible of at most `fanout`."""
+    groups = -(-n // fanout)
+    return [(g * n // groups, (g + 1) * n // groups) for g in range(groups)]
+
+
+class BPlusTree:
+    """An ordered map kept in a B+ tree.
+
+    Internal nodes hold up to `fanout` children and leaves up to `fanout`
+    keys, in sorted Python lists searched with `bisect`, so one node visit
+    replaces log2(fanout) pointer chases in a binary tree. Leaves are linked
+    in key order for range scans.
+    """
+
+    def __init__(self, fanout: int = 64) -> None:
+        if fanout < 3:
+            raise ValueError("fanout must be at least 3")
+        self._fanout = fanout
+        self._root: Any = _Leaf([], [])
+        self._size = 0
+        self._pages: Optional[_PageFile] = None
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[Tuple[CT, Any]], fanout: int = 64) -> "BPlusTree":
+        """Build a tree in O(n) from pairs in strictly increasing key order."""
+        items = list(items)
+        for (previous, _), (key, _) in zip(items, items[1:]):
+            if not previous < key:
+                raise ValueError("keys are not in strictly increasing order")
+        tree = cls(fanout)
+        if not items:
+            return tree
+        keys = [key for key, _ in items]
+        values = [value for _, value in items]
+        level: List[Any] = [
+            _Leaf(keys[lo:hi], values[lo:hi]) for lo, hi in _split_evenly(len(items), fanout)
+        ]
+        for leaf, successor in zip(level, level[1:]):
+            leaf.next = successor
+        minima = [leaf.keys[0] for leaf in level]
+        while len(level) > 1:
+            slices = _split_evenly(len(level), fanout)
+            level, minima = (
+                [_Internal(minima[lo + 1:hi], level[lo:hi]) for lo, hi in slices],
+                [minima[lo] for lo, _ in slices],
+            )
+        tree._root = level[0]
+        tree._size = len(items)
+        return tree
+
+    @property
+    def fanout(self) -> int:
+        return self._fanout
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: CT) -> bool:
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        return i < len(leaf.keys) and leaf.keys[i] == key
+
+    def __getitem__(self, key: CT) -> Any:
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.values[i]
+        raise KeyError(key)
+
+    def __setitem__(self, key: CT, value: Any) -> None:
+        self.insert(key, value)
+
+    def __iter__(self) -> Generator[CT, None, None]:
+        return self.walk()
+
+    def _child(self, node: _Internal, i: int) -> Any:
+        """Return child i of `node`, reading it from the page file on first use."""
+        child = node.children[i]
+        if isinstance(child, int):
+            assert self._pages is not None
+            child = node.children[i] = self._pages.node(child)
+        return child
+
+    def _next_leaf(self, leaf: _Leaf) -> Optional[_Leaf]:
+        successor = leaf.next
+        if isinstance(successor, int):
+            assert self._pages is not None
+            successor = leaf.next = self._pages.node(successor)
+        return successor
+
+    def _find_leaf(self, key: CT) -> _Leaf:
+        node = self._root
+        while isinstance(node, _Internal):
+            node = self._child(node, bisect_right(node.keys, key))
+        return node
+
+    def search(self, key: CT) -> Optional[Any]:
+        """Return the value stored under `key`, or None if it is absent."""
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.values[i]
+        return None
+
+    def insert(self, key: CT, value: Any) -> None:
+        """Store `value` under `key`, replacing any value already there."""
+        path = []
+        node = self._root
+        while isinstance(node, _Internal):
+            i = bisect_right(node.keys, key)
+            path.append((node, i))
+            node = self._child(node, i)
+        i = bisect_left(node.keys, key)
+        if i < len(node.keys) and node.keys[i] == key:
+            node.values[i] = value
+            return
+        node.keys.insert(i, key)
+        node.values.insert(i, value)
+        self._size = self._size + 1
+        if len(node.keys) <= self._fanout:
+            return
+
+        # Split the overflowing leaf, then any internal nodes that overflow
+        mid = len(node.keys) // 2
+        sibling: Any = _Leaf(node.keys[mid:], node.values[mid:])
+        del node.keys[mid:], node.values[mid:]
+        sibling.next, node.next = node.next, sibling
+        separator = sibling.keys[0]
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, sibling)
+            if len(parent.children) <= self._fanout:
+                return
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            sibling = _Internal(parent.keys[mid + 1:], parent.children[mid + 1:])
+            del parent.keys[mid:], parent.children[mid + 1:]
+        self._root = _Internal([separator], [self._root, sibling])
+
+    def _first_leaf(self) -> _Leaf:
+        node = self._root
+        while isinstance(node, _Internal):
+            node = self._child(node, 0)
+        return node
+
+    def minimum(self) -> Optional[CT]:
+        """Return the smallest key, or None if the tree is empty."""
+        leaf = self._first_leaf()
+        return leaf.keys[0] if leaf.keys else None
+
+    def maximum(self) -> Optional[CT]:
+        """Return the largest key, or None if the tree is empty."""
+        node = self._root
+        while isinstance(node, _Internal):
+            node = self._child(node, len(node.children) - 1)
+        return node.keys[-1] if node.keys else None
+
+    def items(
+        self, lo: Optional[CT] = None, hi: Optional[CT] = None
+    ) -> Generator[Tuple[CT, Any], None, None]:
+        """Generate the `(key, value)` pairs with `lo <= key <= hi` in order.
+
+        Either bound may be None for an open end. After one descent to the
+        first leaf the scan just follows the leaf links.
+        """
+        leaf: Optional[_Leaf]
+        if lo is None:
+            leaf, i = self._first_leaf(), 0
+        else:
+            leaf = self._find_leaf(lo)
+            i = bisect_left(leaf.keys, lo)
+        while leaf is not None:
+            keys, values = leaf.keys, leaf.values
+            end = len(keys) if hi is None else bisect_right(keys, hi)
+            for j in range(i, end):
+                yield keys[j], values[j]
+            if end < len(keys):
+                return
+            leaf, i = self._next_leaf(leaf), 0
+
+    def irange(
+        self, lo: Optional[CT] = None, hi: Optional[CT] = None
+    ) -> Generator[CT, None, None]:
+        """Generate the keys with `lo <= key <= hi` in order."""
+        for key, _ in self.items(lo, hi):
+            yield key
+
+    def walk(self) -> Generator[CT, None, None]:
+        """Generate all keys in order."""
+        return self.irange()
+
+    def save(self, path: str) -> None:
+        """Write the tree to a page file that `open` can map back in.
+
+        Every node is pickled into its own page, with children and leaf links
+        stored as page numbers, after a header and a table of page offsets.
+        A tree reopened from a page file reads in all its pages first, so it
+        may be saved over the same file.
+        """
+        self.close()
+        nodes = self._read_in()
+        page_of = {id(node): page for page, node in enumerate(nodes)}
+        pages = []
+        for node in nodes:
+            record: tuple
+            if isinstance(node, _Internal):
+                record = (node.keys, [page_of[id(child)] for child in node.children])
+            else:
+                successor = -1 if node.next is None else page_of[id(node.next)]
+                record = (node.keys, node.values, successor)
+            pages.append(pickle.dumps(record, pickle.HIGHEST_PROTOCOL))
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self._fanout, self._size, 0, len(pages)))
+            offset = _HEADER.size + _OFFSET.size * (len(pages) + 1)
+            for page in pages:
+                f.write(_OFFSET.pack(offset))
+                offset = offset + len(page)
+            f.write(_OFFSET.pack(offset))
+            for page in pages:
+                f.write(page)
+
+    @classmethod
+    def open(cls, path: str) -> "BPlusTree":
+        """Reopen a tree written by `save`, reading its pages in as they are used.
+
+        The file is memory-mapped and only the root page is decoded up front.
+        Every other node is decoded from its page the first time a search,
+        insert or scan reaches it, so reopening costs O(1) and a lookup reads
+        in just the pages on its path. The map stays open until `close`.
+        """
+        pages = _PageFile(path)
+        tree = cls(pages.fanout)
+        tree._pages = pages
+        tree._root = pages.node(pages.root_page)
+        tree._size = pages.size
+        return tree
+
+    def close(self) -> None:
+        """Read in every page not yet used and release the page file, if any."""
+        if self._pages is not None:
+            self._read_in()
+            self._pages.close()
+            self._pages = None
+
+    def __enter__(self) -> "BPlusTree":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _read_in(self) -> List[Any]:
+        """List the nodes breadth first, reading in any that are still pages."""
+        nodes = [self._root]
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            if isinstance(node, _Internal):
+                nodes.extend(self._child(node, j) for j in range(len(node.children)))
+            else:
+                self._next_leaf(node)
+            i = i + 1
+        return nodes
@@ -1,7 +1,10 @@
 """Implementating a no-frills binary search tree."""
 
 from abc import abstractmethod
-from typing import Any, Generator, Optional, TypeVar
+from enum import Enum
+from typing import (
+    Any, Generator, Generic, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+)
 from typing_extensions import Protocol
 
 
@@ -13,7 +16,21 @@ class Comparable(Protocol):
 
 CT = TypeVar("CT", bound=Comparable)
 
+# Key and value types of a `TreeMap`
+K = TypeVar("K", bound=Comparable)
+V = TypeVar("V")
+
+
+class NodeColor(Enum):
+    RED = 1
+    BLACK = 2
+
+
 class TreeNode:
+    __slots__ = (
+        "_key", "_value", "_parent", "_left_child", "_right_child", "_color", "_size"
+    )
+
     def __init__(
         self,
         key: CT,
@@ -21,17 +38,49 @@ class TreeNode:
         parent: Optional["TreeNode"] = None,
         left_child: Optional["TreeNode"] = None,
         right_child: Optional["TreeNode"] = None,
+        color: NodeColor = NodeColor.RED,
+        size: int = 1,
     ) -> None:
-        self._key = key
-        self._value = value
-        self._parent = parent
-        self._left_child = left_child
-        self._right_child = right_child
+        self._key: Any = key
+        self._value: Any = value
+        self._parent: Optional[TreeNode] = parent
+        self._left_child: Optional[TreeNode] = left_child
+        self._right_child: Optional[TreeNode] = right_child
+        self._color: NodeColor = color
+        self._size: int = size
 
     @property
-    def key(self) -> CT:
+    def key(self) -> Any:
+        """Get the node's key."""
         return self._key
-    
+
+    @property
+    def value(self) -> Any:
+        """Get the node's value."""
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._value = value
+
+    @property
+    def color(self) -> NodeColor:
+        """Get the node's color, used only by the red-black tree routines."""
+        return self._color
+
+    @color.setter
+    def color(self, value: NodeColor) -> None:
+        self._color = value
+
+    @property
+    def size(self) -> int:
+        """Get the number of nodes in the subtree rooted at this node."""
+        return self._size
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self._size = value
+
     @property
     def parent(self) -> Optional["TreeNode"]:
         """Get the node's parent."""
@@ -66,6 +115,7 @@ def tree_insert(root: TreeNode, new_node: TreeNode) -> None:
     x: Optional["TreeNode"] = root
     while x is not None:
         trailing_node = x
+        x.size = x.size + 1
         if new_node.key < x.key:
             x = x.left_child
         else:
@@ -79,20 +129,30 @@ def tree_insert(root: TreeNode, new_node: TreeNode) -> None:
 
 
 def in_order_tree_walk(node: Optional[TreeNode]) -> Generator[CT, None, None]:
-    """Generate the ordered sequence of node keys."""
-    if node is not None:
-        yield from in_order_tree_walk(node.left_child)
-        yield node.key
-        yield from in_order_tree_walk(node.right_child)
+    """Generate the ordered sequence of node keys.
+
+    The walk keeps its own stack of pending nodes rather than nesting one
+    generator per level, so each key costs O(1) amortized.
+    """
+    stack: List[TreeNode] = []
+    while stack or node is not None:
+        if node is not None:
+            stack.append(node)
+            node = node.left_child
+        else:
+            node = stack.pop()
+            yield node.key
+            node = node.right_child
 
 
 def tree_search(node: Optional[TreeNode], key: CT) -> Optional[TreeNode]:
     """Search a binary search tree from `node` for the specified `key`."""
-    if node is None or node.key == key:
-        return node
-    if key < node.key:
-        return tree_search(node.left_child, key)
-    return tree_search(node.right_child, key)
+    while node is not None and not node.key == key:
+        if key < node.key:
+            node = node.left_child
+        else:
+            node = node.right_child
+    return node
 
 
 def tree_minimum(node: Optional[TreeNode]) -> Optional[TreeNode]:
@@ -102,3 +162,461 @@ def tree_minimum(node: Optional[TreeNode]) -> Optional[TreeNode]:
     while node.left_child is not None:
         node = node.left_child
     return node
+
+
+def tree_maximum(node: Optional[TreeNode]) -> Optional[TreeNode]:
+    """Return the node with maximum key in the tree rooted at `node`."""
+    if node is None:
+        return None
+    while node.right_child is not None:
+        node = node.right_child
+    return node
+
+
+def _subtree_size(node: Optional[TreeNode]) -> int:
+    return 0 if node is None else node.size
+
+
+def _update_sizes(node: Optional[TreeNode]) -> None:
+    """Recompute subtree sizes from `node` up to the root."""
+    while node is not None:
+        node.size = 1 + _subtree_size(node.left_child) + _subtree_size(node.right_child)
+        node = node.parent
+
+
+def tree_successor(node: TreeNode) -> Optional[TreeNode]:
+    """Return the node with the next larger key, or None if there is none."""
+    if node.right_child is not None:
+        return tree_minimum(node.right_child)
+    parent = node.parent
+    while parent is not None and node is parent.right_child:
+        node = parent
+        parent = parent.parent
+    return parent
+
+
+def tree_predecessor(node: TreeNode) -> Optional[TreeNode]:
+    """Return the node with the next smaller key, or None if there is none."""
+    if node.left_child is not None:
+        return tree_maximum(node.left_child)
+    parent = node.parent
+    while parent is not None and node is parent.left_child:
+        node = parent
+        parent = parent.parent
+    return parent
+
+
+def transplant(
+    root: Optional[TreeNode], old: TreeNode, new: Optional[TreeNode]
+) -> Optional[TreeNode]:
+    """Replace the subtree rooted at `old` with the one rooted at `new`.
+
+    Returns the root of the whole tree, which changes if `old` was the root.
+    """
+    parent = old.parent
+    if parent is None:
+        root = new
+    elif old is parent.left_child:
+        parent.left_child = new
+    else:
+        parent.right_child = new
+    if new is not None:
+        new.parent = parent
+    return root
+
+
+def _minimum_node(node: TreeNode) -> TreeNode:
+    while node.left_child is not None:
+        node = node.left_child
+    return node
+
+
+def _replace_with_successor(
+    root: Optional[TreeNode], node: TreeNode, successor: TreeNode
+) -> Optional[TreeNode]:
+    """Move `successor`, the minimum of the right subtree of `node`, into its place."""
+    right, left = node.right_child, node.left_child
+    assert right is not None and left is not None
+    if successor is not right:
+        root = transplant(root, successor, successor.right_child)
+        successor.right_child = right
+        right.parent = successor
+    root = transplant(root, node, successor)
+    successor.left_child = left
+    left.parent = successor
+    return root
+
+
+def tree_delete(root: TreeNode, node: TreeNode) -> Optional[TreeNode]:
+    """Remove `node` from the tree with root `root` and return the new root."""
+    new_root: Optional[TreeNode]
+    if node.left_child is None:
+        resized = node.parent
+        new_root = transplant(root, node, node.right_child)
+    elif node.right_child is None:
+        resized = node.parent
+        new_root = transplant(root, node, node.left_child)
+    else:
+        successor = _minimum_node(node.right_child)
+        resized = successor if successor.parent is node else successor.parent
+        new_root = _replace_with_successor(root, node, successor)
+    _update_sizes(resized)
+    node.parent = node.left_child = node.right_child = None
+    node.size = 1
+    return new_root
+
+
+# Red-black trees: the same nodes and functions, kept balanced by recoloring
+# and rotating so that the depth of the tree is at most 2 log(n + 1).
+def _is_red(node: Optional[TreeNode]) -> bool:
+    return node is not None and node.color is NodeColor.RED
+
+
+def _rotated(root: TreeNode, x: TreeNode, y: TreeNode) -> TreeNode:
+    """Put `y`, a child of `x`, in the place of `x`; return the new root."""
+    new_root = transplant(root, x, y)
+    assert new_root is not None
+    x.parent = y
+    y.size = x.size
+    x.size = 1 + _subtree_size(x.left_child) + _subtree_size(x.right_child)
+    return new_root
+
+
+def left_rotate(root: TreeNode, x: TreeNode) -> TreeNode:
+    """Rotate `x` down to the left of its right child; return the new root."""
+    y = x.right_child
+    assert y is not None, "left_rotate needs a right child"
+    x.right_child = y.left_child
+    if y.left_child is not None:
+        y.left_child.parent = x
+    y.left_child = x
+    return _rotated(root, x, y)
+
+
+def right_rotate(root: TreeNode, x: TreeNode) -> TreeNode:
+    """Rotate `x` down to the right of its left child; return the new root."""
+    y = x.left_child
+    assert y is not None, "right_rotate needs a left child"
+    x.left_child = y.right_child
+    if y.right_child is not None:
+        y.right_child.parent = x
+    y.right_child = x
+    return _rotated(root, x, y)
+
+
+def rb_insert(root: Optional[TreeNode], new_node: TreeNode) -> TreeNode:
+    """Insert `new_node` into the red-black tree with root `root`.
+
+    `root` may be None for an empty tree. Returns the new root.
+    """
+    new_node.left_child = new_node.right_child = None
+    new_node.color = NodeColor.RED
+    new_node.size = 1
+    if root is None:
+        new_node.parent = None
+        new_node.color = NodeColor.BLACK
+        return new_node
+    tree_insert(root, new_node)
+
+    z = new_node
+    while _is_red(z.parent):
+        parent = z.parent
+        # a red node is never the root, so it has a parent of its own
+        assert parent is not None and parent.parent is not None
+        grandparent = parent.parent
+        if parent is grandparent.left_child:
+            uncle = grandparent.right_child
+            if uncle is not None and _is_red(uncle):
+                parent.color = uncle.color = NodeColor.BLACK
+                grandparent.color = NodeColor.RED
+                z = grandparent
+                continue
+            if z is parent.right_child:
+                root = left_rotate(root, parent)
+                parent = z
+            parent.color = NodeColor.BLACK
+            grandparent.color = NodeColor.RED
+            root = right_rotate(root, grandparent)
+            break
+        else:
+            uncle = grandparent.left_child
+            if uncle is not None and _is_red(uncle):
+                parent.color = uncle.color = NodeColor.BLACK
+                grandparent.color = NodeColor.RED
+                z = grandparent
+                continue
+            if z is parent.left_child:
+                root = right_rotate(root, parent)
+                parent = z
+            parent.color = NodeColor.BLACK
+            grandparent.color = NodeColor.RED
+            root = left_rotate(root, grandparent)
+            break
+    root.color = NodeColor.BLACK
+    return root
+
+
+def _child(node: TreeNode, left: bool) -> Optional[TreeNode]:
+    return node.left_child if left else node.right_child
+
+
+def rb_delete(root: TreeNode, node: TreeNode) -> Optional[TreeNode]:
+    """Remove `node` from the red-black tree with root `root`.
+
+    Returns the new root, which is None once the last node is removed.
+    """
+    new_root: Optional[TreeNode]
+    x_parent: Optional[TreeNode]
+    removed_color = node.color
+    if node.left_child is None:
+        x, x_parent = node.right_child, node.parent
+        resized = node.parent
+        new_root = transplant(root, node, node.right_child)
+    elif node.right_child is None:
+        x, x_parent = node.left_child, node.parent
+        resized = node.parent
+        new_root = transplant(root, node, node.left_child)
+    else:
+        successor = _minimum_node(node.right_child)
+        removed_color = successor.color
+        x = successor.right_child
+        x_parent = successor if successor.parent is node else successor.parent
+        new_root = _replace_with_successor(root, node, successor)
+        successor.color = node.color
+        resized = x_parent
+    _update_sizes(resized)
+    node.parent = node.left_child = node.right_child = None
+    node.size = 1
+
+    if removed_color is NodeColor.RED or new_root is None:
+        return new_root
+    root = new_root
+    # `x` carries an extra black that is pushed up or absorbed by rotation.
+    # The two cases mirror each other, so `near` says which side `x` is on.
+    while x is not root and not _is_red(x):
+        # `x` is below the root, and the extra black means its sibling exists
+        assert x_parent is not None
+        near = x is x_parent.left_child
+        rotate_near, rotate_far = (
+            (left_rotate, right_rotate) if near else (right_rotate, left_rotate)
+        )
+        sibling = _child(x_parent, not near)
+        assert sibling is not None
+        if _is_red(sibling):
+            sibling.color = NodeColor.BLACK
+            x_parent.color = NodeColor.RED
+            root = rotate_near(root, x_parent)
+            sibling = _child(x_parent, not near)
+            assert sibling is not None
+        if not _is_red(sibling.left_child) and not _is_red(sibling.right_child):
+            sibling.color = NodeColor.RED
+            x, x_parent = x_parent, x_parent.parent
+            continue
+        if not _is_red(_child(sibling, not near)):
+            nephew = _child(sibling, near)
+            assert nephew is not None
+            nephew.color = NodeColor.BLACK
+            sibling.color = NodeColor.RED
+            root = rotate_far(root, sibling)
+            sibling = _child(x_parent, not near)
+            assert sibling is not None
+        far_nephew = _child(sibling, not near)
+        assert far_nephew is not None
+        sibling.color = x_parent.color
+        x_parent.color = NodeColor.BLACK
+        far_nephew.color = NodeColor.BLACK
+        root = rotate_near(root, x_parent)
+        x = root
+    if x is not None:
+        x.color = NodeColor.BLACK
+    return root
+
+
+def build_balanced_tree(items: Sequence[Tuple[CT, Any]]) -> Optional[TreeNode]:
+    """Build a red-black tree from `(key, value)` pairs sorted by key, in O(n).
+
+    The middle pair becomes the root and each half is built the same way, so
+    every leaf is at the deepest level d or at d - 1. Coloring the nodes at
+    depth d red and all others black then satisfies the red-black properties.
+    """
+    if not items:
+        return None
+    deepest = len(items).bit_length() - 1
+
+    def _build(lo: int, hi: int, depth: int) -> Optional[TreeNode]:
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        key, value = items[mid]
+        color = NodeColor.RED if depth == deepest > 0 else NodeColor.BLACK
+        node = TreeNode(key=key, value=value, color=color, size=hi - lo + 1)
+        node.left_child = _build(lo, mid - 1, depth + 1)
+        if node.left_child is not None:
+            node.left_child.parent = node
+        node.right_child = _build(mid + 1, hi, depth + 1)
+        if node.right_child is not None:
+            node.right_child.parent = node
+        return node
+
+    return _build(0, len(items) - 1, 0)
+
+
+# Order statistics, using the subtree sizes every routine above maintains
+def tree_select(node: Optional[TreeNode], i: int) -> Optional[TreeNode]:
+    """Return the node with the i-th smallest key below `node`, or None."""
+    while node is not None:
+        k = _subtree_size(node.left_child) + 1
+        if i == k:
+            return node
+        if i < k:
+            node = node.left_child
+        else:
+            i = i - k
+            node = node.right_child
+    return None
+
+
+def _count_below(node: Optional[TreeNode], key: CT, inclusive: bool) -> int:
+    count = 0
+    while node is not None:
+        if key < node.key or (not inclusive and not node.key < key):
+            node = node.left_child
+        else:
+            count = count + _subtree_size(node.left_child) + 1
+            node = node.right_child
+    return count
+
+
+def tree_rank(root: Optional[TreeNode], key: CT) -> int:
+    """Return how many keys in the tree rooted at `root` are < `key`."""
+    return _count_below(root, key, inclusive=False)
+
+
+def tree_count_range(root: Optional[TreeNode], lo: CT, hi: CT) -> int:
+    """Return how many keys k in the tree rooted at `root` have lo <= k <= hi."""
+    if hi < lo:
+        return 0
+    return _count_below(root, hi, inclusive=True) - _count_below(root, lo, inclusive=False)
+
+
+class TreeMap(Generic[K, V]):
+    """A sorted mapping kept in a red-black tree of `TreeNode`s."""
+
+    def __init__(self, items: Iterable[Tuple[K, V]] = ()) -> None:
+        self._root: Optional[TreeNode] = None
+        self._size = 0
+        for key, value in items:
+            self[key] = value
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[Tuple[K, V]]) -> "TreeMap[K, V]":
+        """Build a map in O(n) from pairs in strictly increasing key order."""
+        items = list(items)
+        for (previous, _), (key, _) in zip(items, items[1:]):
+            if not previous < key:
+                raise ValueError("keys are not in strictly increasing order")
+        tree_map = cls()
+        tree_map._root = build_balanced_tree(items)
+        tree_map._size = len(items)
+        return tree_map
+
+    @property
+    def root(self) -> Optional[TreeNode]:
+        """Get the root of the underlying tree."""
+        return self._root
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: K) -> bool:
+        return tree_search(self._root, key) is not None
+
+    def __getitem__(self, key: K) -> V:
+        node = tree_search(self._root, key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        node = tree_search(self._root, key)
+        if node is not None:
+            node.value = value
+            return
+        self._root = rb_insert(self._root, TreeNode(key=key, value=value))
+        self._size = self._size + 1
+
+    def __delitem__(self, key: K) -> None:
+        node = tree_search(self._root, key)
+        if node is None or self._root is None:
+            raise KeyError(key)
+        self._root = rb_delete(self._root, node)
+        self._size = self._size - 1
+
+    def __iter__(self) -> Iterator[K]:
+        return self.irange()
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        node = tree_search(self._root, key)
+        return default if node is None else node.value
+
+    def items(self) -> Generator[Tuple[K, V], None, None]:
+        """Generate the `(key, value)` pairs in key order."""
+        node = tree_minimum(self._root)
+        while node is not None:
+            yield node.key, node.value
+            node = tree_successor(node)
+
+    def floor(self, key: K) -> Optional[K]:
+        """Return the largest key <= `key`, or None if there is none."""
+        node, best = self._root, None
+        while node is not None:
+            if key < node.key:
+                node = node.left_child
+            else:
+                best = node
+                node = node.right_child
+        return None if best is None else best.key
+
+    def ceiling(self, key: K) -> Optional[K]:
+        """Return the smallest key >= `key`, or None if there is none."""
+        node = self._ceiling_node(key)
+        return None if node is None else node.key
+
+    def _ceiling_node(self, key: K) -> Optional[TreeNode]:
+        node, best = self._root, None
+        while node is not None:
+            if node.key < key:
+                node = node.right_child
+            else:
+                best = node
+                node = node.left_child
+        return best
+
+    def select(self, i: int) -> K:
+        """Return the i-th smallest key, counting from 1, in O(log n)."""
+        node = tree_select(self._root, i)
+        if node is None:
+            raise IndexError(f"no key of rank {i} in a map of {self._size}")
+        return node.key
+
+    def rank(self, key: K) -> int:
+        """Return how many keys are < `key`, in O(log n)."""
+        return tree_rank(self._root, key)
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """Return how many keys k have lo <= k <= hi, in O(log n)."""
+        return tree_count_range(self._root, lo, hi)
+
+    def irange(
+        self, lo: Optional[K] = None, hi: Optional[K] = None
+    ) -> Generator[K, None, None]:
+        """Generate the keys k with `lo <= k <= hi` in order.
+
+        Either bound may be None for an open end. The scan finds its first
+        node in O(log n) and then follows successors, which costs O(1)
+        amortized per key.
+        """
+        node = tree_minimum(self._root) if lo is None else self._ceiling_node(lo)
+        while node is not None and (hi is None or not hi < node.key):
+            yield node.key
+            node = tree_successor(node)
@@ -0,0 +1,255 @@
+"""A sorted map that threads can share, built from persistent tree nodes."""
+
+import random
+import threading
+import time
+from typing import Any, Generator, Iterable, List, Optional, Tuple
+
+from python_algorithms.binary_search_tree import CT
+
+
+class _Node:
+    """A treap node that is never modified once it is reachable from a root."""
+
+    __slots__ = ("key", "value", "priority", "left", "right")
+
+    def __init__(
+        self,
+        key: CT,
+        value: Any,
+        priority: float,
+        left: Optional["_Node"],
+        right: Optional["_Node"],
+    ) -> None:
+        self.key: Any = key
+        self.value = value
+        self.priority = priority
+        self.left = left
+        self.right = right
+
+
+def _split(
+    node: Optional[_Node], key: CT
+) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Return copies of the treap `node` with keys < `key` and keys > `key`."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        return _Node(node.key, node.value, node.priority, node.left, left), right
+    if key < node.key:
+        left, right = _split(node.left, key)
+        return left, _Node(node.key, node.value, node.priority, right, node.right)
+    return node.left, node.right
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Join two treaps, every key of `left` being < every key of `right`."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        merged = _merge(left.right, right)
+        return _Node(left.key, left.value, left.priority, left.left, merged)
+    merged = _merge(left, right.left)
+    return _Node(right.key, right.value, right.priority, merged, right.right)
+
+
+def _insert(node: Optional[_Node], key: CT, value: Any, priority: float) -> _Node:
+    """Return a treap with `key` set to `value`, copying only one path."""
+    if node is None or priority > node.priority:
+        left, right = _split(node, key)
+        return _Node(key, value, priority, left, right)
+    if key < node.key:
+        left = _insert(node.left, key, value, priority)
+        return _Node(node.key, node.value, node.priority, left, node.right)
+    if node.key < key:
+        right = _insert(node.right, key, value, priority)
+        return _Node(node.key, node.value, node.priority, node.left, right)
+    return _Node(key, value, node.priority, node.left, node.right)
+
+
+def _delete(node: Optional[_Node], key: CT) -> Optional[_Node]:
+    """Return a treap without `key`, copying only one path."""
+    if node is None:
+        return None
+    if key < node.key:
+        left = _delete(node.left, key)
+        return _Node(node.key, node.value, node.priority, left, node.right)
+    if node.key < key:
+        right = _delete(node.right, key)
+        return _Node(node.key, node.value, node.priority, node.left, right)
+    return _merge(node.left, node.right)
+
+
+def _find(node: Optional[_Node], key: CT) -> Optional[_Node]:
+    while node is not None:
+        if key < node.key:
+            node = node.left
+        elif node.key < key:
+            node = node.right
+        else:
+            return node
+    return None
+
+
+class MapSnapshot:
+    """An immutable view of a `ConcurrentTreeMap` at one version."""
+
+    def __init__(self, root: Optional[_Node], size: int, version: int) -> None:
+        self._root = root
+        self._size = size
+        self._version = version
+
+    @property
+    def version(self) -> int:
+        """Get the number of writes made to the map before this snapshot."""
+        return self._version
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: CT) -> bool:
+        return _find(self._root, key) is not None
+
+    def __getitem__(self, key: CT) -> Any:
+        node = _find(self._root, key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __iter__(self) -> Generator[CT, None, None]:
+        return self.irange()
+
+    def get(self, key: CT, default: Any = None) -> Any:
+        node = _find(self._root, key)
+        return default if node is None else node.value
+
+    def items(
+        self, lo: Optional[CT] = None, hi: Optional[CT] = None
+    ) -> Generator[Tuple[CT, Any], None, None]:
+        """Generate the `(key, value)` pairs with `lo <= key <= hi` in order."""
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            if node is not None:
+                if lo is not None and node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                if hi is not None and hi < node.key:
+                    return
+                yield node.key, node.value
+                node = node.right
+
+    def irange(
+        self, lo: Optional[CT] = None, hi: Optional[CT] = None
+    ) -> Generator[CT, None, None]:
+        """Generate the keys with `lo <= key <= hi` in order."""
+        for key, _ in self.items(lo, hi):
+            yield key
+
+
+class ConcurrentTreeMap:
+    """A sorted map that any number of threads may read and write.
+
+    The map is a treap of persistent nodes: a write copies the O(log n) nodes
+    on one search path and publishes the new root with a single attribute
+    assignment. Readers therefore never take a lock and never see a partly
+    applied write, and iterating over a `snapshot` is unaffected by writes
+    that happen meanwhile. Writers are serialized by a lock.
+    """
+
+    def __init__(self, items: Iterable[Tuple[CT, Any]] = ()) -> None:
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._state = MapSnapshot(None, 0, 0)
+        for key, value in items:
+            self[key] = value
+
+    def snapshot(self) -> MapSnapshot:
+        """Return an immutable view of the map as it is now, in O(1)."""
+        return self._state
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def __contains__(self, key: CT) -> bool:
+        return key in self._state
+
+    def __getitem__(self, key: CT) -> Any:
+        return self._state[key]
+
+    def __iter__(self) -> Generator[CT, None, None]:
+        return iter(self._state)
+
+    def get(self, key: CT, default: Any = None) -> Any:
+        return self._state.get(key, default)
+
+    def irange(
+        self, lo: Optional[CT] = None, hi: Optional[CT] = None
+    ) -> Generator[CT, None, None]:
+        """Generate, from a snapshot, the keys with `lo <= key <= hi`."""
+        return self._state.irange(lo, hi)
+
+    def __setitem__(self, key: CT, value: Any) -> None:
+        with self._lock:
+            state = self._state
+            size = len(state) + (key not in state)
+            root = _insert(state._root, key, value, self._random.random())
+            self._state = MapSnapshot(root, size, state.version + 1)
+
+    def __delitem__(self, key: CT) -> None:
+        with self._lock:
+            state = self._state
+            if key not in state:
+                raise KeyError(key)
+            root = _delete(state._root, key)
+            self._state = MapSnapshot(root, len(state) - 1, state.version + 1)
+
+
+def benchmark_reader_scaling(
+    reader_counts: Iterable[int] = (1, 2, 4, 8),
+    num_keys: int = 10000,
+    duration: float = 1.0,
+) -> List[Tuple[int, float, float]]:
+    """Measure lookup and write throughput as the number of readers grows.
+
+    For each count, that many reader threads look up random keys while one
+    writer thread overwrites random keys, for `duration` seconds. Returns
+    `(readers, reads per second, writes per second)` for each count.
+    """
+    tree_map = ConcurrentTreeMap((key, key) for key in range(num_keys))
+    results = []
+    for num_readers in reader_counts:
+        stop = threading.Event()
+        reads = [0] * num_readers
+        writes = [0]
+
+        def read(i: int) -> None:
+            rng = random.Random(i)
+            while not stop.is_set():
+                for _ in range(100):
+                    tree_map.get(rng.randrange(num_keys))
+                reads[i] = reads[i] + 100
+
+        def write() -> None:
+            rng = random.Random(-1)
+            while not stop.is_set():
+                tree_map[rng.randrange(num_keys)] = 0
+                writes[0] = writes[0] + 1
+
+        threads = [threading.Thread(target=read, args=(i,)) for i in range(num_readers)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        results.append((num_readers, sum(reads) / duration, writes[0] / duration))
+    return results
@@ -1,23 +1,205 @@
 """Solving a few dynamic programming problems"""
 
-from functools import lru_cache
-import sys
-from typing import List, Tuple
+from array import array
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from python_algorithms.memo import Memo, content_key
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+# Above this many terms in the shorter factor, packing polynomials into big
+# ints beats NumPy's quadratic convolution
+CONVOLVE_CUTOFF = 2048
+
+# Results kept between calls, keyed by the contents of the inputs. Any of
+# these may be replaced, e.g. by a Memo with a disk tier.
+CUT_ROD_MEMO = Memo(maxsize=128, max_bytes=64 << 20)
+DICE_MEMO = Memo(maxsize=256, max_bytes=64 << 20)
+KNAPSACK_MEMO = Memo(maxsize=128, max_bytes=64 << 20)
+
+
+def clear_memos() -> None:
+    """Empty the memos of every solver in this module."""
+    for memo in (CUT_ROD_MEMO, DICE_MEMO, KNAPSACK_MEMO):
+        memo.clear()
+
+
+def cut_rod_table(
+    prices: Sequence[float], max_length: int, cut_cost: float = 0
+) -> Tuple[List[float], List[int]]:
+    """Solve rod cutting bottom-up for every length up to `max_length`.
+
+    A piece of length i sells for `prices[i - 1]`, and every cut costs
+    `cut_cost`. Returns the lists `revenue` and `first_piece`, where
+    `revenue[j]` is the best revenue for a rod of length j and
+    `first_piece[j]` the length of the first piece cut off to attain it.
+    With NumPy installed each length's maximum is taken over a vector.
+
+    The tables are kept in `CUT_ROD_MEMO` under the contents of `prices` and
+    `cut_cost`, and reused for any length they already cover.
+    """
+    if max_length > 0 and not prices:
+        raise ValueError("a rod cannot be cut without any prices")
+    key = content_key("cut_rod", list(prices), cut_cost)
+    tables = CUT_ROD_MEMO.get(key)
+    if tables is None or len(tables[0]) <= max_length:
+        tables = _solve_cut_rod(prices, max_length, cut_cost)
+        CUT_ROD_MEMO.put(key, tables)
+    revenue, first_piece = tables
+    return revenue[:max_length + 1], first_piece[:max_length + 1]
+
+
+def _solve_cut_rod(
+    prices: Sequence[float], max_length: int, cut_cost: float
+) -> Tuple[List[float], List[int]]:
+    if np is not None:
+        return _numpy_cut_rod_table(prices, max_length, cut_cost)
+    revenue = [0] * (max_length + 1)
+    first_piece = [0] * (max_length + 1)
+    for j in range(1, max_length + 1):
+        best = None
+        for i in range(1, min(j, len(prices)) + 1):
+            candidate = prices[i - 1] + revenue[j - i] - (cut_cost if i < j else 0)
+            if best is None or candidate > best:
+                best = candidate
+                first_piece[j] = i
+        revenue[j] = best
+    return revenue, first_piece
+
+
+def _numpy_cut_rod_table(
+    prices: Sequence[float], max_length: int, cut_cost: float
+) -> Tuple[List[float], List[int]]:
+    P = np.asarray(prices)
+    revenue = np.zeros(max_length + 1, dtype=np.result_type(P, cut_cost))
+    first_piece = np.zeros(max_length + 1, dtype=np.int64)
+    for j in range(1, max_length + 1):
+        k = min(j, len(P))
+        # candidates[i - 1] is the revenue if the first piece has length i
+        candidates = P[:k] + revenue[j - k:j][::-1] - cut_cost
+        if k == j:
+            candidates[-1] += cut_cost
+        i = int(np.argmax(candidates))
+        revenue[j] = candidates[i]
+        first_piece[j] = i + 1
+    return revenue.tolist(), first_piece.tolist()
 
 
 def cut_rod(prices: List[float], rod_length: int) -> float:
-    @lru_cache(maxsize=None)
-    def _cut_rod(rod_length):
-        if rod_length == 0:
-            return 0
+    """The best revenue from cutting up a rod of length `rod_length`."""
+    revenue, _ = cut_rod_table(prices, rod_length)
+    return revenue[rod_length]
+
+
+def cut_rod_solution(
+    prices: Sequence[float], rod_length: int, cut_cost: float = 0
+) -> Tuple[float, List[int]]:
+    """The best revenue for a rod of length `rod_length` and the piece lengths."""
+    revenue, first_piece = cut_rod_table(prices, rod_length, cut_cost)
+    pieces = []
+    j = rod_length
+    while j > 0:
+        pieces.append(first_piece[j])
+        j -= first_piece[j]
+    return revenue[rod_length], pieces
+
+
+def cut_rod_many(
+    prices: Sequence[float], rod_lengths: Iterable[int], cut_cost: float = 0
+) -> List[float]:
+    """The best revenue for each of `rod_lengths`, from one table."""
+    rod_lengths = list(rod_lengths)
+    revenue, _ = cut_rod_table(prices, max(rod_lengths, default=0), cut_cost)
+    return [revenue[j] for j in rod_lengths]
+
+
+def _pack(poly: Sequence[int], width: int) -> int:
+    """Pack the coefficients of `poly` into one int, `width` bytes apiece."""
+    return int.from_bytes(b"".join(c.to_bytes(width, "little") for c in poly), "little")
+
+
+def _unpack(packed: int, width: int, length: int) -> List[int]:
+    data = packed.to_bytes(width * length, "little")
+    return [int.from_bytes(data[k:k + width], "little") for k in range(0, len(data), width)]
+
+
+def poly_multiply(
+    a: Sequence[int], b: Sequence[int], modulus: Optional[int] = None
+) -> List[int]:
+    """Multiply two polynomials with non-negative integer coefficients.
+
+    Coefficients are listed from the constant term up. Short polynomials
+    whose product coefficients are known to fit in an int64 are convolved
+    with NumPy if it is installed. Otherwise both polynomials are packed
+    into big ints with room for the largest product coefficient (Kronecker
+    substitution) and multiplied with Python's subquadratic int
+    multiplication, so the result is exact. With a `modulus` the product
+    coefficients are reduced modulo it.
+    """
+    if not a or not b:
+        return []
+    length = len(a) + len(b) - 1
+    bound = min(len(a), len(b)) * max(a) * max(b)
+    if bound == 0:
+        return [0] * length
+    if np is not None and bound < 2 ** 63 and min(len(a), len(b)) <= CONVOLVE_CUTOFF:
+        product = np.convolve(np.array(a, dtype=np.int64), np.array(b, dtype=np.int64)).tolist()
+    else:
+        width = (bound.bit_length() + 7) // 8
+        product = _unpack(_pack(a, width) * _pack(b, width), width, length)
+    if modulus is not None:
+        product = [c % modulus for c in product]
+    return product
+
+
+def _dice_power(faces: int, num_dice: int, modulus: Optional[int]) -> Tuple[int, ...]:
+    """The generating polynomial of the sum of `num_dice` dice of `faces` faces."""
+    return DICE_MEMO.get_or_compute(
+        (faces, num_dice, modulus), lambda: _solve_dice_power(faces, num_dice, modulus)
+    )
+
+
+def _solve_dice_power(faces: int, num_dice: int, modulus: Optional[int]) -> Tuple[int, ...]:
+    """Raise x + x**2 + ... + x**faces to the power `num_dice` by squaring."""
+    result = [1]
+    base = [0] + [1] * faces
+    n = num_dice
+    while n:
+        if n & 1:
+            result = poly_multiply(result, base, modulus)
+        n >>= 1
+        if n:
+            base = poly_multiply(base, base, modulus)
+    return tuple(result)
 
-        revenue = -sys.maxsize
-        for i in range(1, rod_length + 1):
-            revenue = max(revenue, prices[i - 1] + _cut_rod(rod_length - i))
 
-        return revenue
+def dice_distribution(
+    dice: Union[int, Sequence[int]], faces: int = 6, modulus: Optional[int] = None
+) -> List[int]:
+    """Count the ways each sum can be rolled.
 
-    return _cut_rod(rod_length)
+    `dice` is either a number of dice with `faces` faces each or a sequence
+    giving the number of faces of each die, which may differ. Returns a list
+    whose item s is the number of ways to roll a sum of s, as an exact int
+    or, with a `modulus`, modulo it. The distribution for each kind of die
+    is computed by exponentiation by squaring and kept in `DICE_MEMO`.
+    """
+    if isinstance(dice, int):
+        if dice < 0:
+            raise ValueError("the number of dice cannot be negative")
+        dice = [faces] * dice
+    if modulus is not None and modulus < 1:
+        raise ValueError("modulus must be positive")
+    if any(f < 1 for f in dice):
+        raise ValueError("every die must have at least one face")
+    result = [1 % modulus] if modulus is not None else [1]
+    for f in sorted(set(dice)):
+        result = poly_multiply(result, _dice_power(f, dice.count(f), modulus), modulus)
+    return result
 
 
 def dice_rolls(num_rolls: int, sum_rolls: int) -> int:
@@ -25,18 +207,86 @@ def dice_rolls(num_rolls: int, sum_rolls: int) -> int:
 
     https://codereview.stackexchange.com/a/161016
     """
+    if num_rolls < 0:
+        return 0
+    distribution = dice_distribution(num_rolls)
+    return distribution[sum_rolls] if 0 <= sum_rolls < len(distribution) else 0
+
+
+def _zero_one_knapsack(
+    items: List[Tuple[int, int]], max_weight: int, reconstruct: bool
+) -> Tuple[int, List[int]]:
+    """Solve the 0/1 knapsack problem, or look it up in `KNAPSACK_MEMO`.
+
+    Returns the best value and, if `reconstruct`, the indices of the items
+    attaining it.
+    """
+    if max_weight < 0:
+        return 0, []
+    key = content_key("knapsack", list(items), max_weight, reconstruct)
+    best_value, chosen = KNAPSACK_MEMO.get_or_compute(
+        key, lambda: _solve_zero_one_knapsack(items, max_weight, reconstruct)
+    )
+    return best_value, list(chosen)
+
+
+def _solve_zero_one_knapsack(
+    items: List[Tuple[int, int]], max_weight: int, reconstruct: bool
+) -> Tuple[int, List[int]]:
+    """Solve the 0/1 knapsack problem bottom-up in O(len(items) * max_weight).
+
+    `best[w]` is the best value attainable with weight <= w using the items
+    seen so far; each item updates it from the top down, so it is used at
+    most once. If `reconstruct`, bit w of `taken[i]` records that item i
+    strictly improved `best[w]`, and the indices of the chosen items are
+    read back from those bitsets.
+    """
+    values = [value for value, _ in items]
+    if np is not None and all(isinstance(v, int) for v in values) and sum(values) < 2 ** 62:
+        best_value, taken = _numpy_zero_one_knapsack(items, max_weight, reconstruct)
+    else:
+        best = [0] * (max_weight + 1)
+        taken = []
+        for value, weight in items:
+            improved = bytearray(b"0") * (max_weight + 1)
+            for w in range(max_weight, weight - 1, -1):
+                candidate = best[w - weight] + value
+                if candidate > best[w]:
+                    best[w] = candidate
+                    improved[w] = ord("1")
+            if reconstruct:
+                improved.reverse()
+                taken.append(int(improved, 2))
+        best_value = best[max_weight]
+    if not reconstruct:
+        return best_value, []
+
+    w = max_weight
+    chosen = []
+    for i in range(len(items) - 1, -1, -1):
+        if taken[i] >> w & 1:
+            chosen.append(i)
+            w -= items[i][1]
+    chosen.reverse()
+    return best_value, chosen
 
-    @lru_cache(maxsize=None)
-    def _dice_rolls(num_rolls, sum_rolls):
-        if num_rolls == 0 and sum_rolls == 0:
-            return 1
-        if sum_rolls < num_rolls or sum_rolls > num_rolls * 6:
-            return 0
-        return sum(
-            _dice_rolls(num_rolls - 1, sum_rolls - value) for value in range(1, 7)
-        )
 
-    return _dice_rolls(num_rolls, sum_rolls)
+def _numpy_zero_one_knapsack(
+    items: List[Tuple[int, int]], max_weight: int, reconstruct: bool
+) -> Tuple[int, List[int]]:
+    best = np.zeros(max_weight + 1, dtype=np.int64)
+    taken = []
+    for value, weight in items:
+        if weight > max_weight:
+            taken.append(0)
+            continue
+        candidate = best[:max_weight + 1 - weight] + value
+        improved = candidate > best[weight:]
+        best[weight:] = np.where(improved, candidate, best[weight:])
+        if reconstruct:
+            bits = np.packbits(improved, bitorder="little").tobytes()
+            taken.append(int.from_bytes(bits, "little") << weight)
+    return int(best[max_weight]), taken
 
 
 def knapsack(
@@ -44,57 +294,175 @@ def knapsack(
 ) -> Tuple[int, List[Tuple[int, int]]]:
     """The classic 0/1 knapsack problem.
 
+    Items are `(value, weight)` pairs. Returns the best value and the items
+    attaining it, in input order.
+
     https://en.wikipedia.org/wiki/Knapsack_problem#0.2F1_knapsack_problem
     http://codereview.stackexchange.com/a/20581
     """
+    best_value, chosen = _zero_one_knapsack(items, max_weight, reconstruct=True)
+    return best_value, [items[i] for i in chosen]
 
-    @lru_cache(maxsize=None)
-    def best_value(i: int, w: int) -> int:
-        """Return the best value that can be attained using the
-        first i items with weight <= w.
-        """
-        if i == 0:
-            return 0
 
-        value, weight = items[i - 1]
+def knapsack_value(items: List[Tuple[int, int]], max_weight: int) -> int:
+    """The best value of the 0/1 knapsack problem, in O(max_weight) memory."""
+    best_value, _ = _zero_one_knapsack(items, max_weight, reconstruct=False)
+    return best_value
 
-        if weight > w:
-            return best_value(i - 1, w)
 
-        return max(best_value(i - 1, w), best_value(i - 1, w - weight) + value)
+def bounded_knapsack(
+    items: List[Tuple[int, int]], copies: List[int], max_weight: int
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """The knapsack problem with up to `copies[i]` copies of `items[i]`.
+
+    Each item's copies are split into bundles of 1, 2, 4, ... copies and a
+    remainder, any total up to `copies[i]` being a sum of distinct bundles,
+    and the bundles are packed as a 0/1 knapsack. Returns the best value and
+    the items attaining it, repeated once per copy, in input order.
+    """
+    bundles = []
+    owners = []
+    for i, ((value, weight), count) in enumerate(zip(items, copies)):
+        size = 1
+        while count > 0:
+            size = min(size, count)
+            bundles.append((value * size, weight * size))
+            owners.append((i, size))
+            count -= size
+            size *= 2
+    best_value, chosen = _zero_one_knapsack(bundles, max_weight, reconstruct=True)
+    counts = [0] * len(items)
+    for b in chosen:
+        i, size = owners[b]
+        counts[i] += size
+    return best_value, [item for item, count in zip(items, counts) for _ in range(count)]
+
 
-    # This code block is only necessary for listing the items.
-    # The best value can be, and is, computed without this
-    # code block.
+def unbounded_knapsack(
+    items: List[Tuple[int, int]], max_weight: int
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """The knapsack problem with any number of copies of each item.
+
+    `best[w]` is the best value attainable with weight <= w and `choice[w]`
+    the last item packed to attain it. Returns the best value and the items
+    attaining it, repeated once per copy, in input order.
+    """
+    if any(weight <= 0 and value > 0 for value, weight in items):
+        raise ValueError("an item of positive value must have positive weight")
+    if max_weight < 0:
+        return 0, []
+    best = [0] * (max_weight + 1)
+    choice = array("i", [-1]) * (max_weight + 1)
+    for w in range(1, max_weight + 1):
+        best[w], choice[w] = best[w - 1], choice[w - 1]
+        for i, (value, weight) in enumerate(items):
+            if weight <= w and best[w - weight] + value > best[w]:
+                best[w] = best[w - weight] + value
+                choice[w] = i
+    counts = [0] * len(items)
     w = max_weight
-    result = []
-    for i in range(len(items), 0, -1):
-        if best_value(i, w) != best_value(i - 1, w):
-            result.append(items[i - 1])
-            w -= items[i - 1][1]
-    result.reverse()
+    while choice[w] != -1:
+        i = choice[w]
+        counts[i] += 1
+        w -= items[i][1]
+    return best[max_weight], [item for item, count in zip(items, counts) for _ in range(count)]
+
+
+def _first_row(G: List[List[int]], width: int, mask: int) -> List[int]:
+    """The reachable path costs in the first `width` cells of row 1 of `G`.
+
+    Bit k of `bits[c]` is set if some path from (1, 1) to (1, c + 1) costs
+    k, not counting the value of (1, 1). Costs above `mask` are dropped.
+    """
+    return _next_row([1] + [0] * (width - 1), [0] + G[0][1:width], mask)
 
-    return best_value(len(items), max_weight), result
+
+def _next_row(above: List[int], row: Sequence[int], mask: int) -> List[int]:
+    """The reachable path costs in a row, given those in the row above.
+
+    A cell is entered from above or from the left, so its bitset is the OR
+    of theirs shifted left by its own value.
+    """
+    bits = []
+    left = 0
+    for reach, value in zip(above, row):
+        left = ((left | reach) << value) & mask
+        bits.append(left)
+    return bits
 
 
 def min_remainder(i: int, j: int, total: int, G: List[List[int]]) -> int:
     """Google Foobar: Save Beta Rabbit
 
+    Walk from (1, 1) to (i, j) of the grid `G`, moving down or right, and
+    pay the value of every cell after the first out of `total`. Returns the
+    least amount that can be left over, or -1 if every path costs more than
+    `total`. Each cell's reachable path costs are kept as the set bits of an
+    int, and only one row of those bitsets is kept at a time, so the work is
+    O(i * j * total / 64) and the memory O(j * total) bits.
+
     https://codereview.stackexchange.com/a/91593
     """
+    if total < 0 or i < 1 or j < 1:
+        return -1
+    mask = (1 << total + 1) - 1
+    bits = _first_row(G, j, mask)
+    for r in range(1, i):
+        bits = _next_row(bits, G[r][:j], mask)
+    cost = bits[j - 1].bit_length() - 1
+    return total - cost if cost >= 0 else -1
 
-    @lru_cache(maxsize=None)
-    def _min_remainder(i, j, total):
-        if total < 0 or i < 1 or j < 1:
-            return sys.maxsize
 
-        if i == 1 and j == 1:
-            return total
+def min_remainder_path(
+    i: int, j: int, total: int, G: List[List[int]]
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """Like `min_remainder`, but also return a path leaving that remainder.
+
+    The path is the list of 1-based `(row, column)` cells from (1, 1) to
+    (i, j), and is empty if there is none. The bitset rows are kept only
+    every sqrt(i) rows on the way down; walking back up, each band of rows
+    is recomputed from the checkpoint above it, which keeps the memory to
+    O(sqrt(i) * j) bitsets for twice the work.
+    """
+    if total < 0 or i < 1 or j < 1:
+        return -1, []
+    mask = (1 << total + 1) - 1
+    step = max(1, int(math.sqrt(i)))
+    checkpoints = {0: _first_row(G, j, mask)}
+    bits = checkpoints[0]
+    for r in range(1, i):
+        bits = _next_row(bits, G[r][:j], mask)
+        if r % step == 0:
+            checkpoints[r] = bits
+    cost = bits[j - 1].bit_length() - 1
+    if cost < 0:
+        return -1, []
 
-        return min(
-            _min_remainder(i - 1, j, total - G[i - 1][j - 1]),
-            _min_remainder(i, j - 1, total - G[i - 1][j - 1]),
-        )
+    def band(start: int) -> List[List[int]]:
+        rows = [checkpoints[start]]
+        for r in range(start + 1, min(start + step, i)):
+            rows.append(_next_row(rows[-1], G[r][:j], mask))
+        return rows
 
-    smallest = _min_remainder(i, j, total)
-    return smallest if smallest != sys.maxsize else -1
+    # Walk back from (i, j): a cell was entered from above if the path cost
+    # so far, less the cell's value, is reachable there, else from the left
+    remainder = total - cost
+    r, c = i - 1, j - 1
+    band_start = i
+    rows: List[List[int]] = []
+    path = [(i, j)]
+    while r > 0 or c > 0:
+        cost -= G[r][c]
+        if r > 0:
+            if r - 1 < band_start:
+                band_start = (r - 1) // step * step
+                rows = band(band_start)
+            if rows[r - 1 - band_start][c] >> cost & 1:
+                r -= 1
+            else:
+                c -= 1
+        else:
+            c -= 1
+        path.append((r + 1, c + 1))
+    path.reverse()
+    return remainder, path
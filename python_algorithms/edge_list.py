@@ -0,0 +1,220 @@
+"""Loading large edge-list files into a `CSRGraph`."""
+
+from array import array
+import itertools
+import os
+import struct
+import sys
+import time
+import tracemalloc
+from typing import Callable, Generator, List, Optional, Tuple
+
+from python_algorithms.graphs import CSRGraph
+
+try:
+    import resource
+except ImportError:
+    resource = None  # type: ignore
+
+# A binary edge record: source id, target id and weight, little-endian
+BINARY_EDGE = struct.Struct("<iid")
+
+# Number of bytes read from an edge file at a time
+CHUNK_SIZE = 1 << 20
+
+
+class _Interner(dict):
+    """Map labels to ids 0, 1, ... in order of first lookup."""
+
+    def __missing__(self, label: object) -> int:
+        self[label] = id_ = len(self)
+        return id_
+
+
+class LoadStats:
+    """What loading an edge list took.
+
+    `peak_memory` is the most memory the load itself had allocated at once,
+    in bytes, as traced by `tracemalloc`; it is None unless the load was
+    asked to trace memory. `process_peak_rss` is the peak resident set size
+    of the whole process since it started, which includes whatever it did
+    before the load, or None where the platform does not report it.
+    """
+
+    def __init__(
+        self,
+        num_edges: int,
+        num_vertices: int,
+        num_bytes: int,
+        seconds: float,
+        peak_memory: Optional[int] = None,
+    ) -> None:
+        self.num_edges = num_edges
+        self.num_vertices = num_vertices
+        self.num_bytes = num_bytes
+        self.seconds = seconds
+        self.peak_memory = peak_memory
+        self.process_peak_rss = _process_peak_rss()
+
+    def __repr__(self) -> str:
+        return (
+            f"LoadStats(num_edges={self.num_edges}, num_vertices={self.num_vertices}, "
+            f"num_bytes={self.num_bytes}, seconds={self.seconds:.2f}, "
+            f"peak_memory={self.peak_memory}, process_peak_rss={self.process_peak_rss})"
+        )
+
+
+def _process_peak_rss() -> Optional[int]:
+    """Return the peak resident set size of this process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _text_chunks(f, chunk_size: int) -> Generator[Tuple[str, int], None, None]:
+    """Read whole lines from the file `f`, about `chunk_size` bytes at a time.
+
+    Yields the text of each chunk with the number of bytes it took.
+    """
+    rest = b""
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            if rest:
+                yield rest.decode(), len(rest)
+            return
+        data = rest + data
+        end = data.rfind(b"\n") + 1
+        rest = data[end:]
+        if end:
+            yield data[:end].decode(), end
+
+
+def _split_columns(
+    text: str, delimiter: Optional[str], default_weight: float
+) -> Tuple[List[str], List[str], List[float]]:
+    """Split the edges in `text` into columns of sources, targets and weights.
+
+    When a `delimiter` is given and every line holds it the same number of
+    times, the whole chunk is split in one call and the columns are sliced
+    out of the result; otherwise it is split line by line, skipping blank
+    lines and `#` comments.
+    """
+    lines = text.splitlines()
+    if delimiter is not None and "#" not in text:
+        counts = set(map(str.count, lines, itertools.repeat(delimiter)))
+        if counts == {1} or counts == {2}:
+            width = counts.pop() + 1
+            fields = delimiter.join(lines).split(delimiter)
+            if width == 3:
+                weights = list(map(float, fields[2::3]))
+            else:
+                weights = [default_weight] * len(lines)
+            return fields[0::width], fields[1::width], weights
+
+    rows = [line.split(delimiter) for line in lines]
+    rows = [row for row in rows if row and row[0] and not row[0].startswith("#")]
+    weights = [float(row[2]) if len(row) > 2 else default_weight for row in rows]
+    return [row[0] for row in rows], [row[1] for row in rows], weights
+
+
+def load_edge_list(
+    path: str,
+    delimiter: Optional[str] = None,
+    binary: bool = False,
+    default_weight: float = 1.0,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+    trace_memory: bool = False,
+) -> Tuple[CSRGraph, LoadStats]:
+    """Build a `CSRGraph` from the edge-list file at `path`.
+
+    Text files hold one `source target [weight]` edge per line, split on
+    `delimiter`; by default a tab for `.tsv` files, a comma for `.csv` files
+    and any whitespace otherwise. Blank lines and lines starting with `#`
+    are skipped, and edges without a weight get `default_weight`. With
+    `binary`, the file is a sequence of `BINARY_EDGE` records and the labels
+    are the integer ids in them.
+
+    The file is read `chunk_size` bytes at a time. Labels are interned into
+    vertex ids as they are first seen, and edges go straight into flat
+    arrays of ids and weights, which are counting-sorted into CSR form once
+    the file is read, so memory grows with the number of edges and labels
+    rather than with the size of the text. `progress`, if given, is called
+    after each chunk with the number of edges and bytes read so far.
+
+    Returns the graph and a `LoadStats`. With `trace_memory`, the load runs
+    under `tracemalloc`, which slows it down, so that the stats can report
+    its peak memory.
+    """
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    elif trace_memory and hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+    try:
+        graph, num_bytes, seconds = _load(
+            path, delimiter, binary, default_weight, chunk_size, progress
+        )
+        peak = tracemalloc.get_traced_memory()[1] - baseline if trace_memory else None
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    return graph, LoadStats(graph.num_edges, graph.num_vertices, num_bytes, seconds, peak)
+
+
+def _load(
+    path: str,
+    delimiter: Optional[str],
+    binary: bool,
+    default_weight: float,
+    chunk_size: int,
+    progress: Optional[Callable[[int, int], None]],
+) -> Tuple[CSRGraph, int, float]:
+    start = time.perf_counter()
+    ids = _Interner()
+    intern = ids.__getitem__
+    sources = array("i")
+    targets = array("i")
+    edge_weights = array("d")
+    num_bytes = 0
+    with open(path, "rb") as f:
+        if binary:
+            chunk_size = max(chunk_size // BINARY_EDGE.size, 1) * BINARY_EDGE.size
+            while True:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+                if len(data) % BINARY_EDGE.size:
+                    raise ValueError(f"{path} ends with a partial edge record")
+                for first_label, second_label, edge_weight in BINARY_EDGE.iter_unpack(data):
+                    sources.append(intern(first_label))
+                    targets.append(intern(second_label))
+                    edge_weights.append(edge_weight)
+                num_bytes = num_bytes + len(data)
+                if progress is not None:
+                    progress(len(sources), num_bytes)
+        else:
+            if delimiter is None:
+                delimiter = {".tsv": "\t", ".csv": ","}.get(os.path.splitext(path)[1])
+            for text, size in _text_chunks(f, chunk_size):
+                first, second, weights = _split_columns(text, delimiter, default_weight)
+                ends = array("i", map(intern, itertools.chain.from_iterable(zip(first, second))))
+                sources.extend(ends[0::2])
+                targets.extend(ends[1::2])
+                edge_weights.extend(weights)
+                num_bytes = num_bytes + size
+                if progress is not None:
+                    progress(len(sources), num_bytes)
+    graph = CSRGraph._from_edge_arrays(list(ids), sources, targets, edge_weights)
+    return graph, num_bytes, time.perf_counter() - start
+
+
+def dump_edge_list(graph: CSRGraph, path: str) -> None:
+    """Write the edges of `graph` as `BINARY_EDGE` records of vertex ids."""
+    with open(path, "wb") as f:
+        for u in range(graph.num_vertices):
+            f.write(b"".join(BINARY_EDGE.pack(u, v, w) for v, w in graph.edges(u)))
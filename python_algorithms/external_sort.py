@@ -0,0 +1,134 @@
+"""Sorting datasets that do not fit in memory."""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Generator, Iterable, Iterator, List, Optional, Union
+
+from python_algorithms.priority_queue import MaxHeap, MinHeap
+from python_algorithms.sorting import quick_sort
+
+# Number of items pickled together when a sorted run is spilled to disk
+RUN_BLOCK_SIZE = 4096
+
+
+def _chunks(items: Iterable[Any], chunk_size: int) -> Generator[List[Any], None, None]:
+    """Split `items` into lists of at most `chunk_size` items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _read_lines(path: str, encoding: str) -> Generator[str, None, None]:
+    with open(path, encoding=encoding) as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def _sort_run(
+    chunk: List[Any],
+    dirname: str,
+    key: Optional[Callable[[Any], Any]],
+    reverse: bool,
+) -> str:
+    """Sort `chunk` and spill it to a new file in `dirname`; return its path.
+
+    The run is written as a sequence of pickled blocks of `RUN_BLOCK_SIZE`
+    items, so it can be read back one block at a time.
+    """
+    quick_sort(chunk, key=key, reverse=reverse)
+    fd, path = tempfile.mkstemp(suffix=".run", dir=dirname)
+    with os.fdopen(fd, "wb") as f:
+        for i in range(0, len(chunk), RUN_BLOCK_SIZE):
+            pickle.dump(chunk[i:i + RUN_BLOCK_SIZE], f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path: str) -> Generator[Any, None, None]:
+    """Stream the items of a run written by `_sort_run`."""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                return
+            yield from block
+
+
+def merge_runs(
+    runs: List[Iterator[Any]],
+    key: Optional[Callable[[Any], Any]] = None,
+    reverse: bool = False,
+) -> Generator[Any, None, None]:
+    """Stream the k-way merge of the sorted iterators `runs`.
+
+    The head of each run sits in a heap as `(key, run number, item)`; ties
+    go to the earlier run, so the merge is stable. Runs sorted with `reverse`
+    are merged through a max-heap with negated run numbers.
+    """
+    sign = -1 if reverse else 1
+    entries = []
+    for number, run in enumerate(runs):
+        for item in run:
+            entries.append((item if key is None else key(item), sign * number, item))
+            break
+    heap = MaxHeap(entries) if reverse else MinHeap(entries)
+    while len(heap):
+        _, number, item = heap.peek()
+        yield item
+        for successor in runs[sign * number]:
+            key_value = successor if key is None else key(successor)
+            heap.replace((key_value, number, successor))
+            break
+        else:
+            heap.pop()
+
+
+def external_sort(
+    source: Union[str, Iterable[Any]],
+    chunk_size: int = 1000000,
+    max_workers: Optional[int] = None,
+    tmp_dir: Optional[str] = None,
+    key: Optional[Callable[[Any], Any]] = None,
+    reverse: bool = False,
+    encoding: str = "utf-8",
+) -> Generator[Any, None, None]:
+    """Sort a file or iterable that may not fit in memory.
+
+    `source` is either an iterable or the path of a text file in `encoding`,
+    whose lines (without their newlines) are sorted. The input is read in chunks of
+    `chunk_size` items, each sorted by `quick_sort` in a worker process and
+    spilled to a temporary file in `tmp_dir`; the sorted items are then
+    streamed from a k-way merge of those runs. At most `max_workers` chunks
+    are in flight at a time, so memory use is bounded by roughly
+    `2 * max_workers * chunk_size` items. `key`, which must be picklable,
+    and `reverse` work as for `sorted`, and the sort is stable.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = _read_lines(os.fspath(source), encoding)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    chunks = _chunks(source, chunk_size)
+
+    first = next(chunks, [])
+    if len(first) < chunk_size:
+        quick_sort(first, key=key, reverse=reverse)
+        yield from first
+        return
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as dirname:
+        paths = []
+        with ProcessPoolExecutor(max_workers) as executor:
+            pending: deque = deque()
+            for chunk in itertools.chain([first], chunks):
+                pending.append(executor.submit(_sort_run, chunk, dirname, key, reverse))
+                while len(pending) > max_workers:
+                    paths.append(pending.popleft().result())
+            paths.extend(future.result() for future in pending)
+        yield from merge_runs([_read_run(path) for path in paths], key, reverse)
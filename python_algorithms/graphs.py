@@ -1,9 +1,26 @@
 """Noodling with graph algorithms."""
 
+from array import array
 from collections import deque
 from enum import Enum
+import math
+import random
 import sys
-from typing import Dict, Iterable, Optional, Set, Tuple
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union, cast
+
+from python_algorithms.priority_queue import PriorityQueue
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+# Direction-optimizing BFS switches to bottom-up steps once the edges out of
+# the frontier exceed 1/ALPHA of the edges out of unvisited vertices, and back
+# to top-down once the frontier holds fewer than 1/BETA of all vertices.
+BFS_ALPHA = 14
+BFS_BETA = 24
 
 
 class NodeColor(Enum):
@@ -80,11 +97,27 @@ class Vertex:
 class Graph:
     def __init__(self, connections: Iterable[Tuple[str, str, float]]) -> None:
         self._build_graph(connections)
+        self._reverse_adjacency: Optional[Dict[str, Dict[str, float]]] = None
 
     @property
     def vertices(self) -> Dict[str, Vertex]:
         return self._vertices
 
+    @property
+    def reverse_adjacency(self) -> Dict[str, Dict[str, float]]:
+        """Map each label to the labels of its in-neighbors and edge weights.
+
+        Built on first use and then cached, so it does not see edges added
+        to the vertices afterwards.
+        """
+        if self._reverse_adjacency is None:
+            reverse: Dict[str, Dict[str, float]] = {label: {} for label in self._vertices}
+            for u in self._vertices.values():
+                for v, weight in (u.neighbors or {}).items():
+                    reverse[v.label][u.label] = weight
+            self._reverse_adjacency = reverse
+        return self._reverse_adjacency
+
     def _build_graph(self, connections: Iterable[Tuple[str, str, float]]) -> None:
         self._vertices: Dict[str, Vertex] = dict()
         for first_label, second_label, edge_weight in connections:
@@ -112,7 +145,7 @@ def breadth_first_search(graph: Graph, origin: Vertex) -> None:
 
     while Q:
         u = Q.popleft()
-        for v in u.neighbors:
+        for v in u.neighbors or ():
             if v.color == NodeColor.WHITE:
                 v.color = NodeColor.GRAY
                 v.distance = u.distance + 1
@@ -120,3 +153,590 @@ def breadth_first_search(graph: Graph, origin: Vertex) -> None:
                 Q.append(v)
         u.color = NodeColor.BLACK
 
+
+class BFSResult:
+    """The distances and predecessors found by `bfs`, keyed by vertex label.
+
+    Only vertices the search reached have entries.
+    """
+
+    def __init__(
+        self, distance: Dict[str, int], predecessor: Dict[str, Optional[str]]
+    ) -> None:
+        self._distance = distance
+        self._predecessor = predecessor
+
+    @property
+    def distance(self) -> Dict[str, int]:
+        """Get the number of edges from the nearest origin to each vertex."""
+        return self._distance
+
+    @property
+    def predecessor(self) -> Dict[str, Optional[str]]:
+        """Get each vertex's predecessor on a shortest path, None for origins."""
+        return self._predecessor
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._distance
+
+    def path_to(self, label: str) -> List[str]:
+        """Return the labels on a shortest path from an origin to `label`."""
+        return _path_to(self._predecessor, label)
+
+
+def _path_to(predecessor: Dict[str, Optional[str]], label: str) -> List[str]:
+    if label not in predecessor:
+        raise KeyError(f"vertex {label} was not reached")
+    path = []
+    current: Optional[str] = label
+    while current is not None:
+        path.append(current)
+        current = predecessor[current]
+    path.reverse()
+    return path
+
+
+def bfs(
+    graph: Graph,
+    origins: Union[str, Iterable[str]],
+    target: Optional[str] = None,
+    max_depth: Optional[int] = None,
+) -> BFSResult:
+    """Breadth-first search of `graph` from one or more origin labels.
+
+    Unlike `breadth_first_search` nothing is written to the vertices: the
+    search state lives in dicts local to the call, so searches can run
+    concurrently and cost is proportional to the region reached rather than
+    to the whole graph. The search stops as soon as `target` is reached, and
+    does not go more than `max_depth` edges from the origins.
+    """
+    if isinstance(origins, str):
+        origins = [origins]
+    vertices = graph.vertices
+    distance: Dict[str, int] = {}
+    predecessor: Dict[str, Optional[str]] = {}
+    Q: deque = deque()
+    for label in origins:
+        if label not in distance:
+            distance[label] = 0
+            predecessor[label] = None
+            Q.append(vertices[label])
+    if target is not None and target in distance:
+        return BFSResult(distance, predecessor)
+
+    while Q:
+        u = Q.popleft()
+        d = distance[u.label] + 1
+        if max_depth is not None and d > max_depth:
+            break
+        for v in u.neighbors or ():
+            label = v.label
+            if label not in distance:
+                distance[label] = d
+                predecessor[label] = u.label
+                if label == target:
+                    return BFSResult(distance, predecessor)
+                Q.append(v)
+    return BFSResult(distance, predecessor)
+
+
+class ShortestPaths:
+    """The weighted distances and predecessors found by `dijkstra` or `a_star`.
+
+    Only vertices whose distance was settled have entries.
+    """
+
+    def __init__(
+        self, distance: Dict[str, float], predecessor: Dict[str, Optional[str]]
+    ) -> None:
+        self._distance = distance
+        self._predecessor = predecessor
+
+    @property
+    def distance(self) -> Dict[str, float]:
+        """Get the total edge weight from the origin to each vertex."""
+        return self._distance
+
+    @property
+    def predecessor(self) -> Dict[str, Optional[str]]:
+        """Get each vertex's predecessor on a shortest path, None for the origin."""
+        return self._predecessor
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._distance
+
+    def path_to(self, label: str) -> List[str]:
+        """Return the labels on a shortest path from the origin to `label`."""
+        return _path_to(self._predecessor, label)
+
+
+def _check_weight(weight: float) -> float:
+    if weight < 0:
+        raise ValueError("Dijkstra's algorithm needs non-negative edge weights")
+    return weight
+
+
+def dijkstra(graph: Graph, origin: str, target: Optional[str] = None) -> ShortestPaths:
+    """Single-source shortest paths in `graph` from the label `origin`.
+
+    Vertices are settled in order of distance using a `PriorityQueue`, and
+    the search stops once `target`, if given, is settled.
+    """
+    return a_star(graph, origin, target, heuristic=None)
+
+
+def a_star(
+    graph: Graph,
+    origin: str,
+    target: Optional[str],
+    heuristic: Optional[Callable[[str], float]],
+) -> ShortestPaths:
+    """A* search from `origin` towards `target`.
+
+    `heuristic(label)` must never overestimate the distance from `label` to
+    `target`, and should be consistent (h(u) <= w(u, v) + h(v)). Vertices
+    are then settled in order of distance plus heuristic, so the distance to
+    `target` is exact once it is settled. Without a heuristic this is
+    `dijkstra`.
+    """
+    vertices = graph.vertices
+    settled: Dict[str, float] = {}
+    tentative: Dict[str, float] = {origin: 0.0}
+    predecessor: Dict[str, Optional[str]] = {origin: None}
+    queue = PriorityQueue([(origin, heuristic(origin) if heuristic else 0.0)])
+    while len(queue):
+        popped, _ = queue.pop()
+        label = cast(str, popped)
+        d = settled[label] = tentative.pop(label)
+        if label == target:
+            break
+        for v, weight in (vertices[label].neighbors or {}).items():
+            v_label = v.label
+            if v_label in settled:
+                continue
+            new_distance = d + _check_weight(weight)
+            if v_label not in tentative or new_distance < tentative[v_label]:
+                tentative[v_label] = new_distance
+                predecessor[v_label] = label
+                priority = new_distance + heuristic(v_label) if heuristic else new_distance
+                queue.push(v_label, priority)
+    return ShortestPaths(settled, {label: predecessor[label] for label in settled})
+
+
+def bidirectional_dijkstra(graph: Graph, origin: str, target: str) -> Tuple[float, List[str]]:
+    """Shortest path from `origin` to `target`, searching from both ends.
+
+    A forward search over the edges and a backward search over
+    `Graph.reverse_adjacency` take turns settling whichever frontier vertex is
+    nearer. Every edge relaxed into a vertex the other side has reached
+    offers a candidate path, and the search stops once the two frontier
+    distances add up to no less than the best candidate. Returns the
+    distance and the labels on the path, or `(math.inf, [])` if `target`
+    cannot be reached.
+    """
+    if origin == target:
+        return 0.0, [origin]
+    vertices = graph.vertices
+    reverse = graph.reverse_adjacency
+
+    def forward_edges(label: str) -> Iterable[Tuple[str, float]]:
+        return ((v.label, weight) for v, weight in (vertices[label].neighbors or {}).items())
+
+    def backward_edges(label: str) -> Iterable[Tuple[str, float]]:
+        return reverse[label].items()
+
+    distance = ({origin: 0.0}, {target: 0.0})
+    parent: Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]] = (
+        {origin: None},
+        {target: None},
+    )
+    queues = (PriorityQueue([(origin, 0.0)]), PriorityQueue([(target, 0.0)]))
+    settled: Tuple[Set[str], Set[str]] = (set(), set())
+    edges = (forward_edges, backward_edges)
+    top = [0.0, 0.0]
+    best, meeting = math.inf, None
+    while top[0] + top[1] < best:
+        side = 0 if top[0] <= top[1] else 1
+        popped, d = queues[side].pop()
+        label = cast(str, popped)
+        settled[side].add(label)
+        mine, theirs = distance[side], distance[1 - side]
+        for v_label, weight in edges[side](label):
+            if v_label in settled[side]:
+                continue
+            new_distance = d + _check_weight(weight)
+            if v_label not in mine or new_distance < mine[v_label]:
+                mine[v_label] = new_distance
+                parent[side][v_label] = label
+                queues[side].push(v_label, new_distance)
+            if v_label in theirs and mine[v_label] + theirs[v_label] < best:
+                best = mine[v_label] + theirs[v_label]
+                meeting = v_label
+        top[side] = queues[side].peek()[1] if len(queues[side]) else math.inf
+
+    if meeting is None:
+        return math.inf, []
+    path = []
+    current: Optional[str] = meeting
+    while current is not None:
+        path.append(current)
+        current = parent[0][current]
+    path.reverse()
+    current = parent[1][meeting]
+    while current is not None:
+        path.append(current)
+        current = parent[1][current]
+    return best, path
+
+
+def grid_road_network(side: int, seed: int = 0) -> Tuple[Graph, Dict[str, Tuple[int, int]]]:
+    """Build a synthetic road network on a `side` x `side` grid.
+
+    Each intersection has two-way roads to its grid neighbors, with lengths
+    drawn uniformly from [1, 2), so the graph is sparse and near-planar with
+    a degree of about four, like a street map. Returns the graph and the
+    grid position of each label.
+    """
+    rng = random.Random(seed)
+    position = {f"{x},{y}": (x, y) for x in range(side) for y in range(side)}
+    connections = []
+    for x in range(side):
+        for y in range(side):
+            for nx, ny in ((x + 1, y), (x, y + 1)):
+                if nx < side and ny < side:
+                    length = 1.0 + rng.random()
+                    connections.append((f"{x},{y}", f"{nx},{ny}", length))
+                    connections.append((f"{nx},{ny}", f"{x},{y}", length))
+    return Graph(connections), position
+
+
+def benchmark_shortest_paths(
+    side: int = 300, num_queries: int = 10, seed: int = 0
+) -> List[Tuple[str, float]]:
+    """Time the searches against `bfs` on a `grid_road_network(side)`.
+
+    The same `num_queries` random origin and target pairs are searched by
+    unweighted `bfs`, single-source `dijkstra` over the whole graph,
+    `dijkstra` stopping at the target, `a_star` with a Manhattan distance
+    heuristic and `bidirectional_dijkstra`, named "bidirectional". Returns `(name, mean seconds per
+    query)` for each.
+    """
+    graph, position = grid_road_network(side, seed)
+    rng = random.Random(seed)
+    labels = list(position)
+    queries = [(rng.choice(labels), rng.choice(labels)) for _ in range(num_queries)]
+    # the reverse adjacency is built once per graph, not per query
+    reverse = graph.reverse_adjacency
+    assert len(reverse) == len(labels)
+
+    def manhattan(target: str) -> Callable[[str], float]:
+        tx, ty = position[target]
+        # every road is at least 1 long, so this never overestimates
+        return lambda label: abs(position[label][0] - tx) + abs(position[label][1] - ty)
+
+    searches: List[Tuple[str, Callable[[str, str], Any]]] = [
+        ("bfs", lambda origin, target: bfs(graph, origin)),
+        ("dijkstra", lambda origin, target: dijkstra(graph, origin)),
+        ("dijkstra to target", lambda origin, target: dijkstra(graph, origin, target)),
+        ("a_star", lambda origin, target: a_star(graph, origin, target, manhattan(target))),
+        ("bidirectional", lambda origin, target: bidirectional_dijkstra(graph, origin, target)),
+    ]
+    results = []
+    for name, search in searches:
+        start = time.perf_counter()
+        for origin, target in queries:
+            search(origin, target)
+        results.append((name, (time.perf_counter() - start) / num_queries))
+    return results
+
+
+class CSRGraph:
+    """A directed graph in compressed sparse row form.
+
+    Vertices are numbered 0, 1, ... in order of first appearance, and
+    `labels[u]` maps an id back to its label. The targets of the edges out of
+    vertex u are `indices[indptr[u]:indptr[u + 1]]`, with their weights at
+    the same positions of `weights`. All three are flat `array.array`s, so a
+    graph costs 12 bytes per edge and 8 bytes per vertex plus its labels.
+    """
+
+    def __init__(
+        self, labels: List[str], indptr: array, indices: array, weights: array
+    ) -> None:
+        self._labels = labels
+        self._ids = {label: u for u, label in enumerate(labels)}
+        self._indptr = indptr
+        self._indices = indices
+        self._weights = weights
+
+    @classmethod
+    def from_connections(
+        cls, connections: Iterable[Tuple[str, str, float]]
+    ) -> "CSRGraph":
+        """Build a graph from the `(src, dst, weight)` triples `Graph` takes.
+
+        The edges are first collected as parallel arrays of integer ids and
+        then counting-sorted by source, which keeps the edges out of each
+        vertex in input order.
+        """
+        ids: Dict[str, int] = {}
+        sources = array("i")
+        targets = array("i")
+        edge_weights = array("d")
+        for first_label, second_label, edge_weight in connections:
+            sources.append(ids.setdefault(first_label, len(ids)))
+            targets.append(ids.setdefault(second_label, len(ids)))
+            edge_weights.append(edge_weight)
+        return cls._from_edge_arrays(list(ids), sources, targets, edge_weights)
+
+    @classmethod
+    def _from_edge_arrays(
+        cls, labels: List[str], sources: array, targets: array, edge_weights: array
+    ) -> "CSRGraph":
+        if np is not None and len(sources) > 0:
+            src = np.frombuffer(sources, dtype=np.int32)
+            order = np.argsort(src, kind="stable")
+            counts = np.bincount(src, minlength=len(labels))
+            indptr = array("q", [0])
+            # the `data` memoryviews of the results spare a copy through bytes
+            indptr.frombytes(np.cumsum(counts, dtype=np.int64).data.cast("B"))
+            indices = array("i")
+            indices.frombytes(np.frombuffer(targets, dtype=np.int32)[order].data.cast("B"))
+            weights = array("d")
+            weights.frombytes(np.frombuffer(edge_weights, dtype=np.float64)[order].data.cast("B"))
+            return cls(labels, indptr, indices, weights)
+        indptr = array("q", [0]) * (len(labels) + 1)
+        for u in sources:
+            indptr[u + 1] += 1
+        for u in range(len(labels)):
+            indptr[u + 1] += indptr[u]
+        position = array("q", indptr[:-1])
+        indices = array("i", [0]) * len(sources)
+        weights = array("d", [0.0]) * len(sources)
+        for u, v, w in zip(sources, targets, edge_weights):
+            i = position[u]
+            indices[i] = v
+            weights[i] = w
+            position[u] = i + 1
+        return cls(labels, indptr, indices, weights)
+
+    @classmethod
+    def from_graph(cls, graph: "Graph") -> "CSRGraph":
+        """Build a CSR copy of `graph`."""
+        return cls.from_connections(
+            (u.label, v.label, weight)
+            for u in graph.vertices.values()
+            for v, weight in (u.neighbors or {}).items()
+        )
+
+    def to_graph(self) -> "Graph":
+        """Build a `Graph` with the same edges.
+
+        A `Graph` is built from edges alone, so vertices without any edges
+        are left out.
+        """
+        return Graph(
+            (self._labels[u], self._labels[v], w)
+            for u in range(self.num_vertices)
+            for v, w in self.edges(u)
+        )
+
+    @property
+    def labels(self) -> List[str]:
+        """Get the vertex labels, indexed by vertex id."""
+        return self._labels
+
+    @property
+    def indptr(self) -> array:
+        return self._indptr
+
+    @property
+    def indices(self) -> array:
+        return self._indices
+
+    @property
+    def weights(self) -> array:
+        return self._weights
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self._labels)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self._indices)
+
+    def vertex_id(self, label: str) -> int:
+        """Get the id of the vertex labelled `label`."""
+        return self._ids[label]
+
+    def neighbors(self, u: int) -> array:
+        """Get the ids of the targets of the edges out of vertex `u`."""
+        return self._indices[self._indptr[u]:self._indptr[u + 1]]
+
+    def edges(self, u: int) -> Iterable[Tuple[int, float]]:
+        """Generate `(target id, weight)` for each edge out of vertex `u`."""
+        lo, hi = self._indptr[u], self._indptr[u + 1]
+        return zip(self._indices[lo:hi], self._weights[lo:hi])
+
+    def transpose(self) -> "CSRGraph":
+        """Build the graph with every edge reversed, keeping the vertex ids.
+
+        The neighbors of u in the transpose are the in-neighbors of u here.
+        """
+        indptr = self._indptr
+        sources = array("i")
+        for u in range(self.num_vertices):
+            sources.extend(array("i", [u]) * (indptr[u + 1] - indptr[u]))
+        return type(self)._from_edge_arrays(
+            self._labels, self._indices, sources, self._weights
+        )
+
+
+def csr_breadth_first_search(graph: CSRGraph, origin: int) -> Tuple[array, array]:
+    """Breadth-first search of `graph` starting from the vertex id `origin`.
+
+    Returns arrays of distance and predecessor indexed by vertex id, holding
+    `sys.maxsize` and -1 respectively for vertices that cannot be reached.
+    """
+    return csr_bfs_arrays(graph.indptr, graph.indices, graph.num_vertices, origin)
+
+
+def csr_bfs_arrays(indptr: Any, indices: Any, n: int, origin: int) -> Tuple[array, array]:
+    """Breadth-first search of the CSR arrays of `n` vertices from `origin`.
+
+    `indptr` and `indices` are laid out as in `CSRGraph` and may be `array`s
+    or `memoryview`s, such as those of a mapped file. Returns distance and
+    predecessor arrays as `csr_breadth_first_search` does.
+    """
+    distance = array("q", [sys.maxsize]) * n
+    predecessor = array("q", [-1]) * n
+    distance[origin] = 0
+    Q: deque = deque()
+    Q.append(origin)
+    while Q:
+        u = Q.popleft()
+        d = distance[u] + 1
+        for v in indices[indptr[u]:indptr[u + 1]]:
+            if distance[v] == sys.maxsize:
+                distance[v] = d
+                predecessor[v] = u
+                Q.append(v)
+    return distance, predecessor
+
+
+def direction_optimizing_bfs(
+    graph: CSRGraph,
+    origin: int,
+    transpose: Optional[CSRGraph] = None,
+    use_numpy: bool = True,
+) -> Tuple[array, array]:
+    """Breadth-first search of `graph` that switches between two kinds of step.
+
+    A top-down step scans the edges out of the frontier, as
+    `csr_breadth_first_search` does. A bottom-up step instead has every
+    unvisited vertex scan its in-neighbors, taken from `transpose` (built
+    with `CSRGraph.transpose` if not given), and stop at the first one in the
+    frontier. When the frontier holds most of a low-diameter graph, bottom-up
+    steps check far fewer edges. The frontier is kept as a `bytearray` of
+    flags, or as NumPy boolean arrays when NumPy is installed and `use_numpy`
+    is true.
+
+    Returns the same distances as `csr_breadth_first_search`; a vertex may
+    be given a different predecessor at the same distance.
+    """
+    if transpose is None:
+        transpose = graph.transpose()
+    if use_numpy and np is not None:
+        return _numpy_direction_optimizing_bfs(graph, transpose, origin)
+
+    n = graph.num_vertices
+    indptr, indices = graph.indptr, graph.indices
+    t_indptr, t_indices = transpose.indptr, transpose.indices
+    distance = array("q", [sys.maxsize]) * n
+    predecessor = array("q", [-1]) * n
+    distance[origin] = 0
+    frontier: List[int] = [origin]
+    unexplored_edges = graph.num_edges
+    bottom_up = False
+    d = 0
+    while frontier:
+        d = d + 1
+        frontier_edges = sum(indptr[u + 1] - indptr[u] for u in frontier)
+        unexplored_edges = unexplored_edges - frontier_edges
+        if bottom_up:
+            bottom_up = len(frontier) * BFS_BETA >= n
+        else:
+            bottom_up = frontier_edges * BFS_ALPHA > unexplored_edges
+        next_frontier: List[int] = []
+        if bottom_up:
+            in_frontier = bytearray(n)
+            for u in frontier:
+                in_frontier[u] = 1
+            for v in range(n):
+                if distance[v] != sys.maxsize:
+                    continue
+                for u in t_indices[t_indptr[v]:t_indptr[v + 1]]:
+                    if in_frontier[u]:
+                        distance[v] = d
+                        predecessor[v] = u
+                        next_frontier.append(v)
+                        break
+        else:
+            for u in frontier:
+                for v in indices[indptr[u]:indptr[u + 1]]:
+                    if distance[v] == sys.maxsize:
+                        distance[v] = d
+                        predecessor[v] = u
+                        next_frontier.append(v)
+        frontier = next_frontier
+    return distance, predecessor
+
+
+def _numpy_direction_optimizing_bfs(
+    graph: CSRGraph, transpose: CSRGraph, origin: int
+) -> Tuple[array, array]:
+    n = graph.num_vertices
+    indptr = np.frombuffer(graph.indptr, dtype=np.int64)
+    indices = np.frombuffer(graph.indices, dtype=np.int32)
+    t_indices = np.frombuffer(transpose.indices, dtype=np.int32)
+    degree = indptr[1:] - indptr[:-1]
+    t_indptr = np.frombuffer(transpose.indptr, dtype=np.int64)
+    # The vertex each edge of the transpose leads out of
+    t_sources = np.repeat(np.arange(n, dtype=np.int32), t_indptr[1:] - t_indptr[:-1])
+    distance = np.full(n, sys.maxsize, dtype=np.int64)
+    predecessor = np.full(n, -1, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    distance[origin] = 0
+    visited[origin] = True
+    frontier = np.array([origin], dtype=np.int64)
+    unexplored_edges = graph.num_edges
+    bottom_up = False
+    d = 0
+    while len(frontier):
+        d = d + 1
+        frontier_edges = int(degree[frontier].sum())
+        unexplored_edges = unexplored_edges - frontier_edges
+        if bottom_up:
+            bottom_up = len(frontier) * BFS_BETA >= n
+        else:
+            bottom_up = frontier_edges * BFS_ALPHA > unexplored_edges
+        if bottom_up:
+            in_frontier = np.zeros(n, dtype=bool)
+            in_frontier[frontier] = True
+            hits = in_frontier[t_indices] & ~visited[t_sources]
+            targets, parents = t_sources[hits], t_indices[hits]
+        else:
+            counts = degree[frontier]
+            # Positions in `indices` of every edge out of the frontier
+            starts = np.repeat(indptr[frontier] - np.cumsum(counts) + counts, counts)
+            edges = starts + np.arange(len(starts))
+            parents = np.repeat(frontier, counts)
+            targets = indices[edges]
+            fresh = ~visited[targets]
+            targets, parents = targets[fresh], parents[fresh]
+        frontier, first = np.unique(targets, return_index=True)
+        visited[frontier] = True
+        distance[frontier] = d
+        predecessor[frontier] = parents[first]
+    return array("q", distance.tobytes()), array("q", predecessor.tobytes())
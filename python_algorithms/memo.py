@@ -0,0 +1,142 @@
+"""A bounded, instrumented memo that solvers can share across calls."""
+
+from collections import OrderedDict
+import hashlib
+import pickle
+import shelve
+import sys
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def content_key(*parts: Any) -> str:
+    """Hash picklable `parts` into a key that depends only on their contents.
+
+    Equal price tables, grids or item lists give equal keys whichever list
+    objects hold them, so a memo keyed this way survives between calls.
+    """
+    return hashlib.sha256(pickle.dumps(parts, pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def approximate_size(value: Any) -> int:
+    """Estimate the bytes held by `value` and the containers inside it."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size = size + sum(approximate_size(item) for item in value)
+    elif isinstance(value, dict):
+        size = size + sum(approximate_size(k) + approximate_size(v) for k, v in value.items())
+    return size
+
+
+class Memo:
+    """A least-recently-used cache bounded by entry count, bytes, or both.
+
+    Entries are evicted least recently used first once there are more than
+    `maxsize` of them or their `approximate_size`s add up to more than
+    `max_bytes`; either bound may be None. Hits, misses and evictions are
+    counted. With a `disk_path`, every entry is also written through to a
+    `shelve` database there, which keeps evicted entries and is read on a
+    miss in memory, so expensive results outlive both eviction and the
+    process. Disk keys are `content_key`s of the keys.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+        disk_path: Optional[str] = None,
+        sizeof: Callable[[Any], int] = approximate_size,
+    ) -> None:
+        self._entries: OrderedDict = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._maxsize = maxsize
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._disk = shelve.open(disk_path) if disk_path is not None else None
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    def __enter__(self) -> "Memo":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the disk tier, if any."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Memo(entries={len(self)}, size_bytes={self.size_bytes}, hits={self.hits}, "
+            f"misses={self.misses}, evictions={self.evictions}, disk_hits={self.disk_hits})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value stored under `key`, counting a hit or a miss."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits = self.hits + 1
+            return self._entries[key]
+        if self._disk is not None:
+            disk_key = content_key(key)
+            if disk_key in self._disk:
+                value = self._disk[disk_key]
+                self.disk_hits = self.disk_hits + 1
+                self._store(key, value)
+                return value
+        self.misses = self.misses + 1
+        return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key`, evicting old entries to make room."""
+        if self._disk is not None:
+            self._disk[content_key(key)] = value
+        self._store(key, value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the value under `key`, storing `compute()` there on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        """Remove `key` from memory, leaving the disk tier untouched."""
+        if key in self._entries:
+            del self._entries[key]
+            self.size_bytes = self.size_bytes - self._sizes.pop(key)
+
+    def clear(self) -> None:
+        """Empty the memory tier and reset the counters."""
+        self._entries.clear()
+        self._sizes.clear()
+        self.size_bytes = self.hits = self.misses = self.evictions = self.disk_hits = 0
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self.discard(key)
+        size = self._sizeof(value) if self._max_bytes is not None else 0
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.size_bytes = self.size_bytes + size
+        while self._entries and (
+            (self._maxsize is not None and len(self._entries) > self._maxsize)
+            or (self._max_bytes is not None and self.size_bytes > self._max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self.discard(oldest)
+            self.evictions = self.evictions + 1
+
+
+_MISSING = object()
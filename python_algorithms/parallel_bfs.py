@@ -0,0 +1,148 @@
+"""Breadth-first searches from many origins, spread over worker processes."""
+
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
+
+from python_algorithms.graphs import CSRGraph, csr_bfs_arrays
+
+# An adjacency file is a header, `indptr` and `indices`, with `indices`
+# starting on an 8 byte boundary.
+_MAGIC = b"CSR1"
+_HEADER = struct.Struct("<4s4xQQ")
+
+# Number of sources a bit-parallel search runs at once, one bit each
+WORD_SIZE = 64
+
+# The path and contents of the adjacency file a worker process has mapped
+_attached: Dict[str, Tuple[Any, Any, int]] = {}
+
+
+def dump_adjacency(graph: CSRGraph, path: str) -> None:
+    """Write the `indptr` and `indices` arrays of `graph` to `path`."""
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, graph.num_vertices, graph.num_edges))
+        graph.indptr.tofile(f)
+        graph.indices.tofile(f)
+
+
+def load_adjacency(path: str) -> Tuple[Any, Any, int]:
+    """Map a file written by `dump_adjacency` into memory.
+
+    Returns read-only `memoryview`s of `indptr` and `indices` and the number
+    of vertices. The pages are shared with every other process mapping the
+    same file.
+    """
+    with open(path, "rb") as f:
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, num_vertices, num_edges = _HEADER.unpack_from(m, 0)
+    if magic != _MAGIC:
+        m.close()
+        raise ValueError(f"{path} is not an adjacency file")
+    view = memoryview(m)
+    start = _HEADER.size
+    end = start + 8 * (num_vertices + 1)
+    indptr = view[start:end].cast("q")
+    indices = view[end:end + 4 * num_edges].cast("i")
+    return indptr, indices, num_vertices
+
+
+def _bit_parallel_search(
+    indptr: Any, indices: Any, n: int, origins: Sequence[int]
+) -> List[array]:
+    if len(origins) > WORD_SIZE:
+        raise ValueError(f"at most {WORD_SIZE} origins can be searched at once")
+    distances = [array("q", [sys.maxsize]) * n for _ in origins]
+    visited: Dict[int, int] = {}
+    frontier: Dict[int, int] = {}
+    for k, origin in enumerate(origins):
+        distances[k][origin] = 0
+        frontier[origin] = frontier.get(origin, 0) | 1 << k
+        visited[origin] = frontier[origin]
+    d = 0
+    while frontier:
+        d = d + 1
+        reached: Dict[int, int] = {}
+        for u, bits in frontier.items():
+            for v in indices[indptr[u]:indptr[u + 1]]:
+                reached[v] = reached.get(v, 0) | bits
+        frontier = {}
+        for v, bits in reached.items():
+            bits = bits & ~visited.get(v, 0)
+            if bits:
+                visited[v] = visited.get(v, 0) | bits
+                frontier[v] = bits
+                while bits:
+                    lowest = bits & -bits
+                    distances[lowest.bit_length() - 1][v] = d
+                    bits = bits ^ lowest
+    return distances
+
+
+def bit_parallel_bfs(graph: CSRGraph, origins: Sequence[int]) -> List[array]:
+    """Breadth-first searches from up to 64 origin ids at once.
+
+    Each vertex carries an integer bitmask with bit k set once the search
+    from `origins[k]` has reached it, so one pass over the edges out of a
+    frontier advances every search by a level. Returns one distance array
+    per origin, laid out as by `csr_breadth_first_search`.
+    """
+    return _bit_parallel_search(graph.indptr, graph.indices, graph.num_vertices, origins)
+
+
+def _search_batch(path: str, origins: List[int], bit_parallel: bool) -> List[array]:
+    if path not in _attached:
+        _attached.clear()
+        _attached[path] = load_adjacency(path)
+    indptr, indices, n = _attached[path]
+    if bit_parallel:
+        return _bit_parallel_search(indptr, indices, n, origins)
+    return [csr_bfs_arrays(indptr, indices, n, origin)[0] for origin in origins]
+
+
+def bfs_many(
+    graph: CSRGraph,
+    origins: Iterable[int],
+    max_workers: Optional[int] = None,
+    tmp_dir: Optional[str] = None,
+    bit_parallel: bool = False,
+    batch_size: int = 16,
+) -> Generator[Tuple[int, array], None, None]:
+    """Stream `(origin, distance array)` for each origin id, in order.
+
+    The adjacency of `graph` is written once to a file in `tmp_dir` that
+    each worker process memory-maps read-only on its first batch, so the
+    graph is neither pickled nor copied per worker. Origins are sent out in
+    batches of `batch_size`, or of 64 when `bit_parallel` is true, in which
+    case each batch is searched at once by `bit_parallel_bfs`. At most two batches per
+    worker are in flight, so results are streamed rather than collected.
+    Distance arrays are laid out as by `csr_breadth_first_search`.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if bit_parallel:
+        batch_size = WORD_SIZE
+    origins = iter(origins)
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as dirname:
+        path = os.path.join(dirname, "adjacency.csr")
+        dump_adjacency(graph, path)
+        with ProcessPoolExecutor(max_workers) as executor:
+            pending: deque = deque()
+            while True:
+                batch = list(itertools.islice(origins, batch_size))
+                if batch:
+                    future = executor.submit(_search_batch, path, batch, bit_parallel)
+                    pending.append((batch, future))
+                if pending and (not batch or len(pending) > 2 * max_workers):
+                    done, future = pending.popleft()
+                    yield from zip(done, future.result())
+                elif not batch:
+                    return
@@ -0,0 +1,238 @@
+"""Heap-backed priority queues built on the heap routines in `sorting`."""
+
+import itertools
+from typing import Any, Dict, Generic, Hashable, Iterable, List, Tuple
+
+from python_algorithms.sorting import (
+    CT,
+    build_max_heap,
+    build_min_heap,
+    max_heap_sift_up,
+    max_heapify,
+    min_heap_sift_up,
+    min_heapify,
+)
+
+
+class MaxHeap(Generic[CT]):
+    """A binary max-heap stored in a Python list."""
+
+    def __init__(self, items: Iterable[CT] = ()) -> None:
+        self._A: List[CT] = list(items)
+        build_max_heap(self._A)
+
+    def __len__(self) -> int:
+        return len(self._A)
+
+    def __iter__(self):
+        """Iterate over the elements in heap (not sorted) order."""
+        return iter(self._A)
+
+    def heapify(self, items: Iterable[CT]) -> None:
+        """Add `items` in bulk, rebuilding the heap once in O(n)."""
+        self._A.extend(items)
+        build_max_heap(self._A)
+
+    def push(self, x: CT) -> None:
+        """Add `x` to the heap."""
+        self._A.append(x)
+        max_heap_sift_up(self._A, len(self._A) - 1)
+
+    def peek(self) -> CT:
+        """Return the largest element without removing it."""
+        if not self._A:
+            raise IndexError("peek at an empty heap")
+        return self._A[0]
+
+    def pop(self) -> CT:
+        """Remove and return the largest element."""
+        if not self._A:
+            raise IndexError("pop from an empty heap")
+        last = self._A.pop()
+        if not self._A:
+            return last
+        top = self._A[0]
+        self._A[0] = last
+        max_heapify(self._A, 0)
+        return top
+
+    def replace(self, x: CT) -> CT:
+        """Pop the largest element and push `x`, sifting only once."""
+        if not self._A:
+            raise IndexError("replace on an empty heap")
+        top = self._A[0]
+        self._A[0] = x
+        max_heapify(self._A, 0)
+        return top
+
+    def increase_key(self, i: int, x: CT) -> None:
+        """Replace the element at node i with the larger element `x`.
+
+        Node i is the i-th element in iteration order; to raise the priority
+        of an item without tracking where it sits, use a `PriorityQueue`.
+        """
+        if x < self._A[i]:
+            raise ValueError("new key is smaller than current key")
+        self._A[i] = x
+        max_heap_sift_up(self._A, i)
+
+
+class MinHeap(Generic[CT]):
+    """A binary min-heap stored in a Python list."""
+
+    def __init__(self, items: Iterable[CT] = ()) -> None:
+        self._A: List[CT] = list(items)
+        build_min_heap(self._A)
+
+    def __len__(self) -> int:
+        return len(self._A)
+
+    def __iter__(self):
+        """Iterate over the elements in heap (not sorted) order."""
+        return iter(self._A)
+
+    def heapify(self, items: Iterable[CT]) -> None:
+        """Add `items` in bulk, rebuilding the heap once in O(n)."""
+        self._A.extend(items)
+        build_min_heap(self._A)
+
+    def push(self, x: CT) -> None:
+        """Add `x` to the heap."""
+        self._A.append(x)
+        min_heap_sift_up(self._A, len(self._A) - 1)
+
+    def peek(self) -> CT:
+        """Return the smallest element without removing it."""
+        if not self._A:
+            raise IndexError("peek at an empty heap")
+        return self._A[0]
+
+    def pop(self) -> CT:
+        """Remove and return the smallest element."""
+        if not self._A:
+            raise IndexError("pop from an empty heap")
+        last = self._A.pop()
+        if not self._A:
+            return last
+        top = self._A[0]
+        self._A[0] = last
+        min_heapify(self._A, 0)
+        return top
+
+    def replace(self, x: CT) -> CT:
+        """Pop the smallest element and push `x`, sifting only once."""
+        if not self._A:
+            raise IndexError("replace on an empty heap")
+        top = self._A[0]
+        self._A[0] = x
+        min_heapify(self._A, 0)
+        return top
+
+    def decrease_key(self, i: int, x: CT) -> None:
+        """Replace the element at node i with the smaller element `x`.
+
+        Node i is the i-th element in iteration order; to lower the priority
+        of an item without tracking where it sits, use a `PriorityQueue`.
+        """
+        if self._A[i] < x:
+            raise ValueError("new key is larger than current key")
+        self._A[i] = x
+        min_heap_sift_up(self._A, i)
+
+
+_REMOVED = object()
+
+
+class PriorityQueue:
+    """A min-priority queue of hashable items with decrease-key.
+
+    Entries are `[priority, sequence number, item]` lists kept in a `MinHeap`.
+    The sequence number breaks ties in insertion order, so items themselves
+    are never compared. Each item maps to its entry, so priorities are
+    changed by item: `decrease_key` invalidates the item's old entry and
+    pushes a new one. Invalidated entries are discarded when they reach the
+    top of the heap, and the heap is rebuilt from the live entries once the
+    invalidated ones outnumber them.
+    """
+
+    def __init__(self, items: Iterable[Tuple[Hashable, Any]] = ()) -> None:
+        self._counter = itertools.count()
+        self._entries: Dict[Hashable, list] = {}
+        self._heap: MinHeap = MinHeap()
+        self.heapify(items)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._entries
+
+    def heapify(self, items: Iterable[Tuple[Hashable, Any]]) -> None:
+        """Add `(item, priority)` pairs in bulk."""
+        entries = []
+        for item, priority in items:
+            if item in self._entries:
+                self._entries[item][-1] = _REMOVED
+            entry = [priority, next(self._counter), item]
+            self._entries[item] = entry
+            entries.append(entry)
+        self._heap.heapify(entries)
+
+    def push(self, item: Hashable, priority: Any) -> None:
+        """Add `item`, or change its priority if it is already queued."""
+        if item in self._entries:
+            self._entries.pop(item)[-1] = _REMOVED
+        entry = [priority, next(self._counter), item]
+        self._entries[item] = entry
+        self._heap.push(entry)
+        self._compact()
+
+    def decrease_key(self, item: Hashable, priority: Any) -> None:
+        """Lower the priority of a queued `item`."""
+        if self._entries[item][0] < priority:
+            raise ValueError("new priority is larger than current priority")
+        self.push(item, priority)
+
+    def replace(self, item: Hashable, priority: Any) -> Tuple[Hashable, Any]:
+        """Pop the smallest `(item, priority)` pair and push `item`, sifting once.
+
+        `item` may be queued already, in which case its priority changes.
+        """
+        self._discard_removed()
+        if not len(self._heap):
+            raise IndexError("replace on an empty priority queue")
+        top_priority, _, top_item = self._heap.peek()
+        del self._entries[top_item]
+        if item in self._entries:
+            self._entries.pop(item)[-1] = _REMOVED
+        entry = [priority, next(self._counter), item]
+        self._entries[item] = entry
+        self._heap.replace(entry)
+        self._compact()
+        return top_item, top_priority
+
+    def _compact(self) -> None:
+        """Rebuild the heap from the live entries once the invalidated ones outnumber them."""
+        if len(self._heap) > 2 * len(self._entries):
+            self._heap = MinHeap(self._entries.values())
+
+    def _discard_removed(self) -> None:
+        while len(self._heap) and self._heap.peek()[-1] is _REMOVED:
+            self._heap.pop()
+
+    def peek(self) -> Tuple[Hashable, Any]:
+        """Return the `(item, priority)` pair with the smallest priority."""
+        self._discard_removed()
+        if not len(self._heap):
+            raise IndexError("peek at an empty priority queue")
+        priority, _, item = self._heap.peek()
+        return item, priority
+
+    def pop(self) -> Tuple[Hashable, Any]:
+        """Remove and return the `(item, priority)` pair with the smallest priority."""
+        self._discard_removed()
+        if not len(self._heap):
+            raise IndexError("pop from an empty priority queue")
+        priority, _, item = self._heap.pop()
+        del self._entries[item]
+        return item, priority
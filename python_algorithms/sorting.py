@@ -1,11 +1,18 @@
 """Implementing some sorting and order statistics algorithms."""
 
 from abc import abstractmethod
+import array
+from bisect import bisect_left, bisect_right
 import math
 import random
-from typing import Any, MutableSequence, Optional, TypeVar
+from typing import Any, Callable, List, MutableSequence, Optional, Sequence, Tuple, TypeVar
 from typing_extensions import Protocol
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
 
 class Comparable(Protocol):
     @abstractmethod
@@ -15,19 +22,140 @@ class Comparable(Protocol):
 
 CT = TypeVar("CT", bound=Comparable)
 
+# Subarrays at most this long are finished off by insertion sort in quick_sort
+INSERTION_SORT_CUTOFF = 16
+
+# Subarrays longer than this use Tukey's ninther rather than a median of three
+NINTHER_CUTOFF = 40
+
+# Consecutive wins by one run after which natural_merge_sort starts galloping
+MIN_GALLOP = 7
+
 
-def insertion_sort(A: MutableSequence[CT]) -> None:
-    """A O(n^2) sorting algorithm."""
-    for i in range(1, len(A)):
-        key = A[i]
+def insertion_sort(
+    A: MutableSequence[CT],
+    p: Optional[int] = None,
+    r: Optional[int] = None,
+    *,
+    key: Optional[Callable[[Any], Any]] = None,
+    reverse: bool = False,
+) -> None:
+    """A O(n^2) sorting algorithm, applied to `A[p:r+1]`.
+
+    `key` and `reverse` work as for `sorted`, and the sort is then stable.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    if key is not None or reverse:
+        return _sort_by_key(A, p, r, key, reverse, insertion_sort)
+    for i in range(p + 1, r + 1):
+        x = A[i]
         j = i - 1
-        while j >= 0 and A[j] > key:
+        while j >= p and A[j] > x:
             A[j + 1] = A[j]
             j = j - 1
-        A[j + 1] = key
+        A[j + 1] = x
     return None
 
 
+# Vectorized fast path for numeric buffers, used when NumPy is installed
+_NUMERIC_TYPECODES = frozenset("bBhHiIlLqQfd")
+
+
+def _numeric_view(A: Sequence[Any], p: int, r: int) -> Optional[Any]:
+    """Return a NumPy view of `A[p:r+1]` sharing memory with `A`, if possible.
+
+    Only 1-d numeric NumPy arrays and numeric `array.array`s qualify; for any
+    other input, or when NumPy is not installed, return None so the caller
+    falls back to the pure-Python code.
+    """
+    if np is None or p > r:
+        return None
+    if isinstance(A, np.ndarray):
+        if A.ndim != 1 or A.dtype.kind not in "iuf" or not A.flags.writeable:
+            return None
+        return A[p:r + 1]
+    if isinstance(A, array.array) and A.typecode in _NUMERIC_TYPECODES:
+        return np.frombuffer(A, dtype=A.typecode)[p:r + 1]
+    return None
+
+
+def _numpy_sort(view: Any, reverse: bool, kind: str) -> None:
+    """Sort a NumPy view in place, so the underlying buffer is sorted too."""
+    view.sort(kind=kind)
+    if reverse:
+        view[:] = view[::-1].copy()
+    return None
+
+
+# Support for the `key` and `reverse` arguments of the sorting routines
+def _decorate(
+    A: Sequence[Any],
+    p: int,
+    r: int,
+    key: Optional[Callable[[Any], Any]],
+    reverse: bool,
+) -> List[Tuple[Any, int]]:
+    """Pair each element of `A[p:r+1]` with its key, computed once, and index.
+
+    Sorting the pairs compares keys with the built-in tuple comparison and
+    breaks ties on the index, which makes every sort stable. For `reverse`
+    the index is negated, so that reversing the ascending order of the pairs
+    still keeps equal keys in their original order.
+    """
+    sign = -1 if reverse else 1
+    if key is None:
+        return [(A[j], sign * j) for j in range(p, r + 1)]
+    return [(key(A[j]), sign * j) for j in range(p, r + 1)]
+
+
+def _sorted_permutation(
+    A: Sequence[Any],
+    p: int,
+    r: int,
+    key: Optional[Callable[[Any], Any]],
+    reverse: bool,
+    sort: Callable[[MutableSequence[Any]], None],
+) -> List[int]:
+    """Return the indices of `A[p:r+1]` in sorted order, sorting with `sort`."""
+    decorated = _decorate(A, p, r, key, reverse)
+    sort(decorated)
+    if reverse:
+        decorated.reverse()
+        return [-j for _, j in decorated]
+    return [j for _, j in decorated]
+
+
+def _sort_by_key(
+    A: MutableSequence[Any],
+    p: int,
+    r: int,
+    key: Optional[Callable[[Any], Any]],
+    reverse: bool,
+    sort: Callable[[MutableSequence[Any]], None],
+) -> None:
+    """Decorate-sort-undecorate `A[p:r+1]` in place using `sort`."""
+    permuted = [A[j] for j in _sorted_permutation(A, p, r, key, reverse, sort)]
+    for offset, x in enumerate(permuted):
+        A[p + offset] = x
+    return None
+
+
+def argsort(
+    A: Sequence[Any],
+    *,
+    key: Optional[Callable[[Any], Any]] = None,
+    reverse: bool = False,
+) -> List[int]:
+    """Return the stable sorted order of `A` as a list of indices into `A`.
+
+    `A` itself is not modified, so large payload objects never move.
+    """
+    return _sorted_permutation(A, 0, len(A) - 1, key, reverse, quick_sort)
+
+
 # Routines associated with max- and min-heaps
 def get_index_of_parent(i: int) -> int:
     """Return the index of the parent of the node i."""
@@ -52,39 +180,182 @@ def get_first_leaf_index(len_heap: int) -> int:
 def max_heapify(
     A: MutableSequence[CT], i: int, heap_size: Optional[int] = None
 ) -> None:
-    """Rearrange the elements of A, starting from node i, into a heap."""
+    """Rearrange the elements of A, starting from node i, into a heap.
+
+    `heap_size` is the index of the last element of the heap. The element at
+    node i is sifted down iteratively rather than by recursing once per level.
+    """
+    if heap_size is None:
+        heap_size = len(A) - 1
+    x = A[i]
+    while True:
+        left = 2 * i + 1
+        if left > heap_size:
+            break
+        right = left + 1
+        if right <= heap_size and A[right] > A[left]:
+            left = right
+        if not A[left] > x:
+            break
+        A[i] = A[left]
+        i = left
+    A[i] = x
+
+
+def min_heapify(
+    A: MutableSequence[CT], i: int, heap_size: Optional[int] = None
+) -> None:
+    """The min-heap counterpart of `max_heapify`."""
     if heap_size is None:
         heap_size = len(A) - 1
-    left = get_index_of_left_child(i)
-    right = get_index_of_right_child(i)
-    if left <= heap_size and A[left] > A[i]:
-        largest = left
-    else:
-        largest = i
-    if right <= heap_size and A[right] > A[largest]:
-        largest = right
-    if largest == i:
-        return None
-    A[i], A[largest] = A[largest], A[i]
-    return max_heapify(A, largest, heap_size=heap_size)
+    x = A[i]
+    while True:
+        left = 2 * i + 1
+        if left > heap_size:
+            break
+        right = left + 1
+        if right <= heap_size and A[right] < A[left]:
+            left = right
+        if not A[left] < x:
+            break
+        A[i] = A[left]
+        i = left
+    A[i] = x
+
+
+def max_heap_sift_up(A: MutableSequence[CT], i: int) -> None:
+    """Move the element at node i up the max-heap `A` until it is in place."""
+    x = A[i]
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not A[parent] < x:
+            break
+        A[i] = A[parent]
+        i = parent
+    A[i] = x
+
 
+def min_heap_sift_up(A: MutableSequence[CT], i: int) -> None:
+    """Move the element at node i up the min-heap `A` until it is in place."""
+    x = A[i]
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not x < A[parent]:
+            break
+        A[i] = A[parent]
+        i = parent
+    A[i] = x
 
-def build_max_heap(A: MutableSequence[CT]) -> None:
-    """Transform `A` into a max-heap."""
-    last_not_leaf_index = get_first_leaf_index(len(A)) - 1
+
+def bottom_up_max_heapify(
+    A: MutableSequence[CT], i: int, heap_size: Optional[int] = None
+) -> None:
+    """Floyd's variant of `max_heapify`.
+
+    The larger child is promoted all the way down to a leaf without comparing
+    against the sifted element, which is then sifted back up. This needs about
+    half the comparisons of `max_heapify` when the element belongs near the
+    bottom, as it does after each extraction in heap sort.
+    """
+    if heap_size is None:
+        heap_size = len(A) - 1
+    _bottom_up_sift_down(A, 0, i, heap_size)
+
+
+def build_max_heap(A: MutableSequence[CT], heap_size: Optional[int] = None) -> None:
+    """Transform `A[:heap_size+1]` into a max-heap."""
+    if heap_size is None:
+        heap_size = len(A) - 1
+    last_not_leaf_index = get_first_leaf_index(heap_size + 1) - 1
     for i in range(last_not_leaf_index, -1, -1):
-        max_heapify(A, i)
+        max_heapify(A, i, heap_size=heap_size)
+
 
+def build_min_heap(A: MutableSequence[CT], heap_size: Optional[int] = None) -> None:
+    """Transform `A[:heap_size+1]` into a min-heap."""
+    if heap_size is None:
+        heap_size = len(A) - 1
+    last_not_leaf_index = get_first_leaf_index(heap_size + 1) - 1
+    for i in range(last_not_leaf_index, -1, -1):
+        min_heapify(A, i, heap_size=heap_size)
+
+
+def _sift_down(A: MutableSequence[CT], p: int, i: int, heap_size: int) -> None:
+    """Iterative `max_heapify` of a heap stored in `A[p:p+heap_size+1]`.
+
+    `i` and `heap_size` are relative to `p`, so a heap can live in the middle
+    of a larger sequence.
+    """
+    x = A[p + i]
+    while True:
+        left = 2 * i + 1
+        if left > heap_size:
+            break
+        right = left + 1
+        if right <= heap_size and A[p + right] > A[p + left]:
+            left = right
+        if not A[p + left] > x:
+            break
+        A[p + i] = A[p + left]
+        i = left
+    A[p + i] = x
+
+
+def _bottom_up_sift_down(
+    A: MutableSequence[CT], p: int, i: int, heap_size: int
+) -> None:
+    """`bottom_up_max_heapify` of a heap stored in `A[p:p+heap_size+1]`."""
+    x = A[p + i]
+    start = i
+    while True:
+        left = 2 * i + 1
+        if left > heap_size:
+            break
+        right = left + 1
+        if right <= heap_size and A[p + right] > A[p + left]:
+            left = right
+        A[p + i] = A[p + left]
+        i = left
+    while i > start:
+        parent = (i - 1) >> 1
+        if not A[p + parent] < x:
+            break
+        A[p + i] = A[p + parent]
+        i = parent
+    A[p + i] = x
+
+
+def heap_sort(
+    A: MutableSequence[CT],
+    p: Optional[int] = None,
+    r: Optional[int] = None,
+    *,
+    key: Optional[Callable[[Any], Any]] = None,
+    reverse: bool = False,
+) -> None:
+    """O(n log n) in place sort of `A[p:r+1]` using a heap data structure.
 
-def heap_sort(A: MutableSequence[CT]) -> None:
-    """O(n log n) in place sort of `A` using a heap data structure."""
-    len_A = len(A)
-    heap_size = len_A - 1
-    build_max_heap(A)
-    for i in range(len_A - 1, 0, -1):
-        A[0], A[i] = A[i], A[0]
+    `key` and `reverse` work as for `sorted`, and the sort is then stable.
+    Without a `key`, numeric NumPy arrays and `array.array`s are sorted in
+    place by NumPy, when it is installed.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    if key is None:
+        view = _numeric_view(A, p, r)
+        if view is not None:
+            return _numpy_sort(view, reverse, "heapsort")
+    if key is not None or reverse:
+        return _sort_by_key(A, p, r, key, reverse, heap_sort)
+    heap_size = r - p
+    for i in range(get_first_leaf_index(heap_size + 1) - 1, -1, -1):
+        _sift_down(A, p, i, heap_size)
+    for i in range(r, p, -1):
+        A[p], A[i] = A[i], A[p]
         heap_size = heap_size - 1
-        max_heapify(A, 0, heap_size=heap_size)
+        _bottom_up_sift_down(A, p, 0, heap_size)
 
 
 def partition(
@@ -122,34 +393,562 @@ def randomized_partition(
     return partition(A, p, r)
 
 
-def quick_sort(
+def three_way_partition(
     A: MutableSequence[CT], p: Optional[int] = None, r: Optional[int] = None
+) -> Tuple[int, int]:
+    """Partition `A[p:r+1]` around the pivot `A[r]` into three bands.
+
+    On return every element of `A[p:lt]` is < the pivot, every element of
+    `A[lt:gt+1]` equals it and every element of `A[gt+1:r+1]` is > it. Returns
+    the pair `(lt, gt)`. Runs of duplicate keys end up in the middle band and
+    are never looked at again.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    x = A[r]
+    lt, i, gt = p, p, r
+    while i <= gt:
+        if A[i] < x:
+            A[lt], A[i] = A[i], A[lt]
+            lt = lt + 1
+            i = i + 1
+        elif x < A[i]:
+            A[i], A[gt] = A[gt], A[i]
+            gt = gt - 1
+        else:
+            i = i + 1
+    return lt, gt
+
+
+def median_of_three(A: MutableSequence[CT], i: int, j: int, k: int) -> int:
+    """Return whichever of the indices `i`, `j` and `k` holds the median."""
+    if A[i] < A[j]:
+        if A[j] < A[k]:
+            return j
+        return k if A[i] < A[k] else i
+    if A[i] < A[k]:
+        return i
+    return k if A[j] < A[k] else j
+
+
+def _choose_pivot(A: MutableSequence[CT], p: int, r: int) -> int:
+    """Median of three for short subarrays, Tukey's ninther for long ones."""
+    m = p + (r - p) // 2
+    if r - p + 1 <= NINTHER_CUTOFF:
+        return median_of_three(A, p, m, r)
+    s = (r - p + 1) // 8
+    return median_of_three(
+        A,
+        median_of_three(A, p, p + s, p + 2 * s),
+        median_of_three(A, m - s, m, m + s),
+        median_of_three(A, r - 2 * s, r - s, r),
+    )
+
+
+def quick_sort(
+    A: MutableSequence[CT],
+    p: Optional[int] = None,
+    r: Optional[int] = None,
+    *,
+    key: Optional[Callable[[Any], Any]] = None,
+    reverse: bool = False,
 ) -> None:
-    """O(n log n) in place sort of `A`."""
+    """O(n log n) in place sort of `A`.
+
+    This is an introsort: quicksort with median-of-three (or ninther) pivots
+    and three-way partitioning, insertion sort for short subarrays and a
+    fallback to heap sort for any subarray that has been partitioned more
+    than 2 log n times. Subarrays waiting to be sorted are kept on an explicit
+    stack, and since the smaller side of each partition is always handled
+    first the stack never holds more than log n entries.
+
+    `key` and `reverse` work as for `sorted`: each key is computed once and
+    the sort, which is then stable, runs over `(key, index)` pairs.
+
+    Without a `key`, numeric NumPy arrays and `array.array`s are sorted in
+    place by NumPy, when it is installed.
+    """
     if p is None:
         p = 0
     if r is None:
         r = len(A) - 1
-    if p < r:
-        q = partition(A, p, r)
-        quick_sort(A, p, q - 1)
-        quick_sort(A, q + 1, r)
+    if key is None:
+        view = _numeric_view(A, p, r)
+        if view is not None:
+            return _numpy_sort(view, reverse, "quicksort")
+    if key is not None or reverse:
+        return _sort_by_key(A, p, r, key, reverse, quick_sort)
+    if p >= r:
+        return None
+    stack = [(p, r, 2 * (r - p + 1).bit_length())]
+    while stack:
+        p, r, depth = stack.pop()
+        while r - p + 1 > INSERTION_SORT_CUTOFF:
+            if depth == 0:
+                heap_sort(A, p, r)
+                break
+            depth = depth - 1
+            pivot = _choose_pivot(A, p, r)
+            A[pivot], A[r] = A[r], A[pivot]
+            lt, gt = three_way_partition(A, p, r)
+            if lt - p < r - gt:
+                stack.append((gt + 1, r, depth))
+                r = lt - 1
+            else:
+                stack.append((p, lt - 1, depth))
+                p = gt + 1
+        else:
+            insertion_sort(A, p, r)
+    return None
+
+
+# Routines associated with the adaptive natural merge sort
+def binary_insertion_sort(
+    A: MutableSequence[CT],
+    p: Optional[int] = None,
+    r: Optional[int] = None,
+    start: Optional[int] = None,
+) -> None:
+    """Insertion sort of `A[p:r+1]` that finds each position by binary search.
+
+    `A[p:start]` must already be sorted. Each insertion costs O(log n)
+    comparisons and a single slice move. The sort is stable.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    if start is None or start == p:
+        start = p + 1
+    for i in range(start, r + 1):
+        x = A[i]
+        j = bisect_right(A, x, p, i)
+        if j < i:
+            A[j + 1:i + 1] = A[j:i]
+            A[j] = x
+    return None
+
+
+def _min_run_length(n: int) -> int:
+    """Return the length runs are extended to, as in CPython's list.sort."""
+    remainder = 0
+    while n >= 64:
+        remainder |= n & 1
+        n >>= 1
+    return n + remainder
+
+
+def _run_end(A: Sequence[CT], lo: int, r: int) -> Tuple[int, bool]:
+    """Return the end of the natural run starting at `A[lo]` and whether it descends."""
+    hi = lo + 1
+    if hi > r:
+        return hi, False
+    descending = A[hi] < A[lo]
+    if descending:
+        while hi < r and A[hi + 1] < A[hi]:
+            hi = hi + 1
+    else:
+        while hi < r and not A[hi + 1] < A[hi]:
+            hi = hi + 1
+    return hi + 1, descending
+
+
+def _count_run(A: MutableSequence[CT], lo: int, r: int) -> int:
+    """Return the end of the natural run starting at `A[lo]`.
+
+    A strictly descending run is reversed in place, so on return `A[lo:end]`
+    is ascending either way.
+    """
+    end, descending = _run_end(A, lo, r)
+    if descending:
+        A[lo:end] = A[lo:end][::-1]
+    return end
+
+
+def count_runs(A: Sequence[CT], p: Optional[int] = None, r: Optional[int] = None) -> int:
+    """Count the natural runs of `A[p:r+1]` as `natural_merge_sort` splits them.
+
+    A run is a maximal ascending or strictly descending stretch, so sorted
+    input has one run and shuffled input a run every two or three items.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    num_runs = 0
+    lo = p
+    while lo <= r:
+        lo, _ = _run_end(A, lo, r)
+        num_runs = num_runs + 1
+    return num_runs
+
+
+def _gallop(A: Sequence[CT], x: CT, lo: int, hi: int, right: bool) -> int:
+    """Find where `x` belongs in the sorted `A[lo:hi]` by exponential search.
+
+    Probes `A[lo]`, `A[lo+1]`, `A[lo+3]`, `A[lo+7]`, ... and then bisects the
+    last gap, so finding a position k elements in costs O(log k)
+    comparisons. Returns the `bisect_right` position if `right` is true and
+    the `bisect_left` position otherwise.
+    """
+    bisect = bisect_right if right else bisect_left
+    last, offset = lo, 1
+    while lo + offset - 1 < hi:
+        i = lo + offset - 1
+        if (x < A[i]) if right else not (A[i] < x):
+            return bisect(A, x, last, i)
+        last = i + 1
+        offset = offset << 1
+    return bisect(A, x, last, hi)
+
+
+def _merge_runs(A: MutableSequence[CT], lo: int, mid: int, hi: int) -> None:
+    """Stable merge of the adjacent sorted runs `A[lo:mid]` and `A[mid:hi]`.
+
+    The left run is copied aside and merged back one element at a time until
+    one run has won `MIN_GALLOP` times in a row; then whole stretches of the
+    winning run are found with `_gallop` and moved with one slice copy.
+    """
+    left = A[lo:mid]
+    len_left = mid - lo
+    i, j, k = 0, mid, lo
+    while i < len_left and j < hi:
+        left_wins = right_wins = 0
+        while i < len_left and j < hi:
+            if A[j] < left[i]:
+                A[k] = A[j]
+                j = j + 1
+                right_wins = right_wins + 1
+                left_wins = 0
+            else:
+                A[k] = left[i]
+                i = i + 1
+                left_wins = left_wins + 1
+                right_wins = 0
+            k = k + 1
+            if left_wins >= MIN_GALLOP or right_wins >= MIN_GALLOP:
+                break
+        else:
+            break
+        if left_wins:
+            end = _gallop(left, A[j], i, len_left, right=True)
+            A[k:k + end - i] = left[i:end]
+            k = k + end - i
+            i = end
+        else:
+            end = _gallop(A, left[i], j, hi, right=False)
+            A[k:k + end - j] = A[j:end]
+            k = k + end - j
+            j = end
+    if i < len_left:
+        A[k:k + len_left - i] = left[i:]
+    return None
+
+
+def _merge_at(A: MutableSequence[CT], runs: List[Tuple[int, int]], n: int) -> None:
+    """Merge the n-th and (n+1)-th runs on the stack `runs`."""
+    lo, len1 = runs[n]
+    mid, len2 = runs[n + 1]
+    hi = mid + len2
+    runs[n] = (lo, len1 + len2)
+    del runs[n + 1]
+    # Elements already in their final place at either end are left alone
+    lo = _gallop(A, A[mid], lo, mid, right=True)
+    if lo == mid:
+        return None
+    hi = _gallop(A, A[mid - 1], mid, hi, right=False)
+    return _merge_runs(A, lo, mid, hi)
+
+
+def _merge_collapse(A: MutableSequence[CT], runs: List[Tuple[int, int]]) -> None:
+    """Merge runs until the run lengths on the stack grow like Fibonacci numbers."""
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or (
+            n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]
+        ):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n = n - 1
+        elif runs[n][1] > runs[n + 1][1]:
+            return None
+        _merge_at(A, runs, n)
+    return None
+
+
+def natural_merge_sort(
+    A: MutableSequence[CT],
+    p: Optional[int] = None,
+    r: Optional[int] = None,
+    *,
+    key: Optional[Callable[[Any], Any]] = None,
+    reverse: bool = False,
+) -> int:
+    """Adaptive, stable in place sort of `A[p:r+1]`; returns its natural runs.
+
+    A simplified Timsort: the range is scanned for natural ascending and
+    strictly descending runs, short runs are extended by
+    `binary_insertion_sort`, and runs are merged with galloping. Sorted and
+    nearly-sorted input costs close to O(n) and the worst case is O(n log n).
+    The number of natural runs, as counted by `count_runs` before short
+    runs are extended, is a measure of how sorted `A` was.
+
+    `key` and `reverse` work as for `sorted`. `A` must support slice
+    assignment, as lists and arrays do.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    if key is not None or reverse:
+        decorated = _decorate(A, p, r, key, reverse)
+        num_runs = natural_merge_sort(decorated)
+        if reverse:
+            decorated.reverse()
+        permuted = [A[abs(j)] for _, j in decorated]
+        for offset, x in enumerate(permuted):
+            A[p + offset] = x
+        return num_runs
+    if r - p < 1:
+        return r - p + 1
+    num_runs = count_runs(A, p, r)
+    if num_runs == 1:
+        _count_run(A, p, r)
+        return num_runs
+    min_run = _min_run_length(r - p + 1)
+    runs: List[Tuple[int, int]] = []
+    lo = p
+    while lo <= r:
+        end = _count_run(A, lo, r)
+        if end - lo < min_run:
+            forced_end = min(lo + min_run, r + 1)
+            binary_insertion_sort(A, lo, forced_end - 1, start=end)
+            end = forced_end
+        runs.append((lo, end - lo))
+        _merge_collapse(A, runs)
+        lo = end
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+            n = n - 1
+        _merge_at(A, runs, n)
+    return num_runs
 
 
 def randomized_select(
+    A: MutableSequence[CT],
+    i: int,
+    p: Optional[int] = None,
+    r: Optional[int] = None,
+    *,
+    key: Optional[Callable[[Any], Any]] = None,
+    reverse: bool = False,
+) -> CT:
+    """O(n) search for the i-th smallest element of `A[p:r+1]`.
+
+    Raises ValueError unless 1 <= i <= r - p + 1. Without `key` or
+    `reverse`, `A[p:r+1]` is partitioned in place around the result; with
+    `key` the element with the i-th smallest key is returned, and with
+    `reverse` the i-th largest, and in either case `A` is left untouched.
+
+    Numeric NumPy arrays and `array.array`s are partitioned by NumPy, when
+    it is installed and no `key` is given; for `reverse` a copy is.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    _check_rank(i, p, r)
+    if key is None:
+        view = _numeric_view(A, p, r)
+        if view is not None:
+            if not reverse:
+                view.partition(i - 1)
+                return A[p + i - 1]
+            k = r - p + 1 - i
+            copy = view.copy()
+            copy.partition(k)
+            return copy[k] if isinstance(A, np.ndarray) else copy[k].item()
+    if key is not None or reverse:
+        decorated = _decorate(A, p, r, key, reverse)
+        if reverse:
+            i = len(decorated) - i + 1
+        _, j = randomized_select(decorated, i)
+        return A[abs(j)]
+    while p < r:
+        q = randomized_partition(A, p, r)
+        k = q - p + 1
+        if k == i:
+            return A[q]
+        if i < k:
+            r = q - 1
+        else:
+            i = i - k
+            p = q + 1
+    return A[r]
+
+
+def _check_rank(i: int, p: int, r: int) -> None:
+    if not 1 <= i <= r - p + 1:
+        raise ValueError(f"rank {i} is out of range for {r - p + 1} elements")
+
+
+def _median_of_medians(A: MutableSequence[CT], p: int, r: int) -> int:
+    """Return the index of the median of the medians of groups of five.
+
+    Each group of `A[p:r+1]` is sorted in place and its median is swapped to
+    the front of the range, where `select` then finds their median.
+    """
+    m = 0
+    for g in range(p, r + 1, 5):
+        last = min(g + 4, r)
+        insertion_sort(A, g, last)
+        median = g + (last - g) // 2
+        A[p + m], A[median] = A[median], A[p + m]
+        m = m + 1
+    half = (m + 1) // 2
+    select(A, half, p, p + m - 1)
+    return p + half - 1
+
+
+def select(
     A: MutableSequence[CT], i: int, p: Optional[int] = None, r: Optional[int] = None
-) -> int:
-    """O(n) search for the i-th smallest element of `A[p:r+1]`."""
+) -> CT:
+    """Worst-case O(n) search for the i-th smallest element of `A[p:r+1]`.
+
+    The pivot is the median of medians of groups of five, which guarantees
+    each partition discards a constant fraction of the range. Only the pivot
+    search recurses, to a depth of log_5 n; narrowing onto `i` is a loop. On
+    return the i-th smallest element sits at `A[p+i-1]`.
+    """
     if p is None:
         p = 0
     if r is None:
         r = len(A) - 1
-    if p >= r:
-        return A[r]
-    q = randomized_partition(A, p, r)
-    k = q - p + 1
-    if k == i:
-        return A[q]
-    if i < k:
-        return randomized_select(A, i, p, q - 1)
-    return randomized_select(A, i - k, q + 1, r)
+    _check_rank(i, p, r)
+    target = p + i - 1
+    while r - p + 1 > INSERTION_SORT_CUTOFF:
+        pivot = _median_of_medians(A, p, r)
+        A[pivot], A[r] = A[r], A[pivot]
+        lt, gt = three_way_partition(A, p, r)
+        if target < lt:
+            r = lt - 1
+        elif target > gt:
+            p = gt + 1
+        else:
+            return A[target]
+    insertion_sort(A, p, r)
+    return A[target]
+
+
+def floyd_rivest_select(
+    A: MutableSequence[CT], i: int, p: Optional[int] = None, r: Optional[int] = None
+) -> CT:
+    """Expected n + min(i, n - i) comparison search for the i-th smallest element.
+
+    Floyd and Rivest's SELECT: on long ranges a small sample is recursively
+    selected to find two pivots that bracket the target with high probability,
+    so each partition throws away nearly everything. The sample shrinks to
+    n^(2/3) per level, so the recursion is very shallow. On return the i-th
+    smallest element sits at `A[p+i-1]`.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    _check_rank(i, p, r)
+    k = p + i - 1
+    while r > p:
+        if r - p > 600:
+            n = r - p + 1
+            j = k - p + 1
+            z = math.log(n)
+            s = 0.5 * math.exp(2 * z / 3)
+            sd = 0.5 * math.sqrt(z * s * (n - s) / n) * (-1 if j < n / 2 else 1)
+            new_p = max(p, int(k - j * s / n + sd))
+            new_r = min(r, int(k + (n - j) * s / n + sd))
+            floyd_rivest_select(A, k - new_p + 1, new_p, new_r)
+        x = A[k]
+        lo, hi = p, r
+        A[p], A[k] = A[k], A[p]
+        if x < A[r]:
+            A[r], A[p] = A[p], A[r]
+        while lo < hi:
+            A[lo], A[hi] = A[hi], A[lo]
+            lo = lo + 1
+            hi = hi - 1
+            while A[lo] < x:
+                lo = lo + 1
+            while x < A[hi]:
+                hi = hi - 1
+        if not (A[p] < x or x < A[p]):
+            A[p], A[hi] = A[hi], A[p]
+        else:
+            hi = hi + 1
+            A[hi], A[r] = A[r], A[hi]
+        if hi <= k:
+            p = hi + 1
+        if k <= hi:
+            r = hi - 1
+    return A[k]
+
+
+def select_many(
+    A: MutableSequence[CT],
+    ranks: Sequence[int],
+    p: Optional[int] = None,
+    r: Optional[int] = None,
+) -> List[CT]:
+    """Return the elements of `A[p:r+1]` with each of the 1-based `ranks`.
+
+    The range is partitioned once and only the segments that contain a
+    requested rank are partitioned further; a segment left with a single rank
+    is finished by `floyd_rivest_select`. Pending segments are kept on an
+    explicit stack. Numeric NumPy arrays and `array.array`s are partitioned
+    by NumPy, when it is installed.
+    """
+    if p is None:
+        p = 0
+    if r is None:
+        r = len(A) - 1
+    for i in ranks:
+        _check_rank(i, p, r)
+    targets = sorted({p + i - 1 for i in ranks})
+    view = _numeric_view(A, p, r)
+    if view is not None:
+        if targets:
+            view.partition([t - p for t in targets])
+        return [A[p + i - 1] for i in ranks]
+    stack = [(p, r, targets)]
+    while stack:
+        lo, hi, segment_targets = stack.pop()
+        if not segment_targets:
+            continue
+        if len(segment_targets) == 1:
+            floyd_rivest_select(A, segment_targets[0] - lo + 1, lo, hi)
+            continue
+        if hi - lo + 1 <= INSERTION_SORT_CUTOFF:
+            insertion_sort(A, lo, hi)
+            continue
+        pivot = random.randint(lo, hi)
+        A[pivot], A[hi] = A[hi], A[pivot]
+        lt, gt = three_way_partition(A, lo, hi)
+        stack.append((lo, lt - 1, segment_targets[:bisect_left(segment_targets, lt)]))
+        stack.append((gt + 1, hi, segment_targets[bisect_right(segment_targets, gt):]))
+    return [A[p + i - 1] for i in ranks]
+
+
+def quantiles(A: MutableSequence[CT], qs: Sequence[float]) -> List[CT]:
+    """Return the nearest-rank quantile of `A` for each fraction in `qs`.
+
+    The q-quantile is the element of rank ceil(q * n), or the minimum for
+    q = 0. All quantiles are found together by `select_many`.
+    """
+    n = len(A)
+    if n == 0:
+        raise ValueError("quantiles of an empty sequence")
+    for q in qs:
+        if not 0 <= q <= 1:
+            raise ValueError(f"quantile {q} is not between 0 and 1")
+    return select_many(A, [max(1, math.ceil(q * n)) for q in qs])
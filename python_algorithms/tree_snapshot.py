@@ -0,0 +1,251 @@
+"""Saving search trees to disk and loading them back without replaying inserts."""
+
+from array import array
+from bisect import bisect_left
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, Generator, Iterator, List, Optional, Tuple
+
+from python_algorithms.binary_search_tree import (
+    CT,
+    TreeNode,
+    build_balanced_tree,
+    rb_insert,
+    tree_minimum,
+    tree_search,
+    tree_successor,
+)
+
+# A snapshot is a 16 byte header, the keys, padding to 8 bytes and the values.
+# Keys or values without a typecode are stored as one pickled list.
+_MAGIC = b"BST1"
+_HEADER = struct.Struct("<4scc2xQ")
+_PICKLED = b"-"
+
+
+def _padded(offset: int) -> int:
+    return -(-offset // 8) * 8
+
+
+def _infer_typecode(keys: List[Any]) -> Optional[str]:
+    """Pick an array typecode that holds every key exactly, if there is one.
+
+    Keys that mix ints and floats get none, so that they are pickled as they
+    are rather than all rounded to floats.
+    """
+    if all(type(key) is int and -2 ** 63 <= key < 2 ** 63 for key in keys):
+        return "q"
+    if all(type(key) is float for key in keys):
+        return "d"
+    return None
+
+
+def dump_tree(
+    root: Optional[TreeNode],
+    path: str,
+    key_typecode: Optional[str] = None,
+    value_typecode: Optional[str] = None,
+) -> int:
+    """Write the keys and values of the tree rooted at `root` to `path`.
+
+    Keys are written in order as a flat `array.array` of `key_typecode`, and
+    so are values when `value_typecode` is given; otherwise they are
+    pickled. By default the key typecode is "q" if every key is an int, "d"
+    if every key is a float, and the keys are pickled otherwise, while values are
+    always pickled. Returns the number of entries written.
+    """
+    keys: Any = []
+    values: Any = []
+    node = tree_minimum(root)
+    while node is not None:
+        keys.append(node.key)
+        values.append(node.value)
+        node = tree_successor(node)
+    if key_typecode is None:
+        key_typecode = _infer_typecode(keys)
+    with open(path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC,
+                key_typecode.encode() if key_typecode else _PICKLED,
+                value_typecode.encode() if value_typecode else _PICKLED,
+                len(keys),
+            )
+        )
+        for items, typecode in ((keys, key_typecode), (values, value_typecode)):
+            if typecode:
+                array(typecode, items).tofile(f)
+            else:
+                pickle.dump(items, f, pickle.HIGHEST_PROTOCOL)
+            f.write(b"\0" * (_padded(f.tell()) - f.tell()))
+    return len(keys)
+
+
+class Snapshot:
+    """A read-only sorted index over the memory-mapped arrays of a snapshot.
+
+    Numeric keys and values are read straight out of the page cache through
+    `memoryview`s; nothing is copied until a tree is built from them.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, key_code, value_code, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a search tree snapshot")
+        self._view = view = memoryview(self._mmap)
+        self._keys, start = self._read_items(view, key_code, count, _HEADER.size)
+        self._values, _ = self._read_items(view, value_code, count, start)
+
+    def _read_items(
+        self, view: memoryview, code: bytes, count: int, start: int
+    ) -> Tuple[Any, int]:
+        """Read the `count` keys or values at `start` and find where the next begin."""
+        if code == _PICKLED:
+            self._mmap.seek(start)
+            items = pickle.load(self._mmap)
+            return items, _padded(self._mmap.tell())
+        end = start + count * array(code.decode()).itemsize
+        return view[start:end].cast(code.decode()), _padded(end)  # type: ignore
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map."""
+        for items in (self._keys, self._values):
+            if isinstance(items, memoryview):
+                items.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: CT) -> bool:
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def search(self, key: CT) -> Optional[Any]:
+        """Return the value stored under `key` by binary search, or None."""
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._values[i]
+        return None
+
+    def items(self) -> Generator[Tuple[CT, Any], None, None]:
+        """Generate the `(key, value)` pairs in key order."""
+        for i in range(len(self._keys)):
+            yield self._keys[i], self._values[i]
+
+    def to_tree(self) -> Optional[TreeNode]:
+        """Build a balanced red-black tree of the snapshot in O(n)."""
+        return build_balanced_tree(list(zip(self._keys, self._values)))
+
+
+class TreeJournal:
+    """An append-only log of inserts made since the last snapshot.
+
+    Each record is pickled separately, so a record torn by a crash is simply
+    dropped when the journal is replayed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._file = open(path, "ab")
+
+    def __enter__(self) -> "TreeJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def append(self, key: CT, value: Any) -> None:
+        """Record the insert of `key` with `value`."""
+        pickle.dump((key, value), self._file, pickle.HIGHEST_PROTOCOL)
+        self._file.flush()
+
+    def truncate(self) -> None:
+        """Forget every recorded insert, once they are in a snapshot."""
+        self._file.truncate(0)
+
+    def replay(self) -> Iterator[Tuple[CT, Any]]:
+        """Generate the recorded `(key, value)` pairs in the order made."""
+        return replay_journal(self._path)
+
+
+def replay_journal(path: str) -> Generator[Tuple[Any, Any], None, None]:
+    """Generate the `(key, value)` pairs recorded in the journal at `path`."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except (EOFError, pickle.UnpicklingError):
+                return
+
+
+def load_tree(path: str, journal_path: Optional[str] = None) -> Optional[TreeNode]:
+    """Rebuild a balanced red-black tree from the snapshot at `path`.
+
+    The tree is built from the sorted snapshot in O(n); only the inserts in
+    the journal at `journal_path`, if any, are replayed with `rb_insert`.
+    Returns the new root.
+    """
+    with Snapshot(path) as snapshot:
+        root = snapshot.to_tree()
+    if journal_path is not None:
+        for key, value in replay_journal(journal_path):
+            node = tree_search(root, key)
+            if node is not None:
+                node.value = value
+            else:
+                root = rb_insert(root, TreeNode(key=key, value=value))
+    return root
+
+
+def checkpoint(
+    root: Optional[TreeNode],
+    path: str,
+    journal: TreeJournal,
+    key_typecode: Optional[str] = None,
+    value_typecode: Optional[str] = None,
+) -> int:
+    """Snapshot the tree to `path` and then empty `journal`.
+
+    The snapshot is written to a temporary file, synced to disk and renamed
+    over `path`, and the rename is synced before the journal is emptied, so
+    `path` always holds a complete snapshot, even after a power loss. A
+    crash before the journal is emptied only means its inserts get replayed
+    onto a snapshot that already has them, which changes nothing.
+    """
+    tmp_path = path + ".tmp"
+    count = dump_tree(root, tmp_path, key_typecode, value_typecode)
+    with open(tmp_path, "rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+    journal.truncate()
+    return count
+
+
+def _fsync_directory(path: str) -> None:
+    """Sync the directory at `path`, making renames in it durable, where supported."""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,18 @@
+import random
+
+import pytest
+
+from python_algorithms.graphs import CSRGraph
+
+
+@pytest.fixture
+def random_csr_graph():
+    """Return a function building a graph of `m` random edges among `n` ids."""
+
+    def _random_csr_graph(n, m, seed=0):
+        rng = random.Random(seed)
+        return CSRGraph.from_connections(
+            (rng.randrange(n), rng.randrange(n), 1) for _ in range(m)
+        )
+
+    return _random_csr_graph
@@ -0,0 +1,77 @@
+"""Tests of the array-backed binary search tree."""
+
+import random
+
+import pytest
+
+from python_algorithms.array_tree import ArrayTree
+
+SOME_INTEGERS = [15, 6, 18, 3, 7, 17, 20, 2, 4, 13, 9]
+
+
+@pytest.fixture
+def tree():
+    tree = ArrayTree(key_typecode="l")
+    for key in SOME_INTEGERS:
+        tree.insert(key, str(key))
+    return tree
+
+
+def test_insert_and_walk(tree):
+    assert len(tree) == len(SOME_INTEGERS)
+    assert tree.key(tree.root) == SOME_INTEGERS[0]
+    assert list(tree.walk()) == sorted(SOME_INTEGERS)
+    assert list(tree.items())[:2] == [(2, "2"), (3, "3")]
+
+
+def test_search(tree):
+    assert tree.search(99) is None
+    assert 99 not in tree
+    assert tree.value(tree.search(17)) == "17"
+    assert 17 in tree
+
+
+def test_minimum_and_maximum(tree):
+    assert tree.key(tree.minimum()) == 2
+    assert tree.key(tree.maximum()) == 20
+    assert tree.key(tree.minimum(tree.search(18))) == 17
+    assert ArrayTree().minimum() is None
+
+
+def test_delete_reuses_slots(tree):
+    for key in [6, 15, 2, 20]:
+        tree.delete(tree.search(key))
+        assert key not in tree
+    assert list(tree.walk()) == [3, 4, 7, 9, 13, 17, 18]
+    slots = {tree.insert(key) for key in [1, 5, 8, 30]}
+    assert max(slots) < len(SOME_INTEGERS)
+    assert list(tree.walk()) == [1, 3, 4, 5, 7, 8, 9, 13, 17, 18, 30]
+
+
+def test_typed_values():
+    tree = ArrayTree(key_typecode="d", value_typecode="d")
+    keys = [random.random() for _ in range(1000)]
+    for key in keys:
+        tree.insert(key, 2 * key)
+    for key in random.sample(keys, 500):
+        tree.delete(tree.search(key))
+        keys.remove(key)
+    assert [key for key, _ in tree.items()] == sorted(keys)
+    assert all(value == 2 * key for key, value in tree.items())
+    tree.insert(0.5)
+    assert tree.value(tree.search(0.5)) == 0.0
+
+
+def test_delete_rejects_free_slots(tree):
+    slot = tree.search(6)
+    tree.delete(slot)
+    with pytest.raises(ValueError):
+        tree.delete(slot)
+    assert list(tree.walk()) == sorted(set(SOME_INTEGERS) - {6})
+    assert tree.insert(5) == slot
+    for key in SOME_INTEGERS + [5]:
+        if key != 6:
+            tree.delete(tree.search(key))
+    assert len(tree) == 0
+    with pytest.raises(ValueError):
+        tree.delete(slot)
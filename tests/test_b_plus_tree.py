@@ -0,0 +1,114 @@
+"""Tests of the B+ tree ordered index."""
+
+import random
+
+import pytest
+
+from python_algorithms import b_plus_tree
+from python_algorithms.b_plus_tree import BPlusTree
+
+SOME_INTEGERS = [15, 6, 18, 3, 7, 17, 20, 2, 4, 13, 9]
+
+
+@pytest.fixture
+def tree():
+    tree = BPlusTree(fanout=3)
+    for key in SOME_INTEGERS:
+        tree.insert(key, str(key))
+    return tree
+
+
+def test_insert_and_walk(tree):
+    assert len(tree) == len(SOME_INTEGERS)
+    assert list(tree.walk()) == sorted(SOME_INTEGERS)
+    tree.insert(7, "seven")
+    assert len(tree) == len(SOME_INTEGERS)
+    assert tree[7] == "seven"
+
+
+def test_search(tree):
+    assert tree.search(17) == "17"
+    assert tree.search(99) is None
+    assert 17 in tree
+    assert 99 not in tree
+    with pytest.raises(KeyError):
+        tree[99]
+
+
+def test_minimum_and_maximum(tree):
+    assert tree.minimum() == 2
+    assert tree.maximum() == 20
+    assert BPlusTree().minimum() is None
+    assert BPlusTree().maximum() is None
+
+
+def test_range_scans(tree):
+    assert list(tree.irange(4, 15)) == [4, 6, 7, 9, 13, 15]
+    assert list(tree.irange(5, 5)) == []
+    assert list(tree.irange(hi=3)) == [2, 3]
+    assert list(tree.items(lo=18)) == [(18, "18"), (20, "20")]
+
+
+@pytest.mark.parametrize("fanout", [3, 4, 64])
+def test_random_inserts(fanout):
+    keys = random.sample(range(10000), 2000)
+    tree = BPlusTree(fanout)
+    for key in keys:
+        tree[key] = -key
+    assert list(tree) == sorted(keys)
+    assert all(tree[key] == -key for key in keys)
+
+
+@pytest.mark.parametrize("n", [0, 1, 3, 4, 100, 1000])
+def test_from_sorted(n):
+    tree = BPlusTree.from_sorted([(key, -key) for key in range(n)], fanout=4)
+    assert list(tree) == list(range(n))
+    assert all(tree[key] == -key for key in range(n))
+    tree.insert(n + 0.5, None)
+    tree.insert(-0.5, None)
+    assert list(tree) == [-0.5] + list(range(n)) + [n + 0.5]
+    with pytest.raises(ValueError):
+        BPlusTree.from_sorted([(2, None), (1, None)])
+
+
+def test_save_and_open(tmp_path):
+    path = str(tmp_path / "index.bpt")
+    tree = BPlusTree.from_sorted([(key, str(key)) for key in range(0, 3000, 3)], fanout=8)
+    tree.save(path)
+    reopened = BPlusTree.open(path)
+    assert len(reopened) == len(tree)
+    assert reopened.fanout == 8
+    assert list(reopened.items()) == list(tree.items())
+    assert reopened[300] == "300"
+    reopened.insert(1, "1")
+    assert list(reopened.irange(0, 6)) == [0, 1, 3, 6]
+
+    (tmp_path / "bogus").write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        BPlusTree.open(str(tmp_path / "bogus"))
+
+
+def test_open_reads_pages_lazily(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.bpt")
+    BPlusTree.from_sorted([(key, -key) for key in range(10000)], fanout=8).save(path)
+    decoded = []
+    loads = b_plus_tree.pickle.loads
+    monkeypatch.setattr(b_plus_tree.pickle, "loads", lambda data: decoded.append(1) or loads(data))
+    with BPlusTree.open(path) as tree:
+        assert len(decoded) == 1
+        assert tree[4321] == -4321
+        depth = len(decoded)
+        assert depth <= 6
+        assert tree[4322] == -4322
+        assert len(decoded) == depth
+        assert list(tree.irange(4320, 4330)) == list(range(4320, 4331))
+        tree.insert(4320.5, None)
+        assert list(tree.irange(4320, 4321)) == [4320, 4320.5, 4321]
+        assert len(decoded) < 20
+    assert list(tree) == sorted(list(range(10000)) + [4320.5])
+
+    reopened = BPlusTree.open(path)
+    reopened.insert(-1, 1)
+    reopened.save(path)
+    with BPlusTree.open(path) as tree:
+        assert list(tree.irange(hi=1)) == [-1, 0, 1]
@@ -1,11 +1,25 @@
+import random
+
 import pytest
 
 from python_algorithms.binary_search_tree import (
+    NodeColor,
     TreeNode,
     tree_insert,
     in_order_tree_walk,
     tree_search,
     tree_minimum,
+    tree_maximum,
+    tree_delete,
+    tree_successor,
+    tree_predecessor,
+    rb_insert,
+    rb_delete,
+    build_balanced_tree,
+    tree_select,
+    tree_rank,
+    tree_count_range,
+    TreeMap,
 )
 
 SOME_INTEGERS = [15, 6, 18, 3, 7, 17, 20, 2, 4, 13, 9]
@@ -75,4 +89,159 @@ def test_tree_minimum(tree_root):
     assert computed.key == 17
 
     computed = tree_minimum(None)
-    assert computed is None
\ No newline at end of file
+    assert computed is None
+
+def black_height(node):
+    """Check the red-black properties below `node`; return its black height."""
+    if node is None:
+        return 1
+    if node.color is NodeColor.RED:
+        assert node.left_child is None or node.left_child.color is NodeColor.BLACK
+        assert node.right_child is None or node.right_child.color is NodeColor.BLACK
+    for child in (node.left_child, node.right_child):
+        if child is not None:
+            assert child.parent is node
+    left = black_height(node.left_child)
+    assert left == black_height(node.right_child)
+    sizes = [child.size for child in (node.left_child, node.right_child) if child]
+    assert node.size == 1 + sum(sizes)
+    return left + (node.color is NodeColor.BLACK)
+
+
+def test_tree_maximum(tree_root):
+    assert tree_maximum(tree_root).key == max(SOME_INTEGERS)
+    assert tree_maximum(tree_root.left_child).key == 13
+    assert tree_maximum(None) is None
+
+
+def test_tree_delete(tree_root):
+    root = tree_root
+    for key in [6, 15, 2, 20]:
+        root = tree_delete(root, tree_search(root, key))
+        assert tree_search(root, key) is None
+    assert list(in_order_tree_walk(root)) == [3, 4, 7, 9, 13, 17, 18]
+    assert [tree_select(root, i).key for i in range(1, 8)] == [3, 4, 7, 9, 13, 17, 18]
+
+
+def test_rb_insert_monotonic_keys():
+    root = None
+    for key in range(1000):
+        root = rb_insert(root, TreeNode(key=key, value=str(key)))
+    assert root.color is NodeColor.BLACK
+    assert black_height(root) <= 11
+    assert list(in_order_tree_walk(root)) == list(range(1000))
+    assert tree_search(root, 999).value == "999"
+    assert tree_minimum(root).key == 0
+    assert tree_maximum(root).key == 999
+
+
+def test_rb_delete():
+    keys = list(range(500))
+    random.shuffle(keys)
+    root = None
+    for key in keys:
+        root = rb_insert(root, TreeNode(key=key, value=None))
+    random.shuffle(keys)
+    for n, key in enumerate(keys):
+        root = rb_delete(root, tree_search(root, key))
+        if n % 50 == 0:
+            black_height(root)
+            assert list(in_order_tree_walk(root)) == sorted(keys[n + 1:])
+    assert root is None
+
+
+def test_tree_successor_and_predecessor(tree_root):
+    node = tree_minimum(tree_root)
+    keys = []
+    while node is not None:
+        keys.append(node.key)
+        node = tree_successor(node)
+    assert keys == sorted(SOME_INTEGERS)
+
+    node = tree_maximum(tree_root)
+    keys = []
+    while node is not None:
+        keys.append(node.key)
+        node = tree_predecessor(node)
+    assert keys == sorted(SOME_INTEGERS, reverse=True)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 7, 8, 100, 1023, 1024])
+def test_build_balanced_tree(n):
+    root = build_balanced_tree([(key, -key) for key in range(n)])
+    black_height(root)
+    assert list(in_order_tree_walk(root)) == list(range(n))
+    if n:
+        assert tree_search(root, n - 1).value == 1 - n
+
+
+def test_tree_map():
+    tree_map = TreeMap((key, str(key)) for key in SOME_INTEGERS)
+    assert len(tree_map) == len(SOME_INTEGERS)
+    assert list(tree_map) == sorted(SOME_INTEGERS)
+    assert tree_map[7] == "7"
+    assert 8 not in tree_map
+    assert tree_map.get(8) is None
+
+    tree_map[7] = "seven"
+    tree_map[8] = "eight"
+    del tree_map[15]
+    assert len(tree_map) == len(SOME_INTEGERS)
+    assert list(tree_map.items())[3:6] == [(6, "6"), (7, "seven"), (8, "eight")]
+    with pytest.raises(KeyError):
+        tree_map[15]
+    with pytest.raises(KeyError):
+        del tree_map[15]
+
+
+def test_tree_map_queries():
+    tree_map = TreeMap.from_sorted((key, None) for key in range(0, 100, 10))
+    assert tree_map.floor(35) == 30
+    assert tree_map.floor(30) == 30
+    assert tree_map.floor(-1) is None
+    assert tree_map.ceiling(35) == 40
+    assert tree_map.ceiling(91) is None
+    assert list(tree_map.irange(15, 50)) == [20, 30, 40, 50]
+    assert list(tree_map.irange(hi=15)) == [0, 10]
+    assert list(tree_map.irange(lo=85)) == [90]
+    assert list(tree_map.irange(51, 59)) == []
+
+
+def test_tree_map_from_sorted_rejects_unsorted_keys():
+    with pytest.raises(ValueError):
+        TreeMap.from_sorted([(1, None), (1, None)])
+
+
+def test_order_statistics(tree_root):
+    ordered = sorted(SOME_INTEGERS)
+    for i, key in enumerate(ordered, start=1):
+        assert tree_select(tree_root, i).key == key
+        assert tree_rank(tree_root, key) == i - 1
+    assert tree_select(tree_root, 0) is None
+    assert tree_select(tree_root, len(ordered) + 1) is None
+    assert tree_rank(tree_root, 100) == len(ordered)
+    assert tree_rank(tree_root, 5) == 3
+    assert tree_count_range(tree_root, 4, 15) == 6
+    assert tree_count_range(tree_root, 5, 5) == 0
+    assert tree_count_range(tree_root, 15, 4) == 0
+
+
+def test_order_statistics_stay_correct_under_updates():
+    tree_map = TreeMap()
+    present = set()
+    for step in range(3000):
+        key = random.randrange(400)
+        if key in present:
+            del tree_map[key]
+            present.discard(key)
+        else:
+            tree_map[key] = None
+            present.add(key)
+        if step % 300 == 0:
+            black_height(tree_map.root)
+            ordered = sorted(present)
+            assert tree_map.select(len(ordered) // 2 + 1) == ordered[len(ordered) // 2]
+            assert tree_map.rank(200) == sum(1 for k in ordered if k < 200)
+            assert tree_map.count_range(100, 299) == sum(1 for k in ordered if 100 <= k <= 299)
+    with pytest.raises(IndexError):
+        tree_map.select(len(present) + 1)
@@ -0,0 +1,79 @@
+"""Tests of the thread-safe sorted map."""
+
+import random
+import threading
+
+import pytest
+
+from python_algorithms.concurrent_map import ConcurrentTreeMap, benchmark_reader_scaling
+
+SOME_INTEGERS = [15, 6, 18, 3, 7, 17, 20, 2, 4, 13, 9]
+
+
+def test_concurrent_tree_map():
+    tree_map = ConcurrentTreeMap((key, str(key)) for key in SOME_INTEGERS)
+    assert len(tree_map) == len(SOME_INTEGERS)
+    assert list(tree_map) == sorted(SOME_INTEGERS)
+    assert tree_map[7] == "7"
+    assert tree_map.get(8) is None
+    assert list(tree_map.irange(4, 15)) == [4, 6, 7, 9, 13, 15]
+
+    tree_map[7] = "seven"
+    del tree_map[15]
+    assert len(tree_map) == len(SOME_INTEGERS) - 1
+    assert tree_map[7] == "seven"
+    assert 15 not in tree_map
+    with pytest.raises(KeyError):
+        tree_map[15]
+    with pytest.raises(KeyError):
+        del tree_map[15]
+
+
+def test_snapshots_are_unaffected_by_writes():
+    tree_map = ConcurrentTreeMap((key, key) for key in range(100))
+    snapshot = tree_map.snapshot()
+    for key in range(0, 100, 2):
+        del tree_map[key]
+    tree_map[1] = "changed"
+    assert list(snapshot) == list(range(100))
+    assert snapshot[1] == 1
+    assert list(snapshot.items(10, 12)) == [(10, 10), (11, 11), (12, 12)]
+    assert list(tree_map) == list(range(1, 100, 2))
+    assert tree_map.snapshot().version == snapshot.version + 51
+
+
+def test_stress_readers_see_consistent_snapshots():
+    # Whatever the writer is doing, every snapshot a reader takes must be a
+    # sorted set of keys of the size the snapshot reports.
+    tree_map = ConcurrentTreeMap()
+    errors = []
+    done = threading.Event()
+
+    def write():
+        for key in random.sample(range(2000), 2000):
+            tree_map[key] = key
+        for key in range(2000):
+            tree_map[key] = key
+        done.set()
+
+    def read():
+        while not done.is_set():
+            snapshot = tree_map.snapshot()
+            keys = list(snapshot)
+            if keys != sorted(set(keys)) or len(keys) != len(snapshot):
+                errors.append(keys)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert list(tree_map) == list(range(2000))
+
+
+def test_benchmark_reader_scaling():
+    results = benchmark_reader_scaling(reader_counts=(1, 2), num_keys=100, duration=0.05)
+    assert [readers for readers, _, _ in results] == [1, 2]
+    assert all(reads > 0 and writes > 0 for _, reads, writes in results)
@@ -1,8 +1,17 @@
+import collections
+import itertools
+import random
+
 import pytest
 
 import python_algorithms.dynamic_programming as dp
 
 
+@pytest.fixture(autouse=True)
+def clear_memos():
+    dp.clear_memos()
+
+
 @pytest.mark.parametrize("rod_length, expected", [
     (4, 10),
     (5, 13),
@@ -22,6 +31,9 @@ def test_cut_rod(rod_length, expected):
     (3, 8, 21),
     (3, 10, 27),
     (5, 17, 780),
+    (0, 0, 1),
+    (-1, 0, 0),
+    (-2, -3, 0),
 ])
 def test_dice_rolls(num_rolls, sum_rolls, expected):
     assert dp.dice_rolls(num_rolls, sum_rolls) == expected
@@ -41,3 +53,199 @@ def test_knapsack():
 def test_min_remainder(total, G, expected):
     i = j = len(G[0])
     assert dp.min_remainder(i, j, total, G) == expected
+
+
+def _compositions(n):
+    if n == 0:
+        yield []
+    for i in range(1, n + 1):
+        for rest in _compositions(n - i):
+            yield [i] + rest
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_cut_rod_solution(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(dp, "np", None)
+    prices = [1, 5, 8, 9, 10, 17, 17, 20, 24, 30]
+    assert dp.cut_rod_solution(prices, 7) == (18, [1, 6])
+    assert dp.cut_rod_solution(prices, 10) == (30, [10])
+    assert dp.cut_rod_solution(prices, 0) == (0, [])
+    assert dp.cut_rod_many(prices, [4, 5, 6, 9, 10]) == [10, 13, 17, 25, 30]
+    assert dp.cut_rod(prices, 13) == 38
+
+    for cut_cost in (0, 1, 2.5):
+        for n in range(1, 9):
+            expected = max(
+                sum(prices[i - 1] for i in pieces) - cut_cost * (len(pieces) - 1)
+                for pieces in _compositions(n)
+            )
+            revenue, pieces = dp.cut_rod_solution(prices, n, cut_cost)
+            assert revenue == pytest.approx(expected)
+            assert sum(pieces) == n
+            assert sum(prices[i - 1] for i in pieces) - cut_cost * (len(pieces) - 1) == (
+                pytest.approx(revenue)
+            )
+    with pytest.raises(ValueError):
+        dp.cut_rod([], 1)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_dice_distribution(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(dp, "np", None)
+    for dice in ([], [6], [6, 6, 6], [4, 6, 6, 20], [2, 3]):
+        expected = collections.Counter(map(sum, itertools.product(*(range(1, f + 1) for f in dice))))
+        computed = dp.dice_distribution(dice)
+        assert computed == [expected[s] for s in range(sum(dice) + 1)]
+    assert dp.dice_distribution(3, faces=2) == [0, 0, 0, 1, 3, 3, 1]
+    with pytest.raises(ValueError):
+        dp.dice_distribution(-1)
+
+
+def test_dice_distribution_many_dice():
+    distribution = dp.dice_distribution(400)
+    assert len(distribution) == 2401
+    assert sum(distribution) == 6 ** 400
+    assert distribution[400] == distribution[2400] == 1
+    assert dp.dice_rolls(400, 1400) == distribution[1400]
+
+    modulus = 10 ** 9 + 7
+    assert dp.dice_distribution(400, modulus=modulus) == [c % modulus for c in distribution]
+
+
+def test_poly_multiply():
+    assert dp.poly_multiply([1, 1], [1, 1]) == [1, 2, 1]
+    assert dp.poly_multiply([2 ** 70, 1], [3, 0, 1]) == [3 * 2 ** 70, 3, 2 ** 70, 1]
+    assert dp.poly_multiply([5, 6], [7], modulus=4) == [3, 2]
+    assert dp.poly_multiply([], [1]) == []
+
+
+def _brute_force_knapsack(items, copies, max_weight):
+    best = 0
+    for counts in itertools.product(*(range(c + 1) for c in copies)):
+        weight = sum(c * w for c, (_, w) in zip(counts, items))
+        if weight <= max_weight:
+            best = max(best, sum(c * v for c, (v, _) in zip(counts, items)))
+    return best
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_knapsack_variants(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(dp, "np", None)
+    rng = random.Random(0)
+    for _ in range(30):
+        items = [(rng.randint(1, 20), rng.randint(1, 10)) for _ in range(rng.randint(0, 5))]
+        copies = [rng.randint(0, 3) for _ in items]
+        max_weight = rng.randint(0, 30)
+
+        for solve, counts in [
+            (dp.knapsack, [1] * len(items)),
+            (lambda items, w: dp.bounded_knapsack(items, copies, w), copies),
+            (dp.unbounded_knapsack, [max_weight // w for _, w in items]),
+        ]:
+            best_value, chosen = solve(items, max_weight)
+            assert best_value == _brute_force_knapsack(items, counts, max_weight)
+            assert sum(v for v, _ in chosen) == best_value
+            assert sum(w for _, w in chosen) <= max_weight
+        assert dp.knapsack_value(items, max_weight) == dp.knapsack(items, max_weight)[0]
+
+
+def test_knapsack_test_case_without_numpy(monkeypatch):
+    monkeypatch.setattr(dp, "np", None)
+    test_knapsack()
+
+
+def test_knapsack_large():
+    items = [(i % 97 + 1, i % 89 + 1) for i in range(2000)]
+    assert dp.knapsack_value(items, 1000) == dp.knapsack(items, 1000)[0]
+
+
+def test_unbounded_knapsack():
+    assert dp.unbounded_knapsack([(10, 5), (40, 4), (30, 6), (50, 3)], 10) == (
+        150,
+        [(50, 3), (50, 3), (50, 3)],
+    )
+    assert dp.unbounded_knapsack([(10, 5), (40, 4), (30, 6), (50, 3)], 2) == (0, [])
+    with pytest.raises(ValueError):
+        dp.unbounded_knapsack([(1, 0)], 10)
+
+
+def _path_cost(G, path):
+    return sum(G[r - 1][c - 1] for r, c in path[1:])
+
+
+def _cells(moves):
+    r = c = 0
+    for move in moves:
+        if move == "D":
+            r += 1
+        else:
+            c += 1
+        yield r, c
+
+
+def test_min_remainder_path():
+    rng = random.Random(0)
+    for _ in range(40):
+        rows, cols = rng.randint(1, 6), rng.randint(1, 6)
+        G = [[rng.randint(0, 9) for _ in range(cols)] for _ in range(rows)]
+        i, j = rng.randint(1, rows), rng.randint(1, cols)
+        total = rng.randint(0, 40)
+        costs = [
+            sum(G[r][c] for r, c in _cells(moves))
+            for moves in set(itertools.permutations("D" * (i - 1) + "R" * (j - 1)))
+        ]
+        feasible = [total - cost for cost in costs if cost <= total]
+        expected = min(feasible) if feasible else -1
+        assert dp.min_remainder(i, j, total, G) == expected
+
+        remainder, path = dp.min_remainder_path(i, j, total, G)
+        assert remainder == expected
+        if expected == -1:
+            assert path == []
+        else:
+            assert path[0] == (1, 1) and path[-1] == (i, j)
+            assert all(
+                (r2 - r1, c2 - c1) in ((0, 1), (1, 0)) for (r1, c1), (r2, c2) in zip(path, path[1:])
+            )
+            assert total - _path_cost(G, path) == remainder
+
+
+def test_min_remainder_large_grid():
+    rng = random.Random(1)
+    G = [[rng.randint(0, 3) for _ in range(100)] for _ in range(100)]
+    remainder, path = dp.min_remainder_path(100, 100, 250, G)
+    assert remainder == dp.min_remainder(100, 100, 250, G)
+    assert len(path) == 199
+    assert 250 - _path_cost(G, path) == remainder
+
+
+def test_memos_are_reused():
+    prices = [1, 5, 8, 9, 10, 17, 17, 20, 24, 30]
+    dp.cut_rod(prices, 10)
+    assert dp.cut_rod(list(prices), 7) == 18
+    assert dp.CUT_ROD_MEMO.hits == 1
+    assert dp.cut_rod_solution(prices, 10, cut_cost=1) == (30, [10])
+    assert dp.CUT_ROD_MEMO.misses == 2
+
+    items = [(4, 12), (2, 1), (6, 4), (1, 1), (2, 2)]
+    assert dp.knapsack_value(items, 15) == 11
+    expected = (11, [(2, 1), (6, 4), (1, 1), (2, 2)])
+    assert dp.knapsack(items, 15) == expected
+    computed = dp.knapsack(items, 15)
+    assert computed == expected
+    computed[1].clear()
+    assert dp.knapsack(items, 15) == expected
+    assert (dp.KNAPSACK_MEMO.hits, dp.KNAPSACK_MEMO.misses) == (2, 2)
+
+    dp.dice_distribution([6, 6, 20])
+    dp.dice_rolls(2, 7)
+    assert dp.DICE_MEMO.hits == 1
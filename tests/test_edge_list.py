@@ -0,0 +1,79 @@
+"""Tests of loading edge-list files."""
+
+import pytest
+
+from python_algorithms.edge_list import BINARY_EDGE, dump_edge_list, load_edge_list
+from python_algorithms.graphs import CSRGraph
+
+
+EDGES = [("a", "b", 2.0), ("b", "c", 1.0), ("a", "c", 5.0), ("c", "a", 1.0)]
+
+
+def _edge_set(graph):
+    labels = graph.labels
+    return {
+        (labels[u], labels[v], w) for u in range(graph.num_vertices) for v, w in graph.edges(u)
+    }
+
+
+@pytest.mark.parametrize("suffix, delimiter", [(".tsv", "\t"), (".csv", ","), (".txt", " ")])
+def test_load_text_edge_list(tmp_path, suffix, delimiter):
+    path = tmp_path / ("edges" + suffix)
+    lines = ["# source target weight", ""]
+    lines += [delimiter.join([u, v, str(w)]) for u, v, w in EDGES]
+    path.write_text("\n".join(lines))
+    graph, stats = load_edge_list(str(path), chunk_size=7)
+    assert graph.labels == ["a", "b", "c"]
+    assert _edge_set(graph) == set(EDGES)
+    assert stats.num_edges == 4
+    assert stats.num_vertices == 3
+    assert stats.num_bytes == path.stat().st_size
+
+
+def test_load_edge_list_default_weight_and_progress(tmp_path):
+    path = tmp_path / "edges.csv"
+    path.write_text("a,b\nb,c\n")
+    calls = []
+    graph, _ = load_edge_list(str(path), default_weight=3.0, progress=lambda *args: calls.append(args))
+    assert _edge_set(graph) == {("a", "b", 3.0), ("b", "c", 3.0)}
+    assert calls[-1] == (2, 8)
+
+
+def test_load_binary_edge_list(tmp_path):
+    graph = CSRGraph.from_connections(EDGES)
+    path = str(tmp_path / "edges.bin")
+    dump_edge_list(graph, path)
+    calls = []
+    loaded, stats = load_edge_list(
+        path, binary=True, chunk_size=BINARY_EDGE.size * 3, progress=lambda *args: calls.append(args)
+    )
+    assert loaded.labels == [0, 1, 2]
+    assert list(loaded.indptr) == list(graph.indptr)
+    assert list(loaded.indices) == list(graph.indices)
+    assert list(loaded.weights) == list(graph.weights)
+    assert [edges for edges, _ in calls] == [3, 4]
+    assert stats.num_bytes == 4 * BINARY_EDGE.size
+
+    with open(path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        load_edge_list(path, binary=True)
+
+
+def test_load_edge_list_mixed_line_widths(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("1 2 1\n3 4\n5 6 2 9\n")
+    expected = {("1", "2", 1.0), ("3", "4", 1.0), ("5", "6", 2.0)}
+    for delimiter in (None, " "):
+        for chunk_size in (6, 1 << 20):
+            graph, _ = load_edge_list(str(path), delimiter=delimiter, chunk_size=chunk_size)
+            assert _edge_set(graph) == expected
+
+
+def test_load_edge_list_traces_memory(tmp_path):
+    path = tmp_path / "edges.csv"
+    path.write_text("".join("v%d,v%d,1\n" % (i, i + 1) for i in range(1000)))
+    _, stats = load_edge_list(str(path))
+    assert stats.peak_memory is None
+    _, stats = load_edge_list(str(path), trace_memory=True)
+    assert stats.peak_memory > 1000 * 16
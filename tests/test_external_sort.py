@@ -0,0 +1,57 @@
+"""Tests of the external merge sort."""
+
+import operator
+import os
+import random
+
+from python_algorithms.external_sort import external_sort, merge_runs
+
+
+def test_merge_runs():
+    runs = [iter([1, 4, 7]), iter([]), iter([2, 5, 8]), iter([0, 3, 6, 9])]
+    assert list(merge_runs(runs)) == list(range(10))
+
+    runs = [iter([7, 4, 1]), iter([8, 5, 2])]
+    assert list(merge_runs(runs, reverse=True)) == [8, 7, 5, 4, 2, 1]
+
+
+def test_external_sort(tmp_path):
+    xs = [random.randint(0, 1000) for _ in range(1000)]
+    computed = external_sort(xs, chunk_size=64, max_workers=2, tmp_dir=str(tmp_path))
+    assert list(computed) == sorted(xs)
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_external_sort_is_stable(tmp_path):
+    records = [(random.randint(0, 10), i) for i in range(500)]
+    computed = external_sort(
+        records,
+        chunk_size=50,
+        max_workers=2,
+        tmp_dir=str(tmp_path),
+        key=operator.itemgetter(0),
+        reverse=True,
+    )
+    assert list(computed) == sorted(records, key=operator.itemgetter(0), reverse=True)
+
+
+def test_external_sort_small_input():
+    assert list(external_sort([3, 1, 2], chunk_size=10)) == [1, 2, 3]
+    assert list(external_sort([], chunk_size=10)) == []
+
+
+def test_external_sort_file(tmp_path):
+    words = ["pear", "apple", "fig", "kiwi", "banana", "cherry", "date"]
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(words) + "\n")
+    computed = external_sort(str(path), chunk_size=3, max_workers=1, tmp_dir=str(tmp_path))
+    assert list(computed) == sorted(words)
+
+
+def test_external_sort_file_encoding(tmp_path):
+    words = ["été", "über", "açaí", "zebra", "ñandú"]
+    path = tmp_path / "words.txt"
+    path.write_bytes("\n".join(words).encode("utf-8") + b"\n")
+    assert list(external_sort(str(path))) == sorted(words)
+    path.write_bytes("\n".join(words).encode("latin-1") + b"\n")
+    assert list(external_sort(str(path), encoding="latin-1")) == sorted(words)
@@ -1,33 +1,52 @@
+import math
+import random
+import sys
+
 import pytest
 
-from python_algorithms.graphs import Graph, breadth_first_search, NodeColor
+from python_algorithms.graphs import (
+    CSRGraph,
+    Graph,
+    NodeColor,
+    a_star,
+    benchmark_shortest_paths,
+    bfs,
+    bidirectional_dijkstra,
+    breadth_first_search,
+    csr_breadth_first_search,
+    dijkstra,
+    direction_optimizing_bfs,
+    grid_road_network,
+)
+
+
+CONNECTIONS = [
+    ("r", "s", 1),
+    ("r", "v", 1),
+    ("s", "r", 1),
+    ("s", "w", 1),
+    ("t", "u", 1),
+    ("t", "w", 1),
+    ("t", "x", 1),
+    ("u", "t", 1),
+    ("u", "x", 1),
+    ("u", "y", 1),
+    ("v", "r", 1),
+    ("w", "s", 1),
+    ("w", "t", 1),
+    ("w", "x", 1),
+    ("x", "t", 1),
+    ("x", "u", 1),
+    ("x", "w", 1),
+    ("x", "y", 1),
+    ("y", "u", 1),
+    ("y", "x", 1),
+]
 
 
 @pytest.fixture
 def undirected_graph():
-    connections = [
-        ("r", "s", 1),
-        ("r", "v", 1),
-        ("s", "r", 1),
-        ("s", "w", 1),
-        ("t", "u", 1),
-        ("t", "w", 1),
-        ("t", "x", 1),
-        ("u", "t", 1),
-        ("u", "x", 1),
-        ("u", "y", 1),
-        ("v", "r", 1),
-        ("w", "s", 1),
-        ("w", "t", 1),
-        ("w", "x", 1),
-        ("x", "t", 1),
-        ("x", "u", 1),
-        ("x", "w", 1),
-        ("x", "y", 1),
-        ("y", "u", 1),
-        ("y", "x", 1),
-    ]
-    return Graph(connections)
+    return Graph(CONNECTIONS)
 
 
 def test_build_graph(undirected_graph):
@@ -59,3 +78,208 @@ def test_breadth_first_search(undirected_graph):
     assert vertices["t"].predecessor == vertices["w"]
     assert vertices["y"].distance == 3
     assert vertices["y"].predecessor == vertices["x"]
+
+
+def test_breadth_first_search_vertex_without_neighbors():
+    graph = Graph([("a", "b", 1)])
+    breadth_first_search(graph, graph.vertices["a"])
+    assert graph.vertices["b"].distance == 1
+
+
+def test_bfs(undirected_graph):
+    result = bfs(undirected_graph, "s")
+    assert result.distance == {
+        "s": 0, "r": 1, "w": 1, "v": 2, "t": 2, "x": 2, "u": 3, "y": 3
+    }
+    assert result.path_to("y") == ["s", "w", "x", "y"]
+    assert result.path_to("s") == ["s"]
+    # The graph's vertices are left untouched
+    assert all(v.color is None for v in undirected_graph.vertices.values())
+
+
+def test_bfs_options(undirected_graph):
+    result = bfs(undirected_graph, "s", max_depth=1)
+    assert result.distance == {"s": 0, "r": 1, "w": 1}
+    assert "v" not in result
+    with pytest.raises(KeyError):
+        result.path_to("v")
+
+    result = bfs(undirected_graph, "s", target="t")
+    assert result.path_to("t") == ["s", "w", "t"]
+    assert "y" not in result
+
+    result = bfs(undirected_graph, ["v", "y"])
+    assert result.distance["v"] == result.distance["y"] == 0
+    assert result.distance["w"] == 2
+    assert result.path_to("s") == ["v", "r", "s"]
+
+
+def test_bfs_vertex_without_neighbors():
+    graph = Graph([("a", "b", 1), ("c", "a", 1)])
+    assert bfs(graph, "a").distance == {"a": 0, "b": 1}
+    assert bfs(graph, "b").distance == {"b": 0}
+
+
+def test_csr_graph_from_connections():
+    graph = CSRGraph.from_connections(CONNECTIONS)
+    assert graph.num_vertices == 8
+    assert graph.num_edges == len(CONNECTIONS)
+    assert graph.labels == ["r", "s", "v", "w", "t", "u", "x", "y"]
+    x = graph.vertex_id("x")
+    assert [graph.labels[v] for v in graph.neighbors(x)] == ["t", "u", "w", "y"]
+    assert list(graph.edges(graph.vertex_id("v"))) == [(graph.vertex_id("r"), 1.0)]
+    assert list(graph.indptr) == [0, 2, 4, 5, 8, 11, 14, 18, 20]
+
+
+def test_csr_graph_round_trip(undirected_graph):
+    graph = CSRGraph.from_graph(undirected_graph)
+    assert graph.num_edges == len(CONNECTIONS)
+    vertices = graph.to_graph().vertices
+    assert vertices.keys() == undirected_graph.vertices.keys()
+    assert {v.label: w for v, w in vertices["x"].neighbors.items()} == {
+        "t": 1, "u": 1, "w": 1, "y": 1
+    }
+
+
+def test_csr_breadth_first_search():
+    graph = CSRGraph.from_connections(CONNECTIONS + [("z", "z", 1)])
+    distance, predecessor = csr_breadth_first_search(graph, graph.vertex_id("s"))
+    labels = graph.labels
+    computed = {labels[u]: d for u, d in enumerate(distance)}
+    assert computed == {
+        "r": 1, "s": 0, "v": 2, "w": 1, "t": 2, "u": 3, "x": 2, "y": 3, "z": sys.maxsize
+    }
+    assert labels[predecessor[graph.vertex_id("v")]] == "r"
+    assert predecessor[graph.vertex_id("s")] == -1
+    assert predecessor[graph.vertex_id("z")] == -1
+
+
+WEIGHTED_CONNECTIONS = [
+    ("s", "t", 10),
+    ("s", "y", 5),
+    ("t", "x", 1),
+    ("t", "y", 2),
+    ("x", "z", 4),
+    ("y", "t", 3),
+    ("y", "x", 9),
+    ("y", "z", 2),
+    ("z", "s", 7),
+    ("z", "x", 6),
+]
+
+
+def test_reverse_adjacency():
+    graph = Graph(WEIGHTED_CONNECTIONS)
+    reverse = graph.reverse_adjacency
+    assert reverse["x"] == {"t": 1, "y": 9, "z": 6}
+    assert reverse["s"] == {"z": 7}
+    assert graph.reverse_adjacency is reverse
+
+
+def test_dijkstra():
+    graph = Graph(WEIGHTED_CONNECTIONS)
+    result = dijkstra(graph, "s")
+    assert result.distance == {"s": 0, "t": 8, "x": 9, "y": 5, "z": 7}
+    assert result.path_to("x") == ["s", "y", "t", "x"]
+    assert result.predecessor["s"] is None
+
+    result = dijkstra(graph, "s", target="y")
+    assert result.distance["y"] == 5
+    assert "x" not in result
+
+
+def test_dijkstra_negative_weight():
+    with pytest.raises(ValueError):
+        dijkstra(Graph([("a", "b", -1)]), "a")
+
+
+def _grid(n, seed=0):
+    rng = random.Random(seed)
+    connections = []
+    for i in range(n):
+        for j in range(n):
+            for di, dj in ((0, 1), (1, 0)):
+                if i + di < n and j + dj < n:
+                    w = rng.randint(1, 9)
+                    connections.append(((i, j), (i + di, j + dj), w))
+                    connections.append(((i + di, j + dj), (i, j), w))
+    return Graph(connections)
+
+
+def test_a_star_and_bidirectional_agree_with_dijkstra():
+    graph = _grid(12)
+    origin, target = (0, 0), (11, 7)
+
+    def manhattan(label):
+        return abs(label[0] - target[0]) + abs(label[1] - target[1])
+
+    expected = dijkstra(graph, origin).distance[target]
+    result = a_star(graph, origin, target, manhattan)
+    assert result.distance[target] == expected
+
+    distance, path = bidirectional_dijkstra(graph, origin, target)
+    assert distance == expected
+    assert path[0] == origin and path[-1] == target
+    vertices = graph.vertices
+    assert distance == sum(
+        vertices[u].neighbors[vertices[v]] for u, v in zip(path, path[1:])
+    )
+
+
+def test_bidirectional_dijkstra_unreachable():
+    graph = Graph(WEIGHTED_CONNECTIONS + [("q", "s", 1)])
+    assert bidirectional_dijkstra(graph, "s", "q") == (math.inf, [])
+    assert bidirectional_dijkstra(graph, "s", "s") == (0.0, ["s"])
+    assert bidirectional_dijkstra(graph, "q", "x") == (10, ["q", "s", "y", "t", "x"])
+
+
+def test_csr_graph_transpose():
+    graph = CSRGraph.from_connections(WEIGHTED_CONNECTIONS)
+    transpose = graph.transpose()
+    assert transpose.labels == graph.labels
+    x = graph.vertex_id("x")
+    assert sorted(graph.labels[u] for u in transpose.neighbors(x)) == ["t", "y", "z"]
+    assert transpose.transpose().indptr == graph.indptr
+    assert sorted(transpose.transpose().indices) == sorted(graph.indices)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_direction_optimizing_bfs(use_numpy, random_csr_graph):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    for seed, (n, m) in enumerate([(1, 0), (50, 40), (200, 3000), (500, 8000)]):
+        graph = random_csr_graph(n, m, seed) if m else CSRGraph.from_connections([(0, 0, 1)])
+        origin = graph.vertex_id(graph.labels[0])
+        expected, _ = csr_breadth_first_search(graph, origin)
+        distance, predecessor = direction_optimizing_bfs(graph, origin, use_numpy=use_numpy)
+        assert distance == expected
+        indptr, indices = graph.indptr, graph.indices
+        for v, u in enumerate(predecessor):
+            if u == -1:
+                assert v == origin or distance[v] == sys.maxsize
+            else:
+                assert distance[u] + 1 == distance[v]
+                assert v in indices[indptr[u]:indptr[u + 1]]
+
+
+def test_grid_road_network():
+    graph, position = grid_road_network(12, seed=3)
+    assert len(graph.vertices) == len(position) == 144
+    assert sum(len(v.neighbors) for v in graph.vertices.values()) == 4 * 12 * 11
+    paths = dijkstra(graph, "0,0")
+    tx, ty = position["11,7"]
+    heuristic = lambda label: abs(position[label][0] - tx) + abs(position[label][1] - ty)
+    assert a_star(graph, "0,0", "11,7", heuristic).distance["11,7"] == (
+        pytest.approx(paths.distance["11,7"])
+    )
+    distance, path = bidirectional_dijkstra(graph, "0,0", "11,7")
+    assert distance == pytest.approx(paths.distance["11,7"])
+    assert path == paths.path_to("11,7")
+
+
+def test_benchmark_shortest_paths():
+    results = benchmark_shortest_paths(side=10, num_queries=2)
+    assert [name for name, _ in results] == [
+        "bfs", "dijkstra", "dijkstra to target", "a_star", "bidirectional"
+    ]
+    assert all(seconds > 0 for _, seconds in results)
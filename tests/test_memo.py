@@ -0,0 +1,60 @@
+"""Tests of the shared memo."""
+
+from python_algorithms.memo import Memo, approximate_size, content_key
+
+
+def test_content_key():
+    assert content_key([1, 2, 3], 4) == content_key([1, 2, 3], 4)
+    assert content_key([1, 2, 3], 4) != content_key([1, 2, 4], 4)
+    assert content_key((1, 2)) != content_key([1, 2])
+
+
+def test_memo_counts_and_evicts_by_size():
+    memo = Memo(maxsize=2)
+    memo.put("a", 1)
+    memo.put("b", 2)
+    assert memo.get("a") == 1
+    memo.put("c", 3)
+    assert "b" not in memo
+    assert memo.get("b") is None
+    assert (memo.hits, memo.misses, memo.evictions) == (1, 1, 1)
+    assert len(memo) == 2
+
+    calls = []
+    assert memo.get_or_compute("d", lambda: calls.append(1) or 4) == 4
+    assert memo.get_or_compute("d", lambda: calls.append(1) or 4) == 4
+    assert calls == [1]
+
+    memo.clear()
+    assert len(memo) == 0
+    assert (memo.hits, memo.misses, memo.evictions) == (0, 0, 0)
+
+
+def test_memo_evicts_by_bytes():
+    value = list(range(100))
+    memo = Memo(maxsize=None, max_bytes=2 * approximate_size(value))
+    for key in range(5):
+        memo.put(key, list(value))
+    assert len(memo) == 2
+    assert [key in memo for key in range(5)] == [False, False, False, True, True]
+    assert memo.size_bytes <= 2 * approximate_size(value)
+    assert memo.evictions == 3
+
+    memo = Memo(max_bytes=10)
+    memo.put("big", value)
+    assert len(memo) == 0
+
+
+def test_memo_disk_tier(tmp_path):
+    path = str(tmp_path / "memo")
+    with Memo(maxsize=1, disk_path=path) as memo:
+        memo.put(("a", 1), [1, 2])
+        memo.put(("b", 2), [3])
+        assert ("a", 1) not in memo
+        assert memo.get(("a", 1)) == [1, 2]
+        assert memo.disk_hits == 1
+
+    with Memo(disk_path=path) as memo:
+        assert memo.get(("b", 2)) == [3]
+        assert memo.get(("c", 3)) is None
+        assert (memo.disk_hits, memo.misses) == (1, 1)
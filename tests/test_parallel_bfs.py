@@ -0,0 +1,42 @@
+"""Tests of breadth-first searches from many origins."""
+
+from python_algorithms.graphs import csr_breadth_first_search
+from python_algorithms.parallel_bfs import (
+    bfs_many,
+    bit_parallel_bfs,
+    dump_adjacency,
+    load_adjacency,
+)
+
+
+def test_dump_and_load_adjacency(tmp_path, random_csr_graph):
+    graph = random_csr_graph(30, 100)
+    path = str(tmp_path / "graph.csr")
+    dump_adjacency(graph, path)
+    indptr, indices, n = load_adjacency(path)
+    assert n == graph.num_vertices
+    assert list(indptr) == list(graph.indptr)
+    assert list(indices) == list(graph.indices)
+
+
+def test_bit_parallel_bfs(random_csr_graph):
+    graph = random_csr_graph(100, 200)
+    origins = list(range(graph.num_vertices))[:64]
+    origins[1] = origins[0]
+    distances = bit_parallel_bfs(graph, origins)
+    assert len(distances) == len(origins)
+    for origin, distance in zip(origins, distances):
+        assert distance == csr_breadth_first_search(graph, origin)[0]
+
+
+def test_bfs_many(tmp_path, random_csr_graph):
+    graph = random_csr_graph(80, 160)
+    origins = list(range(graph.num_vertices)) * 2
+    for bit_parallel in (False, True):
+        computed = list(
+            bfs_many(graph, origins, max_workers=2, tmp_dir=str(tmp_path), bit_parallel=bit_parallel)
+        )
+        assert [origin for origin, _ in computed] == origins
+        for origin, distance in computed:
+            assert distance == csr_breadth_first_search(graph, origin)[0]
+    assert list(bfs_many(graph, [], max_workers=1)) == []
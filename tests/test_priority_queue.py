@@ -0,0 +1,80 @@
+"""Tests of the heap-backed priority queues."""
+
+import random
+
+import pytest
+
+from python_algorithms.priority_queue import MaxHeap, MinHeap, PriorityQueue
+
+
+def test_max_heap():
+    xs = [random.randint(0, 100) for _ in range(200)]
+    heap = MaxHeap(xs[:50])
+    heap.heapify(xs[50:150])
+    for x in xs[150:]:
+        heap.push(x)
+    assert len(heap) == len(xs)
+    assert heap.peek() == max(xs)
+    assert [heap.pop() for _ in range(len(xs))] == sorted(xs, reverse=True)
+    with pytest.raises(IndexError):
+        heap.pop()
+
+
+def test_max_heap_replace_and_increase_key():
+    heap = MaxHeap([5, 3, 8, 1])
+    assert heap.replace(2) == 8
+    assert heap.peek() == 5
+    i = list(heap).index(1)
+    heap.increase_key(i, 9)
+    assert heap.pop() == 9
+    with pytest.raises(ValueError):
+        heap.increase_key(0, -1)
+
+
+def test_min_heap():
+    xs = [random.randint(0, 100) for _ in range(200)]
+    heap = MinHeap(xs)
+    assert heap.peek() == min(xs)
+    assert heap.replace(1000) == min(xs)
+    heap.decrease_key(list(heap).index(1000), -1)
+    assert heap.pop() == -1
+    assert [heap.pop() for _ in range(len(xs) - 1)] == sorted(xs)[1:]
+
+
+def test_priority_queue():
+    queue = PriorityQueue([("a", 5), ("b", 3)])
+    queue.push("c", 4)
+    queue.push("d", 3)
+    queue.decrease_key("a", 1)
+    assert len(queue) == 4
+    assert "a" in queue
+    assert queue.peek() == ("a", 1)
+    assert [queue.pop() for _ in range(4)] == [("a", 1), ("b", 3), ("d", 3), ("c", 4)]
+    assert "a" not in queue
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_priority_queue_replace():
+    queue = PriorityQueue([("a", 5), ("b", 3), ("c", 4)])
+    assert queue.replace("d", 6) == ("b", 3)
+    assert queue.replace("a", 2) == ("c", 4)
+    assert len(queue) == 2
+    assert [queue.pop() for _ in range(2)] == [("a", 2), ("d", 6)]
+    with pytest.raises(IndexError):
+        queue.replace("a", 1)
+
+
+def test_priority_queue_compacts_invalidated_entries():
+    queue = PriorityQueue((i, i) for i in range(10))
+    for priority in range(1000, 0, -1):
+        queue.decrease_key(5, priority - 1000)
+        queue.push(priority % 10, priority % 10)
+    assert queue.pop() == (5, -999)
+    assert [queue.pop()[0] for _ in range(9)] == [0, 1, 2, 3, 4, 6, 7, 8, 9]
+
+
+def test_priority_queue_rejects_priority_increase():
+    queue = PriorityQueue([("a", 5)])
+    with pytest.raises(ValueError):
+        queue.decrease_key("a", 6)
@@ -1,7 +1,11 @@
 """Tests of sorting algorithms implemented in Python."""
 
+import array
+import random
+
 import pytest
 
+from python_algorithms import sorting
 from python_algorithms.sorting import (
     insertion_sort,
     get_index_of_parent,
@@ -9,11 +13,26 @@ from python_algorithms.sorting import (
     get_index_of_right_child,
     get_first_leaf_index,
     max_heapify,
+    min_heapify,
+    bottom_up_max_heapify,
+    max_heap_sift_up,
+    min_heap_sift_up,
     build_max_heap,
+    build_min_heap,
     heap_sort,
     partition,
+    three_way_partition,
+    median_of_three,
     quick_sort,
-    randomized_select
+    binary_insertion_sort,
+    natural_merge_sort,
+    count_runs,
+    randomized_select,
+    select,
+    floyd_rivest_select,
+    select_many,
+    quantiles,
+    argsort,
 )
 
 
@@ -30,6 +49,12 @@ def test_insertion_sort(A, expected):
     assert A == expected
 
 
+def test_insertion_sort_subarray():
+    A = [9, 5, 2, 4, 6, 1, 0]
+    insertion_sort(A, 1, 5)
+    assert A == [9, 1, 2, 4, 5, 6, 0]
+
+
 @pytest.mark.parametrize(
     "i, expected", [(1, 0), (2, 0), (3, 1), (4, 1), (7, 3), (9, 4), (5, 2), (6, 2)]
 )
@@ -70,6 +95,38 @@ def test_heap_max_heapify(A, i, expected):
     assert A == expected
 
 
+@pytest.mark.parametrize(
+    "A, i, expected",
+    [
+        ([16, 4, 10, 14, 7, 9, 3, 2, 8, 1], 1, [16, 14, 10, 8, 7, 9, 3, 2, 4, 1]),
+        (
+            [27, 17, 3, 16, 13, 10, 1, 5, 7, 12, 4, 8, 9],
+            2,
+            [27, 17, 10, 16, 13, 9, 1, 5, 7, 12, 4, 8, 3],
+        ),
+    ],
+)
+def test_heap_bottom_up_max_heapify(A, i, expected):
+    bottom_up_max_heapify(A, i)
+    assert A == expected
+
+
+def test_heap_min_heapify():
+    A = [1, 12, 3, 4, 5, 6, 7, 8]
+    min_heapify(A, 1)
+    assert A == [1, 4, 3, 8, 5, 6, 7, 12]
+
+
+def test_heap_sift_up():
+    A = [16, 14, 10, 8, 7, 9, 3, 2, 4, 15]
+    max_heap_sift_up(A, 9)
+    assert A == [16, 15, 10, 8, 14, 9, 3, 2, 4, 7]
+
+    A = [1, 3, 2, 4, 0]
+    min_heap_sift_up(A, 4)
+    assert A == [0, 1, 2, 4, 3]
+
+
 @pytest.mark.parametrize(
     "A, expected",
     [
@@ -85,6 +142,18 @@ def test_build_max_heap(A, expected):
     assert A == expected
 
 
+def test_build_max_heap_respects_heap_size():
+    A = [1, 2, 3, 0, 9]
+    build_max_heap(A, heap_size=2)
+    assert A == [3, 2, 1, 0, 9]
+
+
+def test_build_min_heap():
+    A = [4, 1, 3, 2, 16, 9, 10, 14, 8, 7]
+    build_min_heap(A)
+    assert all(A[(i - 1) // 2] <= A[i] for i in range(1, len(A)))
+
+
 @pytest.mark.parametrize(
     "A, expected",
     [
@@ -98,6 +167,12 @@ def test_heap_sort(A, expected):
     assert A == expected
 
 
+def test_heap_sort_subarray():
+    A = [9, 4, 1, 3, 2, 16, 0]
+    heap_sort(A, 1, 5)
+    assert A == [9, 1, 2, 3, 4, 16, 0]
+
+
 @pytest.mark.parametrize(
     "A, p, r, q, expected",
     [
@@ -133,10 +208,214 @@ def test_quick_sort(A, expected):
     assert A == expected
 
 
+@pytest.mark.parametrize(
+    "A, lt, gt, expected",
+    [
+        ([4, 1, 4, 7, 4, 2, 4], 2, 5, [1, 2, 4, 4, 4, 4, 7]),
+        ([3, 3, 3], 0, 2, [3, 3, 3]),
+    ],
+)
+def test_three_way_partition(A, lt, gt, expected):
+    assert three_way_partition(A) == (lt, gt)
+    assert sorted(A[:lt]) == expected[:lt]
+    assert A[lt:gt + 1] == expected[lt:gt + 1]
+    assert sorted(A[gt + 1:]) == expected[gt + 1:]
+
+
+@pytest.mark.parametrize(
+    "A, expected", [([1, 2, 3], 1), ([3, 2, 1], 1), ([2, 3, 1], 0), ([1, 3, 2], 2)]
+)
+def test_median_of_three(A, expected):
+    assert median_of_three(A, 0, 1, 2) == expected
+
+
+@pytest.mark.parametrize(
+    "A",
+    [
+        list(range(5000)),
+        list(range(5000, 0, -1)),
+        [i % 3 for i in range(5000)],
+        list(range(2500)) + list(range(2500, 0, -1)),
+    ],
+)
+def test_quick_sort_adversarial_inputs(A):
+    # The textbook recursive quicksort hits the recursion limit on these
+    expected = sorted(A)
+    quick_sort(A)
+    assert A == expected
+
+
+def test_binary_insertion_sort():
+    A = [1, 4, 7, 3, 9, 4, 0, 8]
+    binary_insertion_sort(A, 1, 6, start=3)
+    assert A == [1, 0, 3, 4, 4, 7, 9, 8]
+
+
+@pytest.mark.parametrize(
+    "A, num_runs",
+    [
+        ([], 0),
+        ([1], 1),
+        (list(range(1000)), 1),
+        (list(range(1000, 0, -1)), 1),
+        (list(range(500)) + list(range(500)), 2),
+        ([5, 2, 4, 6, 1, 3], 3),
+        ([0, 1, 2] * 1001, 1001),
+        ([3, 2, 1, 4, 5, 6] * 400, 800),
+    ],
+)
+def test_natural_merge_sort(A, num_runs):
+    expected = sorted(A)
+    assert count_runs(A) == num_runs
+    assert natural_merge_sort(A) == num_runs
+    assert A == expected
+
+
+@pytest.mark.parametrize("n", [63, 64, 1000, 5000])
+def test_natural_merge_sort_is_stable(n):
+    records = [(random.randint(0, 5), i) for i in range(n)]
+    # an almost sorted stretch followed by random records
+    records[:n // 2] = sorted(records[:n // 2])
+    A = list(records)
+    natural_merge_sort(A, key=lambda record: record[0])
+    assert A == sorted(records, key=lambda record: record[0])
+    A = list(records)
+    natural_merge_sort(A, key=lambda record: record[0], reverse=True)
+    assert A == sorted(records, key=lambda record: record[0], reverse=True)
+
+
 @pytest.mark.parametrize("A, i, expected", [
     ([13, 19, 9, 5, 12, 8, 7, 4, 21, 2, 6, 11], 5, 7),
     ([13, 19, 9, 5, 12, 8, 7, 4, 21, 2, 6, 11], 7, 9),
-    ([13, 19, 9, 5, 12, 8, 7, 4, 21, 2, 6, 11], 100, 21) 
+    ([13, 19, 9, 5, 12, 8, 7, 4, 21, 2, 6, 11], 12, 21),
 ])
 def test_randomized_select(A, i, expected):
-    assert randomized_select(A, i) == expected
\ No newline at end of file
+    assert randomized_select(A, i) == expected
+
+
+@pytest.mark.parametrize("i", [0, 13, 100])
+def test_randomized_select_rejects_out_of_range_rank(i):
+    A = [13, 19, 9, 5, 12, 8, 7, 4, 21, 2, 6, 11]
+    with pytest.raises(ValueError):
+        randomized_select(A, i)
+    with pytest.raises(ValueError):
+        randomized_select(array.array("q", A), i, reverse=True)
+
+
+@pytest.mark.parametrize("selection", [select, floyd_rivest_select])
+@pytest.mark.parametrize("n", [1, 12, 100, 2000])
+def test_deterministic_selection(selection, n):
+    xs = [random.randint(0, n // 4) for _ in range(n)]
+    for i in {1, n // 2 + 1, n}:
+        A = list(xs)
+        assert selection(A, i) == sorted(xs)[i - 1]
+        assert A[i - 1] == sorted(xs)[i - 1]
+    with pytest.raises(ValueError):
+        selection(list(xs), n + 1)
+
+
+def test_select_many():
+    xs = [random.randint(0, 500) for _ in range(2000)]
+    ranks = [2000, 1, 1000, 1000, 1999, 37]
+    A = list(xs)
+    assert select_many(A, ranks) == [sorted(xs)[i - 1] for i in ranks]
+    assert sorted(A) == sorted(xs)
+    assert select_many(A, []) == []
+    with pytest.raises(ValueError):
+        select_many(A, [0])
+
+
+def test_quantiles():
+    A = list(range(1000, 0, -1))
+    assert quantiles(A, [0, 0.5, 0.9, 0.99, 0.999, 1]) == [1, 500, 900, 990, 999, 1000]
+    with pytest.raises(ValueError):
+        quantiles([], [0.5])
+    with pytest.raises(ValueError):
+        quantiles(A, [1.5])
+
+RECORDS = [("b", 2), ("a", 3), ("c", 1), ("d", 2), ("e", 3)]
+
+
+@pytest.mark.parametrize("sort", [insertion_sort, heap_sort, quick_sort])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_sort_with_key(sort, reverse):
+    A = list(RECORDS)
+    sort(A, key=lambda record: record[1], reverse=reverse)
+    assert A == sorted(RECORDS, key=lambda record: record[1], reverse=reverse)
+
+
+@pytest.mark.parametrize("sort", [insertion_sort, heap_sort, quick_sort])
+def test_sort_reverse_subarray(sort):
+    A = [0, 1, 2, 3, 4, 5]
+    sort(A, 1, 4, reverse=True)
+    assert A == [0, 4, 3, 2, 1, 5]
+
+
+def test_randomized_select_with_key():
+    A = list(RECORDS)
+    assert randomized_select(A, 1, key=lambda record: record[1]) == ("c", 1)
+    assert randomized_select(A, 2, key=lambda record: record[1]) == ("b", 2)
+    assert randomized_select(A, 1, key=lambda record: record[1], reverse=True) == ("a", 3)
+    assert A == RECORDS
+
+
+def test_argsort():
+    assert argsort([]) == []
+    assert argsort(RECORDS, key=lambda record: record[1]) == [2, 0, 3, 1, 4]
+    assert argsort(RECORDS, key=lambda record: record[1], reverse=True) == [1, 4, 0, 3, 2]
+
+
+@pytest.mark.parametrize("sort", [heap_sort, quick_sort])
+@pytest.mark.parametrize("typecode", ["d", "l"])
+def test_sort_numeric_buffer(sort, typecode):
+    xs = [random.randint(-1000, 1000) for _ in range(500)]
+    A = array.array(typecode, xs)
+    sort(A)
+    assert A == array.array(typecode, sorted(xs))
+    sort(A, 10, 100, reverse=True)
+    assert list(A[10:101]) == sorted(xs)[10:101][::-1]
+
+
+def test_randomized_select_numeric_buffer():
+    xs = [random.random() for _ in range(500)]
+    for i in (1, 250, 500):
+        assert randomized_select(array.array("d", xs), i) == sorted(xs)[i - 1]
+    A = array.array("d", xs)
+    assert randomized_select(A, 3, reverse=True) == sorted(xs)[-3]
+    assert A == array.array("d", xs)
+
+
+@pytest.mark.parametrize("typecode", ["q", "d"])
+def test_randomized_select_without_numpy(monkeypatch, typecode):
+    xs = [random.randint(-50, 50) for _ in range(300)]
+    expected = [
+        randomized_select(array.array(typecode, xs), i, 10, 250, reverse=reverse)
+        for i in (1, 7, 120, 241) for reverse in (False, True)
+    ]
+    monkeypatch.setattr(sorting, "_numeric_view", lambda A, p, r: None)
+    computed = [
+        randomized_select(array.array(typecode, xs), i, 10, 250, reverse=reverse)
+        for i in (1, 7, 120, 241) for reverse in (False, True)
+    ]
+    assert computed == expected
+    assert all(type(x) is type(array.array(typecode, [0])[0]) for x in expected)
+    A = array.array(typecode, xs)
+    randomized_select(A, 5, reverse=True)
+    assert A == array.array(typecode, xs)
+
+
+@pytest.mark.parametrize("sort", [heap_sort, quick_sort])
+def test_sort_numpy_array_in_place(sort):
+    np = pytest.importorskip("numpy")
+    xs = [random.random() for _ in range(500)]
+    A = np.array(xs)
+    buffer_address = A.ctypes.data
+    sort(A)
+    assert A.ctypes.data == buffer_address
+    assert A.tolist() == sorted(xs)
+
+
+def test_randomized_select_numpy_array():
+    np = pytest.importorskip("numpy")
+    xs = [random.randint(0, 50) for _ in range(500)]
+    assert randomized_select(np.array(xs), 100) == sorted(xs)[99]
@@ -0,0 +1,135 @@
+"""Tests of search tree snapshots and journals."""
+
+import os
+
+import pytest
+
+from python_algorithms.binary_search_tree import TreeNode, in_order_tree_walk, rb_insert, tree_search
+from python_algorithms.tree_snapshot import (
+    Snapshot,
+    TreeJournal,
+    checkpoint,
+    dump_tree,
+    load_tree,
+    replay_journal,
+)
+
+SOME_INTEGERS = [15, 6, 18, 3, 7, 17, 20, 2, 4, 13, 9]
+
+
+@pytest.fixture
+def tree_root():
+    root = None
+    for key in SOME_INTEGERS:
+        root = rb_insert(root, TreeNode(key=key, value=key / 2))
+    return root
+
+
+def test_dump_and_load(tree_root, tmp_path):
+    path = str(tmp_path / "tree.snap")
+    assert dump_tree(tree_root, path, key_typecode="l") == len(SOME_INTEGERS)
+    root = load_tree(path)
+    assert list(in_order_tree_walk(root)) == sorted(SOME_INTEGERS)
+    assert tree_search(root, 7).value == 3.5
+    assert root.size == len(SOME_INTEGERS)
+
+
+def test_pickled_values(tmp_path):
+    path = str(tmp_path / "tree.snap")
+    root = None
+    for key in range(10):
+        root = rb_insert(root, TreeNode(key=key, value={"key": key}))
+    dump_tree(root, path, value_typecode=None)
+    assert tree_search(load_tree(path), 4).value == {"key": 4}
+
+
+def test_default_typecodes(tmp_path):
+    path = str(tmp_path / "tree.snap")
+    root = None
+    for key in SOME_INTEGERS:
+        root = rb_insert(root, TreeNode(key=key, value=None))
+    assert dump_tree(root, path) == len(SOME_INTEGERS)
+    with Snapshot(path) as snapshot:
+        assert [key for key, _ in snapshot.items()] == sorted(SOME_INTEGERS)
+        assert all(type(key) is int for key, _ in snapshot.items())
+        assert 2 ** 53 + 1 not in snapshot
+    root = load_tree(path)
+    assert tree_search(root, 13).value is None
+
+    root = None
+    for key in ["pear", "apple", "fig"]:
+        root = rb_insert(root, TreeNode(key=key, value=len(key)))
+    dump_tree(root, path)
+    with Snapshot(path) as snapshot:
+        assert list(snapshot.items()) == [("apple", 5), ("fig", 3), ("pear", 4)]
+        assert snapshot.search("fig") == 3
+
+
+def test_mixed_int_and_float_keys_stay_exact(tmp_path):
+    path = str(tmp_path / "tree.snap")
+    keys = [2 ** 53 + 1, 0.5, 2 ** 60 + 3, -1]
+    root = None
+    for key in keys:
+        root = rb_insert(root, TreeNode(key=key, value=None))
+    dump_tree(root, path)
+    with Snapshot(path) as snapshot:
+        assert [key for key, _ in snapshot.items()] == sorted(keys)
+        assert [type(key) for key, _ in snapshot.items()] == [int, float, int, int]
+
+
+def test_empty_tree(tmp_path):
+    path = str(tmp_path / "tree.snap")
+    assert dump_tree(None, path) == 0
+    assert load_tree(path) is None
+
+
+def test_snapshot_index(tree_root, tmp_path):
+    path = str(tmp_path / "tree.snap")
+    dump_tree(tree_root, path)
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == len(SOME_INTEGERS)
+        assert 13 in snapshot
+        assert 14 not in snapshot
+        assert snapshot.search(13) == 6.5
+        assert snapshot.search(14) is None
+        assert [key for key, _ in snapshot.items()] == sorted(SOME_INTEGERS)
+
+    (tmp_path / "bogus").write_bytes(b"\0" * 32)
+    with pytest.raises(ValueError):
+        Snapshot(str(tmp_path / "bogus"))
+
+
+def test_journal_and_checkpoint(tree_root, tmp_path):
+    path = str(tmp_path / "tree.snap")
+    journal_path = str(tmp_path / "tree.journal")
+    with TreeJournal(journal_path) as journal:
+        checkpoint(tree_root, path, journal)
+        journal.append(5, 2.5)
+        journal.append(7, 0.0)
+        assert list(journal.replay()) == [(5, 2.5), (7, 0.0)]
+    # A torn final record is ignored
+    with open(journal_path, "ab") as f:
+        f.write(b"\x80\x05\x95")
+
+    root = load_tree(path, journal_path=journal_path)
+    assert list(in_order_tree_walk(root)) == sorted(SOME_INTEGERS + [5])
+    assert tree_search(root, 7).value == 0.0
+
+    with TreeJournal(journal_path) as journal:
+        checkpoint(root, path, journal)
+    assert list(replay_journal(journal_path)) == []
+    assert list(in_order_tree_walk(load_tree(path, journal_path))) == sorted(SOME_INTEGERS + [5])
+
+
+def test_checkpoint_syncs_before_truncating_the_journal(tree_root, tmp_path, monkeypatch):
+    path = str(tmp_path / "tree.snap")
+    events = []
+    fsync, replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: events.append("fsync") or fsync(fd))
+    monkeypatch.setattr(os, "replace", lambda *args: events.append("replace") or replace(*args))
+    with TreeJournal(str(tmp_path / "tree.journal")) as journal:
+        monkeypatch.setattr(journal, "truncate", lambda: events.append("truncate"))
+        checkpoint(tree_root, path, journal)
+    directory_sync = ["fsync"] if os.name == "posix" else []
+    assert events == ["fsync", "replace"] + directory_sync + ["truncate"]
+    assert not os.path.exists(path + ".tmp")